@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from datetime import date, time
-from typing import Literal
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class AspectOrbs(BaseModel):
@@ -28,6 +28,11 @@ class NatalChartRequest(BaseModel):
     zodiac: Literal["tropical", "sidereal"] = "tropical"
     sidereal_mode: str | None = None
     aspects: AspectsConfig = Field(default_factory=AspectsConfig)
+    # Corpos pelo nome do registro (ex.: "Ceres", "Lilith") ou asteroides
+    # numerados ("433"); None usa o conjunto padrão.
+    bodies: list[str] | None = Field(None, min_length=1, max_length=50)
+    # "fast": Moshier embutido, sem arquivos; "precise": arquivos do Swiss Ephemeris.
+    precision: Literal["fast", "precise"] = "precise"
 
     @field_validator("full_name", "birth_place")
     @classmethod
@@ -43,10 +48,133 @@ class ProgressionRequest(NatalChartRequest):
     target_date: date
 
 
+class RelocationRequest(NatalChartRequest):
+    locations: list[str] = Field(..., min_length=1, max_length=200)
+
+
+class MidpointRequest(NatalChartRequest):
+    orb: float = Field(1.5, gt=0, le=5)
+    dial: Literal[360, 180, 90, 45] = 90
+
+
+class HarmonicRequest(NatalChartRequest):
+    harmonic: int = Field(..., ge=1, le=180)
+
+
+class FixedStarRequest(NatalChartRequest):
+    orb: float = Field(1.0, gt=0, le=5)
+    paran_orb: float = Field(1.0, gt=0, le=5)
+    max_magnitude: float = Field(3.0, ge=-2, le=6)
+
+
+class EventRangeRequest(BaseModel):
+    start_date: date
+    end_date: date
+    bodies: list[str] | None = Field(None, min_length=1, max_length=20)
+
+    @model_validator(mode="after")
+    def check_range(self) -> EventRangeRequest:
+        if self.end_date < self.start_date:
+            raise ValueError("end_date deve ser igual ou posterior a start_date")
+        return self
+
+
+class EphemerisTableRequest(BaseModel):
+    start_date: date
+    end_date: date
+    # None usa o conjunto padrão de corpos (PLANETS).
+    bodies: list[str] | None = Field(None, min_length=1, max_length=50)
+    format: Literal["csv", "ndjson"] = "csv"
+    precision: Literal["fast", "precise"] = "precise"
+
+    @model_validator(mode="after")
+    def check_range(self) -> EphemerisTableRequest:
+        if self.end_date < self.start_date:
+            raise ValueError("end_date deve ser igual ou posterior a start_date")
+        if (self.end_date - self.start_date).days > 200 * 366:
+            raise ValueError("O intervalo da tabela é limitado a 200 anos")
+        return self
+
+
+class ElectionalConstraint(BaseModel):
+    type: Literal[
+        "moon_not_void",
+        "direct",
+        "asc_in_sign",
+        "body_in_sign",
+        "body_in_house",
+        "no_hard_aspects",
+    ]
+    body: str | None = None
+    sign: str | None = None
+    house: int | None = Field(None, ge=1, le=12)
+    orb: float = Field(6.0, gt=0, le=15)
+
+    @model_validator(mode="after")
+    def check_fields(self) -> ElectionalConstraint:
+        required = {
+            "direct": ("body",),
+            "asc_in_sign": ("sign",),
+            "body_in_sign": ("body", "sign"),
+            "body_in_house": ("body", "house"),
+            "no_hard_aspects": ("body",),
+        }.get(self.type, ())
+        missing = [name for name in required if getattr(self, name) is None]
+        if missing:
+            raise ValueError(f"{self.type} exige: {', '.join(missing)}")
+        return self
+
+
+class ElectionalRequest(BaseModel):
+    place: str = Field(..., min_length=2)
+    start_date: date
+    end_date: date
+    house_system: str = Field("P", min_length=1, max_length=1)
+    constraints: list[ElectionalConstraint] = Field(..., min_length=1, max_length=10)
+    min_duration_minutes: float = Field(0.0, ge=0)
+
+    @model_validator(mode="after")
+    def check_range(self) -> ElectionalRequest:
+        if self.end_date < self.start_date:
+            raise ValueError("end_date deve ser igual ou posterior a start_date")
+        if (self.end_date - self.start_date).days >= 62:
+            raise ValueError("O intervalo de busca é limitado a 62 dias")
+        return self
+
+
+class PlanetaryHoursRequest(BaseModel):
+    place: str = Field(..., min_length=2)
+    start_date: date
+    days: int = Field(1, ge=1, le=31)
+
+
+class JobSubmitRequest(BaseModel):
+    kind: Literal["natal", "solar_return", "progression", "relocation", "astrocartography"]
+    # Validado contra o modelo de requisição do tipo escolhido.
+    payload: dict[str, Any]
+    priority: int = Field(0, ge=-10, le=10)
+
+
 class LunationRequest(BaseModel):
     reference_date: date
     phase: Literal["new", "full"] = "new"
     language: Literal["pt-BR", "en"] = "pt-BR"
+    precision: Literal["fast", "precise"] = "precise"
+
+
+class AstrocartographyRequest(BaseModel):
+    full_name: str = Field(..., min_length=1)
+    birth_date: date
+    birth_time: time
+    birth_place: str = Field(..., min_length=2)
+    bodies: list[str] | None = Field(None, min_length=1, max_length=50)
+    latitude_step: float = Field(1.0, gt=0, le=10)
+    max_latitude: float = Field(80.0, gt=0, lt=90)
+
+    @field_validator("full_name", "birth_place")
+    @classmethod
+    def strip_whitespace(cls, value: str) -> str:
+        return value.strip()
 
 
 class ReportRequest(NatalChartRequest):
@@ -57,6 +185,23 @@ class AIInterpretationRequest(NatalChartRequest):
     focus: Literal["general", "relationships", "career"] = "general"
 
 
+class ChartReference(BaseModel):
+    # ``chart_id`` devolvido por /v1/chart/natal?store=true.
+    chart_id: str = Field(..., min_length=1, max_length=64)
+
+
+class SolarReturnByChart(ChartReference):
+    target_year: int = Field(..., ge=1800, le=2200)
+
+
+class ProgressionByChart(ChartReference):
+    target_date: date
+
+
+class AIInterpretationByChart(ChartReference):
+    focus: Literal["general", "relationships", "career"] = "general"
+
+
 class SignPosition(BaseModel):
     sign: str
     degree: int
@@ -108,11 +253,20 @@ class ChartMetadata(BaseModel):
     ephemeris_flags: list[str]
 
 
+class LotPosition(BaseModel):
+    name: str
+    longitude: float
+    sign: str
+    degree: int
+    minute: int
+
+
 class ChartPoints(BaseModel):
     asc: SignPosition
     mc: SignPosition
     vertex: SignPosition | None = None
     fortune: SignPosition | None = None
+    lots: list[LotPosition] | None = None
 
 
 class NatalChartResponse(BaseModel):
@@ -122,6 +276,159 @@ class NatalChartResponse(BaseModel):
     planets: list[PlanetPosition]
     aspects: list[AspectEntry]
     summary: list[str]
+    chart_id: str | None = None
+
+
+class RelocationEntry(BaseModel):
+    place: str
+    chart: NatalChartResponse | None = None
+    error: str | None = None
+
+
+class MidpointEntry(BaseModel):
+    point1: str
+    point2: str
+    longitude: float
+    sign: str
+    degree: int
+    minute: int
+
+
+class MidpointContact(BaseModel):
+    point: str
+    midpoint: str
+    angle: float
+    orb: float
+
+
+class MidpointResponse(BaseModel):
+    dial: int
+    orb: float
+    midpoints: list[MidpointEntry]
+    contacts: list[MidpointContact]
+
+
+class HarmonicPosition(BaseModel):
+    name: str
+    longitude: float
+    sign: str
+    degree: int
+    minute: int
+
+
+class HarmonicResponse(BaseModel):
+    harmonic: int
+    positions: list[HarmonicPosition]
+    aspects: list[AspectEntry]
+
+
+class FixedStarPosition(BaseModel):
+    name: str
+    longitude: float
+    latitude: float
+    magnitude: float
+    sign: str
+    degree: int
+    minute: int
+
+
+class FixedStarConjunction(BaseModel):
+    star: str
+    point: str
+    orb: float
+
+
+class FixedStarParan(BaseModel):
+    star: str
+    star_angle: Literal["ASC", "DSC", "MC", "IC"]
+    body: str
+    body_angle: Literal["ASC", "DSC", "MC", "IC"]
+    # Diferença em graus de tempo sidéreo (1 grau = 4 minutos).
+    orb: float
+
+
+class FixedStarResponse(BaseModel):
+    stars: list[FixedStarPosition]
+    conjunctions: list[FixedStarConjunction]
+    parans: list[FixedStarParan]
+
+
+class EventEntry(BaseModel):
+    utc_datetime: str
+    body: str
+    type: Literal["ingress", "station_retrograde", "station_direct"]
+    sign: str
+
+
+class EventListResponse(BaseModel):
+    events: list[EventEntry]
+
+
+class VoidOfCourseEntry(BaseModel):
+    start: str
+    end: str
+    sign: str
+    next_sign: str
+
+
+class VoidOfCourseResponse(BaseModel):
+    periods: list[VoidOfCourseEntry]
+
+
+class ElectionalWindow(BaseModel):
+    start: str
+    end: str
+    local_start: str
+    local_end: str
+    duration_minutes: float
+
+
+class ElectionalResponse(BaseModel):
+    place: str
+    timezone: str
+    latitude: float
+    longitude: float
+    windows: list[ElectionalWindow]
+
+
+class PlanetaryHour(BaseModel):
+    number: int
+    ruler: str
+    period: Literal["day", "night"]
+    start: str
+    end: str
+
+
+class PlanetaryDay(BaseModel):
+    date: date
+    day_ruler: str
+    sunrise: str | None
+    sunset: str | None
+    moonrise: str | None
+    moonset: str | None
+    hours: list[PlanetaryHour]
+
+
+class PlanetaryHoursResponse(BaseModel):
+    place: str
+    timezone: str
+    latitude: float
+    longitude: float
+    days: list[PlanetaryDay]
+
+
+class JobStatus(BaseModel):
+    id: str
+    kind: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    priority: int
+    progress: float | None
+    attempts: int
+    error: str | None
+    created_at: str
+    started_at: str | None
+    finished_at: str | None
+    expires_at: str | None
 
 
 class LunationResponse(BaseModel):
@@ -132,6 +439,23 @@ class LunationResponse(BaseModel):
     summary: str
 
 
+class AstrocartographyLine(BaseModel):
+    body: str
+    angle: Literal["ASC", "DSC", "MC", "IC"]
+    # Cada segmento é uma polilinha de pontos [longitude, latitude] (ordem GeoJSON).
+    segments: list[list[tuple[float, float]]]
+
+
+class AstrocartographyResponse(BaseModel):
+    full_name: str
+    birth_place: str
+    utc_datetime: str
+    latitude: float
+    longitude: float
+    sidereal_time: float
+    lines: list[AstrocartographyLine]
+
+
 class AIInterpretationResponse(BaseModel):
     metadata: ChartMetadata
     focus: str
@@ -1,75 +1,483 @@
 from __future__ import annotations
 
+from datetime import date, datetime, time, timezone
 import logging
+from typing import Callable, TypeVar
+from urllib.parse import quote, urlencode
 
-from fastapi import APIRouter, HTTPException, Response
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import RedirectResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
 
 from app.api.models import (
+    AIInterpretationByChart,
     AIInterpretationRequest,
     AIInterpretationResponse,
+    AstrocartographyRequest,
+    AstrocartographyResponse,
+    ChartReference,
+    ElectionalRequest,
+    ElectionalResponse,
+    EphemerisTableRequest,
+    EventListResponse,
+    EventRangeRequest,
+    FixedStarRequest,
+    FixedStarResponse,
+    HarmonicRequest,
+    HarmonicResponse,
+    JobStatus,
+    JobSubmitRequest,
     LunationRequest,
     LunationResponse,
+    MidpointRequest,
+    MidpointResponse,
     NatalChartRequest,
     NatalChartResponse,
+    PlanetaryHoursRequest,
+    PlanetaryHoursResponse,
+    ProgressionByChart,
     ProgressionRequest,
+    RelocationRequest,
+    SolarReturnByChart,
     SolarReturnRequest,
+    VoidOfCourseResponse,
 )
+from app.astro.astrocartography import calculate_astrocartography
+from app.astro.chart_store import ChartNotFound, get_chart_store
+from app.astro.electional import search_elections
 from app.astro.ephemeris import (
+    _format_utc_datetime,
     build_ai_interpretation,
     build_rtf_report,
     calculate_lunation,
     calculate_natal_chart,
     calculate_progression,
+    calculate_relocations,
     calculate_solar_return,
+    chart_cache_stats,
+    engine_version,
 )
+from app.astro.ephemeris_table import ephemeris_table
+from app.astro.events import list_ingresses, list_stations, list_void_of_course
+from app.astro.fixed_stars import calculate_fixed_stars
+from app.astro.midpoints import calculate_harmonic, calculate_midpoints
+from app.astro.planetary_hours import calculate_planetary_hours
 from app.core.config import settings
+from app.jobs import JOB_KINDS, Job, get_job_queue, notify_job_workers
+from app.utils.etag import etag_matches, strong_etag
+from app.utils.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+M = TypeVar("M", bound=BaseModel)
+R = TypeVar("R")
+
+# Requisições idênticas simultâneas (mesmo endpoint e payload) dividem um cálculo.
+_COALESCER: SingleFlight[object] = SingleFlight()
+
+
+async def _coalesced(endpoint: str, compute: Callable[[M], R], payload: M) -> R:
+    key = (endpoint, payload.model_dump_json())
+    return await _COALESCER.run(key, lambda: compute(payload))
+
+
+def _chart_etag(endpoint: str, payload: BaseModel) -> str:
+    return strong_etag(endpoint, engine_version(), payload.model_dump_json())
+
+
+async def _conditional_chart(
+    endpoint: str,
+    compute: Callable[[M], NatalChartResponse],
+    payload: M,
+    request: Request,
+    response: Response,
+    cache_headers: dict[str, str] | None = None,
+    revalidate: Callable[[M], bool] | None = None,
+) -> NatalChartResponse | Response:
+    # O mapa é função pura do payload e da versão do motor: o ETag sai antes do
+    # cálculo e um If-None-Match igual responde 304 sem calcular nada. Quando a
+    # resposta tem efeito colateral, ``revalidate`` confirma (e renova) esse
+    # efeito antes do 304; se falhar, o mapa é calculado de novo.
+    headers = {"ETag": _chart_etag(endpoint, payload), **(cache_headers or {})}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]) and (
+        revalidate is None or revalidate(payload)
+    ):
+        return Response(status_code=304, headers=headers)
+    chart = await _coalesced(endpoint, compute, payload)
+    response.headers.update(headers)
+    return chart
+
+
+def _calculate_stored_chart(payload: NatalChartRequest) -> NatalChartResponse:
+    chart = calculate_natal_chart(payload)
+    chart_id = get_chart_store().put(payload, chart)
+    return chart.model_copy(update={"chart_id": chart_id})
+
+
+def _touch_stored_chart(payload: NatalChartRequest) -> bool:
+    store = get_chart_store()
+    return store.touch(store.chart_id(payload))
+
+
+def _resolve_reference(
+    payload: M | ChartReference, request_model: type[M]
+) -> tuple[M, NatalChartResponse | None]:
+    """Troca um ``chart_id`` pelo pedido completo e pelo mapa natal já calculado."""
+    if not isinstance(payload, ChartReference):
+        return payload, None
+    try:
+        stored = get_chart_store().get(payload.chart_id)
+    except ChartNotFound as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    try:
+        resolved = request_model(
+            **stored.request.model_dump(), **payload.model_dump(exclude={"chart_id"})
+        )
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors()) from exc
+    return resolved, stored.chart
+
 
 @router.post("/chart/natal", response_model=NatalChartResponse)
-async def natal_chart(payload: NatalChartRequest) -> NatalChartResponse:
+async def natal_chart(
+    payload: NatalChartRequest,
+    request: Request,
+    response: Response,
+    store: bool = Query(False, description="Guarda o mapa e devolve um chart_id"),
+) -> NatalChartResponse | Response:
     try:
-        chart = calculate_natal_chart(payload)
+        if store:
+            return await _conditional_chart(
+                "natal-stored",
+                _calculate_stored_chart,
+                payload,
+                request,
+                response,
+                revalidate=_touch_stored_chart,
+            )
+        return await _conditional_chart(
+            "natal", calculate_natal_chart, payload, request, response
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        logger.exception("Failed to calculate chart")
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+def _canonical_natal_query(payload: NatalChartRequest) -> str:
+    params = payload.model_dump(mode="json", exclude_defaults=True, exclude={"aspects", "bodies"})
+    orbs = payload.aspects.orbs.model_dump(exclude_defaults=True)
+    params.update({f"orb_{name}": value for name, value in orbs.items()})
+    if payload.bodies is not None:
+        params["bodies"] = ",".join(payload.bodies)
+    return urlencode(sorted(params.items()), safe=":,", quote_via=quote)
+
+
+@router.get("/chart/natal", response_model=NatalChartResponse)
+async def natal_chart_get(
+    request: Request,
+    response: Response,
+    full_name: str,
+    birth_date: date,
+    birth_time: time,
+    birth_place: str,
+    language: str = "pt-BR",
+    house_system: str = "P",
+    zodiac: str = "tropical",
+    sidereal_mode: str | None = None,
+    bodies: str | None = Query(None, description="Corpos separados por vírgula"),
+    precision: str = "precise",
+    orb_conjunction: float | None = None,
+    orb_opposition: float | None = None,
+    orb_square: float | None = None,
+    orb_trine: float | None = None,
+    orb_sextile: float | None = None,
+) -> NatalChartResponse | Response:
+    orbs = {
+        "conjunction": orb_conjunction,
+        "opposition": orb_opposition,
+        "square": orb_square,
+        "trine": orb_trine,
+        "sextile": orb_sextile,
+    }
+    try:
+        payload = NatalChartRequest(
+            full_name=full_name,
+            birth_date=birth_date,
+            birth_time=birth_time,
+            birth_place=birth_place,
+            language=language,
+            house_system=house_system,
+            zodiac=zodiac,
+            sidereal_mode=sidereal_mode,
+            aspects={"orbs": {name: value for name, value in orbs.items() if value is not None}},
+            bodies=bodies.split(",") if bodies else None,
+            precision=precision,
+        )
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors()) from exc
+
+    cache_headers = {"Cache-Control": f"public, max-age={settings.chart_http_max_age}"}
+    # Uma URL por mapa: parâmetros fora da forma canônica (ordem, defaults
+    # explícitos, codificação) redirecionam para ela, e os caches HTTP guardam uma
+    # única cópia.
+    canonical = _canonical_natal_query(payload)
+    if request.url.query != canonical:
+        return RedirectResponse(
+            f"{request.url.path}?{canonical}", status_code=301, headers=cache_headers
+        )
+    try:
+        return await _conditional_chart(
+            "natal", calculate_natal_chart, payload, request, response, cache_headers
+        )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except RuntimeError as exc:
         logger.exception("Failed to calculate chart")
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
-    return chart
+
+@router.get("/chart/cache-stats")
+async def chart_cache() -> dict[str, object]:
+    return {**chart_cache_stats(), "coalescing": _COALESCER.stats()}
 
 
 @router.post("/chart/solar-return", response_model=NatalChartResponse)
-async def solar_return(payload: SolarReturnRequest) -> NatalChartResponse:
+async def solar_return(
+    payload: SolarReturnRequest | SolarReturnByChart, request: Request, response: Response
+) -> NatalChartResponse | Response:
+    resolved, natal = _resolve_reference(payload, SolarReturnRequest)
     try:
-        chart = calculate_solar_return(payload)
+        return await _conditional_chart(
+            "solar-return",
+            lambda item: calculate_solar_return(item, natal),
+            resolved,
+            request,
+            response,
+        )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except RuntimeError as exc:
         logger.exception("Failed to calculate solar return")
         raise HTTPException(status_code=500, detail=str(exc)) from exc
-    return chart
 
 
 @router.post("/chart/progression", response_model=NatalChartResponse)
-async def progression(payload: ProgressionRequest) -> NatalChartResponse:
+async def progression(
+    payload: ProgressionRequest | ProgressionByChart, request: Request, response: Response
+) -> NatalChartResponse | Response:
+    # A progressão só precisa dos dados de nascimento guardados com o mapa.
+    resolved, _ = _resolve_reference(payload, ProgressionRequest)
     try:
-        chart = calculate_progression(payload)
+        return await _conditional_chart("progression", calculate_progression, resolved, request, response)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except RuntimeError as exc:
         logger.exception("Failed to calculate progression")
         raise HTTPException(status_code=500, detail=str(exc)) from exc
-    return chart
+
+
+@router.post("/chart/relocation")
+async def relocation(payload: RelocationRequest) -> StreamingResponse:
+    try:
+        entries = calculate_relocations(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        logger.exception("Failed to calculate relocation")
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    # Um mapa por linha (NDJSON), enviado assim que cada local é calculado.
+    return StreamingResponse(
+        (entry.model_dump_json() + "\n" for entry in entries),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.post("/chart/midpoints", response_model=MidpointResponse)
+async def midpoints(payload: MidpointRequest) -> MidpointResponse:
+    try:
+        return calculate_midpoints(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        logger.exception("Failed to calculate midpoints")
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@router.post("/chart/harmonic", response_model=HarmonicResponse)
+async def harmonic(payload: HarmonicRequest) -> HarmonicResponse:
+    try:
+        return calculate_harmonic(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        logger.exception("Failed to calculate harmonic chart")
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@router.post("/chart/fixed-stars", response_model=FixedStarResponse)
+async def fixed_stars(payload: FixedStarRequest) -> FixedStarResponse:
+    try:
+        return calculate_fixed_stars(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        logger.exception("Failed to calculate fixed stars")
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@router.post("/chart/astrocartography", response_model=AstrocartographyResponse)
+async def astrocartography(payload: AstrocartographyRequest) -> AstrocartographyResponse:
+    try:
+        return calculate_astrocartography(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        logger.exception("Failed to calculate astrocartography")
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@router.post("/events/ingresses", response_model=EventListResponse)
+async def ingresses(payload: EventRangeRequest) -> EventListResponse:
+    try:
+        return list_ingresses(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        logger.exception("Failed to query ingresses")
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@router.post("/events/stations", response_model=EventListResponse)
+async def stations(payload: EventRangeRequest) -> EventListResponse:
+    try:
+        return list_stations(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        logger.exception("Failed to query stations")
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@router.post("/events/void-of-course", response_model=VoidOfCourseResponse)
+async def void_of_course(payload: EventRangeRequest) -> VoidOfCourseResponse:
+    try:
+        return list_void_of_course(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        logger.exception("Failed to query void-of-course periods")
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@router.post("/ephemeris/table")
+async def ephemeris_table_export(payload: EphemerisTableRequest) -> StreamingResponse:
+    try:
+        chunks = ephemeris_table(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        logger.exception("Failed to calculate ephemeris table")
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    # Um bloco de dias por vez: uma tabela de séculos nunca fica inteira em memória.
+    extension, media_type = (
+        ("csv", "text/csv") if payload.format == "csv" else ("ndjson", "application/x-ndjson")
+    )
+    filename = f"ephemeris-{payload.start_date}-{payload.end_date}.{extension}"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post("/electional/search", response_model=ElectionalResponse)
+async def electional_search(payload: ElectionalRequest) -> ElectionalResponse:
+    try:
+        return search_elections(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        logger.exception("Failed to search electional windows")
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@router.post("/planetary-hours", response_model=PlanetaryHoursResponse)
+async def planetary_hours(payload: PlanetaryHoursRequest) -> PlanetaryHoursResponse:
+    try:
+        return calculate_planetary_hours(payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        logger.exception("Failed to calculate planetary hours")
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+def _job_timestamp(value: float | None) -> str | None:
+    if value is None:
+        return None
+    return _format_utc_datetime(datetime.fromtimestamp(value, timezone.utc))
+
+
+def _job_status(job: Job) -> JobStatus:
+    kind = JOB_KINDS.get(job.kind)
+    staged = kind is not None and kind.reports_progress
+    return JobStatus(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        priority=job.priority,
+        progress=round(job.progress, 4) if staged or job.status == "succeeded" else None,
+        attempts=job.attempts,
+        error=job.error,
+        created_at=_job_timestamp(job.created_at),
+        started_at=_job_timestamp(job.started_at),
+        finished_at=_job_timestamp(job.finished_at),
+        expires_at=_job_timestamp(job.expires_at),
+    )
+
+
+@router.post("/jobs", response_model=JobStatus, status_code=202)
+async def submit_job(payload: JobSubmitRequest) -> JobStatus:
+    try:
+        request = JOB_KINDS[payload.kind].request_model.model_validate(payload.payload)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors()) from exc
+    job = get_job_queue().submit(payload.kind, request.model_dump_json(), payload.priority)
+    notify_job_workers()
+    return _job_status(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def job_status(job_id: str) -> JobStatus:
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job não encontrado ou expirado.")
+    return _job_status(job)
+
+
+@router.get("/jobs/{job_id}/result")
+async def job_result(job_id: str) -> Response:
+    queue = get_job_queue()
+    result = queue.result(job_id)
+    if result is not None:
+        return Response(content=result, media_type="application/json")
+    job = queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job não encontrado ou expirado.")
+    if job.status == "failed":
+        raise HTTPException(status_code=409, detail=f"Job falhou: {job.error}")
+    raise HTTPException(status_code=409, detail=f"Job ainda não terminou ({job.status}).")
 
 
 @router.post("/lunation", response_model=LunationResponse)
 async def lunation(payload: LunationRequest) -> LunationResponse:
     try:
-        return calculate_lunation(payload)
+        return await _coalesced("lunation", calculate_lunation, payload)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except RuntimeError as exc:
@@ -78,9 +486,10 @@ async def lunation(payload: LunationRequest) -> LunationResponse:
 
 
 @router.post("/report/doc")
-async def report_doc(payload: NatalChartRequest) -> Response:
+async def report_doc(payload: NatalChartRequest | ChartReference) -> Response:
+    resolved, chart = _resolve_reference(payload, NatalChartRequest)
     try:
-        content = build_rtf_report(payload)
+        content = build_rtf_report(resolved, chart)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except RuntimeError as exc:
@@ -95,10 +504,11 @@ async def report_doc(payload: NatalChartRequest) -> Response:
 
 @router.post("/interpretation/ai", response_model=AIInterpretationResponse)
 async def ai_interpretation(
-    payload: AIInterpretationRequest,
+    payload: AIInterpretationRequest | AIInterpretationByChart,
 ) -> AIInterpretationResponse:
+    resolved, chart = _resolve_reference(payload, AIInterpretationRequest)
     try:
-        return build_ai_interpretation(payload)
+        return build_ai_interpretation(resolved, chart)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except RuntimeError as exc:
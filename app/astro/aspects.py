@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Sequence
 
 ASPECTS = {
     "conjunction": 0,
@@ -11,7 +12,7 @@ ASPECTS = {
 }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AspectResult:
     planet1: str
     planet2: str
@@ -32,10 +33,26 @@ def calculate_aspects(
     bodies: list[dict[str, float]],
     orbs: dict[str, float],
 ) -> list[AspectResult]:
+    return find_aspects(
+        [body["name"] for body in bodies],
+        [body["longitude"] for body in bodies],
+        [body["speed"] for body in bodies],
+        orbs,
+    )
+
+
+def find_aspects(
+    names: Sequence[str],
+    longitudes: Sequence[float],
+    speeds: Sequence[float],
+    orbs: dict[str, float],
+) -> list[AspectResult]:
+    """Aspectos entre corpos dados em sequências paralelas (nomes, longitudes, velocidades)."""
     results: list[AspectResult] = []
-    for i, body1 in enumerate(bodies):
-        for body2 in bodies[i + 1 :]:
-            relative_longitude = (body1["longitude"] - body2["longitude"]) % 360
+    count = len(names)
+    for i in range(count):
+        for j in range(i + 1, count):
+            relative_longitude = (longitudes[i] - longitudes[j]) % 360
             separation = _normalize_angle(relative_longitude)
             for aspect_name, aspect_angle in ASPECTS.items():
                 orb_allowed = orbs.get(aspect_name)
@@ -43,7 +60,7 @@ def calculate_aspects(
                     continue
                 orb = abs(separation - aspect_angle)
                 if orb <= orb_allowed:
-                    relative_speed = body1["speed"] - body2["speed"]
+                    relative_speed = speeds[i] - speeds[j]
                     applying = None
                     if relative_speed != 0:
                         candidates = [
@@ -65,8 +82,8 @@ def calculate_aspects(
                             applying = backward_distance == min_distance
                     results.append(
                         AspectResult(
-                            planet1=body1["name"],
-                            planet2=body2["name"],
+                            planet1=names[i],
+                            planet2=names[j],
                             type=aspect_name,
                             exact_angle=aspect_angle,
                             orb=round(orb, 3),
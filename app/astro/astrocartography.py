@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+import swisseph as swe
+
+from app.api.models import (
+    AstrocartographyLine,
+    AstrocartographyRequest,
+    AstrocartographyResponse,
+)
+from app.astro.bodies import ensure_asteroid_files
+from app.astro.ephemeris import (
+    ChartLocation,
+    _birth_moment,
+    _format_utc_datetime,
+    _julian_day,
+    _mock_mode,
+    _sky_positions,
+    selected_bodies,
+)
+
+ANGLES = ("ASC", "DSC", "MC", "IC")
+
+
+def _wrap_longitude(value: np.ndarray) -> np.ndarray:
+    return (value + 180.0) % 360.0 - 180.0
+
+
+def equatorial_coordinates(
+    longitudes: np.ndarray, latitudes: np.ndarray, obliquity: float
+) -> tuple[np.ndarray, np.ndarray]:
+    lam = np.radians(longitudes)
+    beta = np.radians(latitudes)
+    eps = np.radians(obliquity)
+    right_ascension = np.degrees(
+        np.arctan2(np.sin(lam) * np.cos(eps) - np.tan(beta) * np.sin(eps), np.cos(lam))
+    ) % 360.0
+    declination = np.degrees(
+        np.arcsin(np.sin(beta) * np.cos(eps) + np.cos(beta) * np.sin(eps) * np.sin(lam))
+    )
+    return right_ascension, declination
+
+
+def semi_diurnal_arc(declination: np.ndarray, latitude: np.ndarray | float) -> np.ndarray:
+    """Semiarco diurno em graus (``cos H0 = -tan(lat) tan(dec)``); ``NaN`` se circumpolar."""
+    cos_h0 = -np.tan(np.radians(latitude)) * np.tan(np.radians(declination))
+    with np.errstate(invalid="ignore"):
+        return np.degrees(np.arccos(cos_h0))
+
+
+def angle_lines(
+    right_ascension: np.ndarray,
+    declination: np.ndarray,
+    sidereal_time: float,
+    latitudes: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """Longitudes geográficas (corpos x latitudes) em que cada corpo ocupa cada ângulo.
+
+    MC/IC são meridianos: o tempo sidéreo local iguala a ascensão reta. ASC/DSC
+    ficam a um semiarco diurno do meridiano; onde o corpo é circumpolar não há
+    nascer/ocaso e a longitude fica ``NaN``.
+    """
+    mc = _wrap_longitude(right_ascension - sidereal_time)[:, None]
+    semi_arc = semi_diurnal_arc(declination[:, None], latitudes[None, :])
+    meridian = np.broadcast_to(mc, semi_arc.shape)
+    return {
+        "ASC": _wrap_longitude(mc - semi_arc),
+        "DSC": _wrap_longitude(mc + semi_arc),
+        "MC": meridian,
+        "IC": _wrap_longitude(meridian + 180.0),
+    }
+
+
+def _polylines(longitudes: np.ndarray, latitudes: np.ndarray) -> list[list[tuple[float, float]]]:
+    valid = ~np.isnan(longitudes)
+    # Quebra a linha onde ela some (circumpolar) ou cruza o antimeridiano.
+    breaks = ~valid[:-1] | ~valid[1:] | (np.abs(np.diff(longitudes)) > 180.0)
+    segments = []
+    for indexes in np.split(np.arange(len(longitudes)), np.flatnonzero(breaks) + 1):
+        if len(indexes) < 2 or not valid[indexes[0]]:
+            continue
+        segments.append(
+            list(
+                zip(
+                    np.round(longitudes[indexes], 4).tolist(),
+                    np.round(latitudes[indexes], 4).tolist(),
+                )
+            )
+        )
+    return segments
+
+
+def _latitude_grid(max_latitude: float, step: float) -> np.ndarray:
+    count = int(round(2 * max_latitude / step)) + 1
+    return np.linspace(-max_latitude, max_latitude, max(count, 2))
+
+
+def calculate_astrocartography(payload: AstrocartographyRequest) -> AstrocartographyResponse:
+    bodies = selected_bodies(payload.bodies)
+    ensure_asteroid_files(bodies.values())
+
+    if _mock_mode():
+        # Sem geocoding em modo mock: o horário é tratado como UTC.
+        location = ChartLocation(latitude=0.0, longitude=0.0, place=payload.birth_place, timezone="UTC")
+        utc_dt = datetime.combine(payload.birth_date, payload.birth_time)
+        jd_ut = _julian_day(utc_dt)
+    else:
+        location, chart_time = _birth_moment(
+            payload.birth_date, payload.birth_time, payload.birth_place
+        )
+        utc_dt, jd_ut = chart_time.utc_dt, chart_time.jd_ut
+
+    sky = _sky_positions(jd_ut, bodies.values())
+    names = list(bodies)
+    positions = np.array([(sky[body].longitude, sky[body].latitude) for body in bodies.values()])
+    nutation, _ = swe.calc_ut(jd_ut, swe.ECL_NUT)
+    right_ascension, declination = equatorial_coordinates(
+        positions[:, 0], positions[:, 1], nutation[0]
+    )
+    sidereal_time = swe.sidtime(jd_ut) * 15.0
+    latitudes = _latitude_grid(payload.max_latitude, payload.latitude_step)
+    grid = angle_lines(right_ascension, declination, sidereal_time, latitudes)
+
+    lines = [
+        AstrocartographyLine(body=name, angle=angle, segments=_polylines(grid[angle][row], latitudes))
+        for row, name in enumerate(names)
+        for angle in ANGLES
+    ]
+    return AstrocartographyResponse(
+        full_name=payload.full_name,
+        birth_place=location.place,
+        utc_datetime=_format_utc_datetime(utc_dt),
+        latitude=round(location.latitude, 6),
+        longitude=round(location.longitude, 6),
+        sidereal_time=round(sidereal_time, 6),
+        lines=lines,
+    )
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import re
+from typing import Iterable
+
+import swisseph as swe
+
+from app.core.config import settings
+from app.utils.lru import LRUCache
+
+DEFAULT_BODIES = (
+    "Sun",
+    "Moon",
+    "Mercury",
+    "Venus",
+    "Mars",
+    "Jupiter",
+    "Saturn",
+    "Uranus",
+    "Neptune",
+    "Pluto",
+    "True Node",
+    "Chiron",
+)
+
+BODY_REGISTRY: dict[str, int] = {
+    "Sun": swe.SUN,
+    "Moon": swe.MOON,
+    "Mercury": swe.MERCURY,
+    "Venus": swe.VENUS,
+    "Mars": swe.MARS,
+    "Jupiter": swe.JUPITER,
+    "Saturn": swe.SATURN,
+    "Uranus": swe.URANUS,
+    "Neptune": swe.NEPTUNE,
+    "Pluto": swe.PLUTO,
+    "True Node": swe.TRUE_NODE,
+    "Mean Node": swe.MEAN_NODE,
+    "Lilith": swe.MEAN_APOG,
+    "Chiron": swe.CHIRON,
+    "Ceres": swe.CERES,
+    "Pallas": swe.PALLAS,
+    "Juno": swe.JUNO,
+    "Vesta": swe.VESTA,
+}
+
+# Asteroides numerados: "433", "#433" ou "Asteroid 433".
+_ASTEROID_PATTERN = re.compile(r"^(?:asteroid\s*)?#?(\d{1,6})$", re.IGNORECASE)
+
+# Só arquivos encontrados entram no cache: um arquivo instalado depois (no mesmo
+# ASTRO_EPHEMERIS_PATH) passa a valer sem reiniciar o processo.
+_ASTEROID_FILES: LRUCache[tuple[int, str], Path] = LRUCache(1024)
+
+
+def resolve_bodies(names: Iterable[str]) -> dict[str, int]:
+    bodies: dict[str, int] = {}
+    unknown = []
+    for raw_name in names:
+        name = raw_name.strip()
+        if name in BODY_REGISTRY:
+            bodies[name] = BODY_REGISTRY[name]
+            continue
+        match = _ASTEROID_PATTERN.match(name)
+        if match and int(match.group(1)) > 0:
+            number = int(match.group(1))
+            bodies[f"Asteroid {number}"] = swe.AST_OFFSET + number
+            continue
+        unknown.append(raw_name)
+    if unknown:
+        raise ValueError(f"Corpos desconhecidos: {', '.join(unknown)}")
+    if not bodies:
+        raise ValueError("Informe ao menos um corpo.")
+    return bodies
+
+
+def _ephemeris_path() -> str:
+    return os.getenv("ASTRO_EPHEMERIS_PATH") or settings.ephemeris_path or ""
+
+
+def _asteroid_file(number: int, ephemeris_path: str) -> Path | None:
+    # Mesma convenção do Swiss Ephemeris: astN/se00433.se1 (ou sNNNNNN.se1 acima
+    # de 99999), com a variante "s" de arquivos curtos.
+    cached = _ASTEROID_FILES.get((number, ephemeris_path))
+    if cached is not None:
+        return cached
+    stem = f"se{number:05d}" if number < 100_000 else f"s{number}"
+    folder = f"ast{number // 1000}"
+    for directory in filter(None, ephemeris_path.split(os.pathsep)):
+        for name in (f"{stem}.se1", f"{stem}s.se1"):
+            for candidate in (Path(directory) / folder / name, Path(directory) / name):
+                if candidate.is_file():
+                    _ASTEROID_FILES.put((number, ephemeris_path), candidate)
+                    return candidate
+    return None
+
+
+def ensure_asteroid_files(bodies: Iterable[int]) -> None:
+    """Verifica, só quando um asteroide numerado é pedido, se o arquivo existe.
+
+    O Swiss Ephemeris abre o arquivo sob demanda no primeiro cálculo; a checagem
+    (arquivos encontrados ficam em cache por número e caminho) transforma a
+    ausência em erro do pedido.
+    """
+    path = _ephemeris_path()
+    for body in bodies:
+        if body <= swe.AST_OFFSET:
+            continue
+        number = body - swe.AST_OFFSET
+        if _asteroid_file(number, path) is None:
+            raise ValueError(
+                f"Arquivo de efemérides do asteroide {number} não encontrado em ASTRO_EPHEMERIS_PATH."
+            )
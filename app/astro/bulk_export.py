@@ -0,0 +1,432 @@
+"""Exportação offline de mapas natais em lote, sem o servidor HTTP.
+
+Lê registros de nascimento de CSV ou NDJSON, calcula os mapas num pool de
+processos e grava NDJSON ou CSV em blocos, na ordem da entrada. A memória fica
+limitada a alguns blocos em voo, qualquer que seja o tamanho do arquivo.
+
+    python -m app.astro.bulk_export clientes.csv mapas.ndjson
+    python -m app.astro.bulk_export clientes.ndjson mapas.csv --workers 8 --chunk-size 1000
+    python -m app.astro.bulk_export clientes.csv mapas.ndjson --resume
+"""
+from __future__ import annotations
+
+import argparse
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import csv
+from dataclasses import dataclass
+import io
+import json
+import logging
+import math
+import os
+from pathlib import Path
+import sys
+import time
+from typing import BinaryIO, Callable, Iterable, Iterator, TextIO
+
+from pydantic import ValidationError
+
+from app.api.models import AspectOrbs, NatalChartRequest
+from app.astro.bodies import DEFAULT_BODIES
+from app.astro.dignities import dignity_labels
+from app.astro.lots import compiled_lots
+from app.astro.ephemeris import (
+    Chart,
+    ChartLocation,
+    _format_utc_datetime,
+    chart_response,
+    compute_chart,
+    place_location,
+)
+from app.astro.geocode import normalize_place
+from app.utils.lru import LRUCache
+from app.utils.signs import to_sign_position
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "ndjson")
+_SUFFIX_FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+_ORB_COLUMNS = {f"orb_{name}": name for name in AspectOrbs.model_fields}
+# Bloco lido de trás para frente ao procurar a última linha da saída.
+_TAIL_BLOCK = 64 * 1024
+
+
+@dataclass
+class ExportStats:
+    records: int = 0
+    charts: int = 0
+    errors: int = 0
+    offset: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def describe(self) -> str:
+        return (
+            f"{self.records} registros ({self.charts} mapas, {self.errors} erros) a partir "
+            f"da linha {self.offset} em {self.elapsed_seconds:.1f}s "
+            f"({self.records_per_second:.1f} registros/s)"
+        )
+
+
+def detect_format(path: Path, explicit: str | None) -> str:
+    if explicit:
+        return explicit
+    detected = _SUFFIX_FORMATS.get(path.suffix.lower())
+    if detected is None:
+        raise ValueError(f"Formato não reconhecido para {path}; use csv ou ndjson.")
+    return detected
+
+
+def _read_records(handle: TextIO, input_format: str) -> Iterator[dict[str, object] | str]:
+    # Cada registro vira um dict; uma linha NDJSON ilegível vira a mensagem de erro.
+    if input_format == "csv":
+        for row in csv.DictReader(handle):
+            yield {key: value for key, value in row.items() if key and value not in ("", None)}
+        return
+    for line in handle:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield f"JSON inválido: {exc}"
+            continue
+        yield record if isinstance(record, dict) else "O registro deve ser um objeto JSON."
+
+
+def record_payload(record: dict[str, object]) -> NatalChartRequest:
+    """Registro da entrada como pedido de mapa; no CSV, ``bodies`` vem separado por
+    vírgula e os orbs em colunas ``orb_<aspecto>``, como no GET de /v1/chart/natal."""
+    fields = {key: value for key, value in record.items() if key not in _ORB_COLUMNS}
+    orbs = {_ORB_COLUMNS[key]: value for key, value in record.items() if key in _ORB_COLUMNS}
+    if orbs:
+        fields["aspects"] = {"orbs": orbs}
+    if isinstance(fields.get("bodies"), str):
+        fields["bodies"] = [name.strip() for name in fields["bodies"].split(",") if name.strip()]
+    return NatalChartRequest.model_validate(fields)
+
+
+# (linha, pedido e local resolvido) ou (linha, mensagem de erro)
+Task = tuple[int, NatalChartRequest, ChartLocation] | tuple[int, str]
+
+
+def _prepare(
+    rows: Iterable[tuple[int, dict[str, object] | str]],
+    locations: LRUCache[str, ChartLocation | str],
+) -> list[Task]:
+    # O geocoding fica no processo principal: o Nominatim exige 1 req/s e os
+    # workers não dividiriam esse limite. Locais repetidos saem do cache.
+    tasks: list[Task] = []
+    for row, record in rows:
+        if isinstance(record, str):
+            tasks.append((row, record))
+            continue
+        try:
+            payload = record_payload(record)
+        except ValidationError as exc:
+            tasks.append((row, _validation_message(exc)))
+            continue
+        key = normalize_place(payload.birth_place)
+        location = locations.get(key)
+        if location is None:
+            try:
+                location = place_location(payload.birth_place)
+            except (ValueError, RuntimeError) as exc:
+                location = str(exc)
+            locations.put(key, location)
+        tasks.append((row, location) if isinstance(location, str) else (row, payload, location))
+    return tasks
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'registro'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def csv_columns(bodies: Iterable[str]) -> list[str]:
+    columns = [
+        "row",
+        "error",
+        "full_name",
+        "birth_date",
+        "birth_time",
+        "birth_place",
+        "timezone",
+        "utc_datetime",
+        "latitude",
+        "longitude",
+        "asc",
+        "asc_sign",
+        "mc",
+        "mc_sign",
+        "vertex",
+        "fortune",
+    ]
+    for body in bodies:
+        columns.extend(
+            f"{body}_{field}"
+            for field in ("longitude", "sign", "house", "retrograde", "dignities")
+        )
+    return columns
+
+
+def _csv_row(row: int, payload: NatalChartRequest, chart: Chart) -> dict[str, object]:
+    # Direto dos arrays do mapa compacto, sem montar os modelos da API.
+    values: dict[str, object] = {
+        "row": row,
+        "full_name": payload.full_name,
+        "birth_date": payload.birth_date.isoformat(),
+        "birth_time": payload.birth_time.isoformat(),
+        "birth_place": chart.location.place,
+        "timezone": chart.location.timezone,
+        "utc_datetime": _format_utc_datetime(chart.time.utc_dt),
+        "latitude": round(chart.location.latitude, 6),
+        "longitude": round(chart.location.longitude, 6),
+        "asc": round(chart.houses.asc, 6),
+        "asc_sign": to_sign_position(chart.houses.asc).sign,
+        "mc": round(chart.houses.mc, 6),
+        "mc_sign": to_sign_position(chart.houses.mc).sign,
+    }
+    if chart.houses.vertex is not None:
+        values["vertex"] = round(chart.houses.vertex, 6)
+    fortune = chart.lots[compiled_lots().names.index("Fortune")]
+    if not math.isnan(fortune):
+        values["fortune"] = round(fortune, 6)
+    bodies = chart.bodies
+    for name, longitude, speed, house, dignities in zip(
+        bodies.names, bodies.longitudes, bodies.speeds, chart.placement, chart.dignities
+    ):
+        values[f"{name}_longitude"] = round(longitude, 6)
+        values[f"{name}_sign"] = to_sign_position(longitude).sign
+        values[f"{name}_house"] = house
+        values[f"{name}_retrograde"] = speed < 0
+        labels = dignity_labels(dignities)
+        if labels is not None:
+            values[f"{name}_dignities"] = ";".join(labels)
+    return values
+
+
+def _export_chunk(
+    tasks: list[Task], output_format: str, columns: list[str] | None
+) -> tuple[str, int, int]:
+    """Calcula um bloco e devolve o texto já serializado, mais mapas e erros."""
+    buffer = io.StringIO()
+    writer = (
+        csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore", lineterminator="\n")
+        if output_format == "csv"
+        else None
+    )
+    charts = errors = 0
+    for task in tasks:
+        row, error = task[0], None
+        if len(task) == 2:
+            error = task[1]
+        else:
+            _, payload, location = task
+            try:
+                chart = compute_chart(payload, location)
+            except (ValueError, RuntimeError) as exc:
+                error = str(exc)
+            except Exception:
+                logger.exception("Failed to export chart", extra={"row": row})
+                error = "Erro interno ao calcular o mapa."
+        if error is not None:
+            errors += 1
+            if writer is not None:
+                writer.writerow({"row": row, "error": error})
+            else:
+                buffer.write(json.dumps({"row": row, "error": error}, ensure_ascii=False) + "\n")
+            continue
+        charts += 1
+        if writer is not None:
+            writer.writerow(_csv_row(row, payload, chart))
+        else:
+            buffer.write(
+                f'{{"row": {row}, "chart": {chart_response(chart, payload).model_dump_json()}}}\n'
+            )
+    return buffer.getvalue(), charts, errors
+
+
+def resume_offset(path: Path, output_format: str) -> int:
+    """Primeira linha ainda não exportada em ``path``.
+
+    Uma última linha incompleta (processo interrompido no meio da escrita) é
+    descartada do arquivo antes de retomar.
+    """
+    if not path.exists() or path.stat().st_size == 0:
+        return 0
+    with path.open("rb+") as handle:
+        size = handle.seek(0, os.SEEK_END)
+        complete = _rfind_newline(handle, size) + 1
+        if complete < size:
+            handle.truncate(complete)
+        if complete == 0:
+            return 0
+        start = _rfind_newline(handle, complete - 1) + 1
+        if output_format == "csv" and start == 0:
+            return 0  # só o cabeçalho
+        handle.seek(start)
+        last = handle.read(complete - start).decode("utf-8").rstrip("\r\n")
+    if output_format == "csv":
+        return int(next(csv.reader([last]))[0]) + 1
+    return int(json.loads(last)["row"]) + 1
+
+
+def _rfind_newline(handle: BinaryIO, end: int) -> int:
+    """Posição do último ``\\n`` antes de ``end`` (ou -1), lendo blocos a partir do fim.
+
+    Só o fim do arquivo é lido: o custo não depende do tamanho da saída.
+    """
+    position = end
+    while position > 0:
+        start = max(0, position - _TAIL_BLOCK)
+        handle.seek(start)
+        index = handle.read(position - start).rfind(b"\n")
+        if index != -1:
+            return start + index
+        position = start
+    return -1
+
+
+def _chunks(
+    records: Iterator[dict[str, object] | str], offset: int, chunk_size: int
+) -> Iterator[list[tuple[int, dict[str, object] | str]]]:
+    chunk: list[tuple[int, dict[str, object] | str]] = []
+    for row, record in enumerate(records):
+        if row < offset:
+            continue
+        chunk.append((row, record))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def export_charts(
+    input_path: Path,
+    output_path: Path,
+    *,
+    input_format: str | None = None,
+    output_format: str | None = None,
+    workers: int | None = None,
+    chunk_size: int = 500,
+    offset: int = 0,
+    resume: bool = False,
+    bodies: Iterable[str] | None = None,
+    progress: Callable[[ExportStats], None] | None = None,
+) -> ExportStats:
+    """Exporta os mapas de ``input_path`` para ``output_path``.
+
+    ``offset`` pula as primeiras linhas da entrada; ``resume`` continua um arquivo
+    de saída existente a partir da última linha gravada. ``workers=1`` calcula no
+    próprio processo.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size deve ser positivo")
+    input_format = detect_format(input_path, input_format)
+    output_format = detect_format(output_path, output_format)
+    columns = csv_columns(bodies or DEFAULT_BODIES) if output_format == "csv" else None
+    if resume:
+        offset = max(offset, resume_offset(output_path, output_format))
+    appending = resume and output_path.exists() and output_path.stat().st_size > 0
+
+    stats = ExportStats(offset=offset)
+    started = time.perf_counter()
+    locations: LRUCache[str, ChartLocation | str] = LRUCache(4096)
+
+    def write(result: tuple[str, int, int], output: TextIO) -> None:
+        text, charts, errors = result
+        output.write(text)
+        output.flush()
+        stats.charts += charts
+        stats.errors += errors
+        stats.records += charts + errors
+        stats.elapsed_seconds = time.perf_counter() - started
+        if progress is not None:
+            progress(stats)
+
+    with input_path.open(newline="", encoding="utf-8") as source, output_path.open(
+        "a" if appending else "w", newline="", encoding="utf-8"
+    ) as output:
+        if columns is not None and not appending:
+            csv.DictWriter(output, fieldnames=columns, lineterminator="\n").writeheader()
+        chunks = _chunks(_read_records(source, input_format), offset, chunk_size)
+        if workers == 1:
+            for chunk in chunks:
+                write(_export_chunk(_prepare(chunk, locations), output_format, columns), output)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Blocos em voo limitados; os resultados saem na ordem da entrada.
+                max_pending = 2 * (workers or os.cpu_count() or 1)
+                pending: deque[Future[tuple[str, int, int]]] = deque()
+                for chunk in chunks:
+                    pending.append(
+                        executor.submit(
+                            _export_chunk, _prepare(chunk, locations), output_format, columns
+                        )
+                    )
+                    if len(pending) >= max_pending:
+                        write(pending.popleft().result(), output)
+                while pending:
+                    write(pending.popleft().result(), output)
+    stats.elapsed_seconds = time.perf_counter() - started
+    return stats
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", type=Path, help="Registros de nascimento (.csv ou .ndjson).")
+    parser.add_argument("output", type=Path, help="Arquivo de saída (.ndjson ou .csv).")
+    parser.add_argument("--input-format", choices=FORMATS)
+    parser.add_argument("--output-format", choices=FORMATS)
+    parser.add_argument("--workers", type=int, default=None, help="Processos (padrão: CPUs).")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Registros por bloco.")
+    parser.add_argument("--offset", type=int, default=0, help="Pula as N primeiras linhas.")
+    parser.add_argument(
+        "--resume", action="store_true", help="Continua a saída existente de onde parou."
+    )
+    parser.add_argument(
+        "--bodies", default=None, help="Corpos das colunas da saída CSV, separados por vírgula."
+    )
+    parser.add_argument(
+        "--report-every", type=float, default=10.0, help="Intervalo do progresso (segundos)."
+    )
+    args = parser.parse_args(argv)
+
+    last_report = time.perf_counter()
+
+    def report(stats: ExportStats) -> None:
+        nonlocal last_report
+        now = time.perf_counter()
+        if now - last_report >= args.report_every:
+            last_report = now
+            print(stats.describe(), file=sys.stderr)
+
+    try:
+        stats = export_charts(
+            args.input,
+            args.output,
+            input_format=args.input_format,
+            output_format=args.output_format,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            offset=args.offset,
+            resume=args.resume,
+            bodies=args.bodies.split(",") if args.bodies else None,
+            progress=report,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    print(stats.describe(), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
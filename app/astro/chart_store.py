@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+import sqlite3
+import time
+from typing import Iterator
+import zlib
+
+from app.api.models import NatalChartRequest, NatalChartResponse
+from app.astro.ephemeris import engine_version
+from app.core.config import settings
+from app.utils.etag import strong_etag
+from app.utils.lru import LRUCache
+
+
+class ChartNotFound(LookupError):
+    pass
+
+
+@dataclass(frozen=True)
+class StoredChart:
+    request: NatalChartRequest
+    chart: NatalChartResponse
+
+
+class ChartStore:
+    """Mapas calculados guardados por ``chart_id`` para as chamadas seguintes.
+
+    O id é derivado do payload e da versão do motor: o mesmo pedido gera o mesmo
+    id, e uma troca de efemérides gera ids novos. Cada mapa fica em SQLite como
+    JSON comprimido (zlib), com um LRU em memória na frente.
+    """
+
+    def __init__(self, path: str | Path, ttl_seconds: float, cache_size: int) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._cache: LRUCache[str, tuple[StoredChart, float]] = LRUCache(cache_size)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS charts (
+                    id TEXT PRIMARY KEY,
+                    request TEXT NOT NULL,
+                    chart BLOB NOT NULL,
+                    expires_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_charts_expires_at ON charts(expires_at);
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def chart_id(payload: NatalChartRequest) -> str:
+        return strong_etag("chart", engine_version(), payload.model_dump_json()).strip('"')
+
+    def put(self, payload: NatalChartRequest, chart: NatalChartResponse) -> str:
+        chart_id = self.chart_id(payload)
+        request = NatalChartRequest.model_validate(payload.model_dump())
+        stored_chart = chart.model_copy(update={"chart_id": None})
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        with self._connect() as connection:
+            connection.execute("DELETE FROM charts WHERE expires_at <= ?", (now,))
+            connection.execute(
+                "INSERT OR REPLACE INTO charts (id, request, chart, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    chart_id,
+                    request.model_dump_json(),
+                    zlib.compress(stored_chart.model_dump_json().encode()),
+                    expires_at,
+                ),
+            )
+        self._cache.put(chart_id, (StoredChart(request=request, chart=stored_chart), expires_at))
+        return chart_id
+
+    def touch(self, chart_id: str) -> bool:
+        """Renova o TTL de um mapa ainda guardado; ``False`` se ausente ou expirado."""
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        with self._connect() as connection:
+            updated = connection.execute(
+                "UPDATE charts SET expires_at = ? WHERE id = ? AND expires_at > ?",
+                (expires_at, chart_id, now),
+            ).rowcount
+        if not updated:
+            return False
+        cached = self._cache.get(chart_id)
+        if cached is not None:
+            self._cache.put(chart_id, (cached[0], expires_at))
+        return True
+
+    def get(self, chart_id: str) -> StoredChart:
+        now = time.time()
+        cached = self._cache.get(chart_id)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT request, chart, expires_at FROM charts WHERE id = ? AND expires_at > ?",
+                (chart_id, now),
+            ).fetchone()
+        if row is None:
+            raise ChartNotFound(f"Mapa não encontrado ou expirado: {chart_id}")
+        stored = StoredChart(
+            request=NatalChartRequest.model_validate_json(row[0]),
+            chart=NatalChartResponse.model_validate_json(zlib.decompress(row[1])),
+        )
+        self._cache.put(chart_id, (stored, row[2]))
+        return stored
+
+
+@lru_cache(maxsize=1)
+def get_chart_store() -> ChartStore:
+    return ChartStore(
+        settings.chart_store_path,
+        ttl_seconds=settings.chart_store_ttl_seconds,
+        cache_size=settings.chart_store_cache_size,
+    )
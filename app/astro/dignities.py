@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterable
+
+DATA_PATH = Path(__file__).with_name("data") / "dignities.json"
+
+# Um bit por dignidade; a máscara de um corpo num grau cabe em um byte.
+DIGNITIES = ("domicile", "exaltation", "detriment", "fall", "triplicity", "term", "decan")
+DOMICILE, EXALTATION, DETRIMENT, FALL, TRIPLICITY, TERM, DECAN = (
+    1 << bit for bit in range(len(DIGNITIES))
+)
+# Sem dignidade essencial (domicílio, exaltação, triplicidade, termo ou face).
+PEREGRINE = "peregrine"
+_ESSENTIAL = DOMICILE | EXALTATION | TRIPLICITY | TERM | DECAN
+# Marca corpos sem tabela (planetas modernos, nodos, asteroides).
+NO_DIGNITIES = 0x80
+
+# Seita do mapa, que decide o regente de triplicidade: diurno, noturno ou
+# desconhecido (sem o Sol no mapa, vale o regente de dia ou o de noite).
+DAY, NIGHT, UNKNOWN_SECT = 0, 1, 2
+
+
+def _build_tables(data: dict) -> dict[str, tuple[bytes, bytes, bytes]]:
+    """Monta, por planeta e seita, um array de 360 máscaras (uma por grau)."""
+    signs = list(data["signs"].values())
+    if len(signs) != 12:
+        raise RuntimeError(f"Tabela de dignidades precisa de 12 signos: {DATA_PATH}")
+    planets = data["planets"]
+    tables = {name: [bytearray(360) for _ in range(3)] for name in planets}
+
+    def mark(planet: str, start: int, end: int, flag: int, sects: Iterable[int] = (0, 1, 2)) -> None:
+        for sect in sects:
+            table = tables[planet][sect]
+            for degree in range(start, end):
+                table[degree] |= flag
+
+    for index, sign in enumerate(signs):
+        start = index * 30
+        opposite = signs[(index + 6) % 12]
+        mark(sign["ruler"], start, start + 30, DOMICILE)
+        mark(opposite["ruler"], start, start + 30, DETRIMENT)
+        # Exaltação e queda valem para o signo inteiro; o grau fica só como dado.
+        if sign["exaltation"]:
+            mark(sign["exaltation"][0], start, start + 30, EXALTATION)
+        if opposite["exaltation"]:
+            mark(opposite["exaltation"][0], start, start + 30, FALL)
+
+        rulers = data["triplicities"][sign["element"]]
+        mark(rulers["day"], start, start + 30, TRIPLICITY, (DAY, UNKNOWN_SECT))
+        mark(rulers["night"], start, start + 30, TRIPLICITY, (NIGHT, UNKNOWN_SECT))
+        mark(rulers["participating"], start, start + 30, TRIPLICITY)
+
+        term_start = 0
+        for planet, term_end in sign["terms"]:
+            mark(planet, start + term_start, start + term_end, TERM)
+            term_start = term_end
+        if term_start != 30:
+            raise RuntimeError(f"Termos de {list(data['signs'])[index]} não somam 30 graus")
+        for decan, planet in enumerate(sign["decans"]):
+            mark(planet, start + decan * 10, start + decan * 10 + 10, DECAN)
+
+    return {name: tuple(bytes(table) for table in sect_tables) for name, sect_tables in tables.items()}
+
+
+TABLES = _build_tables(json.loads(DATA_PATH.read_text(encoding="utf-8")))
+
+# Rótulos já resolvidos para cada máscara possível.
+_LABELS: tuple[tuple[str, ...], ...] = tuple(
+    tuple(name for bit, name in enumerate(DIGNITIES) if mask & (1 << bit))
+    + (() if mask & _ESSENTIAL else (PEREGRINE,))
+    for mask in range(NO_DIGNITIES)
+)
+
+
+def chart_sect(sun_house: int | None) -> int:
+    """Mapa diurno quando o Sol está acima do horizonte (casas 7 a 12)."""
+    if sun_house is None:
+        return UNKNOWN_SECT
+    return DAY if sun_house >= 7 else NIGHT
+
+
+def dignity_masks(names: Iterable[str], longitudes: Iterable[float], sect: int) -> bytes:
+    """Máscara de dignidades por corpo: um acesso a array por corpo."""
+    return bytes(
+        TABLES[name][sect][int(longitude % 360) % 360] if name in TABLES else NO_DIGNITIES
+        for name, longitude in zip(names, longitudes)
+    )
+
+
+def dignity_labels(mask: int) -> list[str] | None:
+    if mask & NO_DIGNITIES:
+        return None
+    return list(_LABELS[mask])
@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, tzinfo
+from functools import reduce
+import math
+from typing import Callable, Hashable, Iterable
+
+import numpy as np
+import swisseph as swe
+from dateutil.tz import gettz
+
+from app.api.models import (
+    ElectionalConstraint,
+    ElectionalRequest,
+    ElectionalResponse,
+    ElectionalWindow,
+)
+from app.astro.bodies import BODY_REGISTRY, resolve_bodies
+from app.astro.ephemeris import (
+    ChartLocation,
+    _format_utc_datetime,
+    _julian_day,
+    place_location,
+)
+from app.astro.events import (
+    INGRESS,
+    INGRESS_BODIES,
+    STATION_BODIES,
+    STATION_DIRECT,
+    STATION_RETROGRADE,
+    _calc_flags,
+    _jd_to_datetime,
+    _wrap,
+    load_event_index,
+)
+from app.astro.timezone import local_to_utc
+from app.utils.intervals import Interval, complement, intersect
+from app.utils.signs import sign_index
+
+HARD_ASPECTS = (0.0, 90.0, 180.0)
+_MINUTE = 1 / 1440
+# Graus de ARMC por dia (dia sideral).
+_SIDEREAL_RATE = 360.98564736629
+# Passo de amostragem de cada restrição, menor que a menor duração típica de um
+# estado; as bordas são refinadas por bisseção até 30 segundos. Signos só são
+# amostrados quando não há trocas exatas (ver ``_sign_changes``).
+SAMPLING_STEPS = {
+    "asc_in_sign": 10 * _MINUTE,
+    "body_in_house": 10 * _MINUTE,
+    "body_in_sign": 0.25,
+    "no_hard_aspects": 1 / 24,
+}
+
+
+class _Sky:
+    """Posições e ARMC sob demanda, memoizadas durante uma busca."""
+
+    def __init__(self, location: ChartLocation, start_jd: float) -> None:
+        self.latitude = location.latitude
+        self.longitude = location.longitude
+        self.obliquity = swe.calc_ut(start_jd, swe.ECL_NUT)[0][0]
+        self._flags = _calc_flags()
+        self._positions: dict[tuple[float, int], tuple[float, float, float]] = {}
+
+    def position(self, jd: float, body: int) -> tuple[float, float, float]:
+        cached = self._positions.get((jd, body))
+        if cached is None:
+            data, _ = swe.calc_ut(jd, body, self._flags)
+            cached = self._positions[(jd, body)] = (data[0], data[1], data[3])
+        return cached
+
+    def armc(self, jd: float) -> float:
+        return (swe.sidtime(jd) * 15.0 + self.longitude) % 360.0
+
+
+def _refine_edge(
+    label_at: Callable[[float], Hashable], lo: float, hi: float, label_lo: Hashable
+) -> float:
+    while hi - lo > _MINUTE / 2:
+        mid = (lo + hi) / 2
+        if label_at(mid) == label_lo:
+            lo = mid
+        else:
+            hi = mid
+    return hi
+
+
+def _label_intervals(
+    start: float,
+    end: float,
+    step: float,
+    label_at: Callable[[float], Hashable],
+    wanted: Hashable,
+) -> list[Interval]:
+    """Intervalos em que ``label_at`` vale ``wanted``, a partir das trocas de rótulo."""
+    times = np.append(np.arange(start, end, step), end).tolist()
+    intervals: list[Interval] = []
+    previous = label_at(times[0])
+    opened = start if previous == wanted else None
+    for lo, hi in zip(times, times[1:]):
+        current = label_at(hi)
+        if current == previous:
+            continue
+        edge = _refine_edge(label_at, lo, hi, previous)
+        if opened is not None:
+            intervals.append((opened, edge))
+            opened = None
+        if current == wanted:
+            opened = edge
+        previous = current
+    if opened is not None:
+        intervals.append((opened, end))
+    return intervals
+
+
+def _sign_intervals(
+    start: float,
+    end: float,
+    sign_at_start: int,
+    changes: Iterable[tuple[float, int]],
+    wanted: int,
+) -> list[Interval]:
+    """Intervalos no signo ``wanted`` a partir das trocas ``(jd, signo novo)`` ordenadas."""
+    intervals: list[Interval] = []
+    opened = start if sign_at_start == wanted else None
+    for jd, sign in changes:
+        if opened is not None and sign != wanted:
+            intervals.append((opened, jd))
+            opened = None
+        elif opened is None and sign == wanted:
+            opened = jd
+    if opened is not None:
+        intervals.append((opened, end))
+    return intervals
+
+
+def _ingress_changes(body: int, start: float, end: float) -> list[tuple[float, int]] | None:
+    """Ingressos de ``body`` no índice de eventos; ``None`` se o índice não cobre."""
+    if body not in {BODY_REGISTRY[name] for name in INGRESS_BODIES}:
+        return None
+    try:
+        index = load_event_index()
+    except RuntimeError:
+        return None
+    if start < index.start_jd or end > index.end_jd:
+        return None
+    window = index.events(start, end)
+    return [
+        (jd, sign)
+        for jd, event_body, kind, sign in zip(
+            np.asarray(index.jd[window]).tolist(),
+            np.asarray(index.body[window]).tolist(),
+            np.asarray(index.kind[window]).tolist(),
+            np.asarray(index.sign[window]).tolist(),
+        )
+        if event_body == body and kind == INGRESS and jd < end
+    ]
+
+
+def _oblique_ascension(longitude: float, latitude: float, obliquity: float) -> float:
+    """Ascensão oblíqua de um ponto da eclíptica: ARMC + 90 quando ele nasce."""
+    lam, eps, phi = map(math.radians, (longitude, obliquity, latitude))
+    right_ascension = math.atan2(math.sin(lam) * math.cos(eps), math.cos(lam))
+    declination = math.asin(math.sin(eps) * math.sin(lam))
+    ascensional_difference = math.asin(math.tan(phi) * math.tan(declination))
+    return math.degrees(right_ascension - ascensional_difference) % 360.0
+
+
+def _asc_changes(sky: _Sky, start: float, end: float) -> list[tuple[float, int]] | None:
+    """Instantes exatos em que o Ascendente troca de signo; ``None`` no círculo polar.
+
+    O ASC entra no signo ``k`` quando o ARMC vale a ascensão oblíqua de ``30k``
+    menos 90°. O ARMC cresce um dia sideral por dia, então cada cúspide cai
+    uma vez por dia sideral e é resolvida direto, sem amostragem.
+    """
+    if abs(math.tan(math.radians(sky.latitude)) * math.tan(math.radians(sky.obliquity))) >= 1:
+        return None
+    base = sky.armc(start)
+    changes = []
+    for sign in range(12):
+        target = (_oblique_ascension(30.0 * sign, sky.latitude, sky.obliquity) - 90.0) % 360.0
+        offset = (target - base) % 360.0
+        while (jd := start + offset / _SIDEREAL_RATE) < end:
+            for _ in range(3):
+                jd += _wrap(target - sky.armc(jd)) / _SIDEREAL_RATE
+            if start < jd < end:
+                changes.append((jd, sign))
+            offset += 360.0
+    return sorted(changes)
+
+
+def _asc_sign(sky: _Sky, jd: float) -> int:
+    return int(swe.houses_armc(sky.armc(jd), sky.latitude, sky.obliquity, b"E")[1][0] // 30)
+
+
+def _body_id(name: str | None) -> int:
+    return next(iter(resolve_bodies([name or ""]).values()))
+
+
+def _moon_not_void(start: float, end: float) -> list[Interval]:
+    index = load_event_index()
+    _check_coverage(index.start_jd, index.end_jd, start, end)
+    window = index.void_of_course(start, end)
+    periods = zip(
+        np.asarray(index.voc_start[window]).tolist(), np.asarray(index.voc_end[window]).tolist()
+    )
+    return complement(periods, start, end)
+
+
+def _direct(sky: _Sky, body: int, start: float, end: float) -> list[Interval]:
+    index = load_event_index()
+    _check_coverage(index.start_jd, index.end_jd, start, end)
+    window = index.events(start, end)
+    stations = [
+        (jd, kind)
+        for jd, event_body, kind in zip(
+            np.asarray(index.jd[window]).tolist(),
+            np.asarray(index.body[window]).tolist(),
+            np.asarray(index.kind[window]).tolist(),
+        )
+        if event_body == body and kind in (STATION_RETROGRADE, STATION_DIRECT)
+    ]
+    retrograde: list[Interval] = []
+    opened = start if sky.position(start, body)[2] < 0 else None
+    for jd, kind in stations:
+        if kind == STATION_RETROGRADE:
+            opened = jd
+        elif opened is not None:
+            retrograde.append((opened, jd))
+            opened = None
+    if opened is not None:
+        retrograde.append((opened, end))
+    return complement(retrograde, start, end)
+
+
+def _check_coverage(index_start: float, index_end: float, start: float, end: float) -> None:
+    if start < index_start or end > index_end:
+        raise ValueError(
+            "Intervalo fora da cobertura do índice de eventos "
+            f"({_jd_to_datetime(index_start).date()} a {_jd_to_datetime(index_end - 1).date()})."
+        )
+
+
+def _constraint_intervals(
+    constraint: ElectionalConstraint,
+    sky: _Sky,
+    house_system: bytes,
+    start: float,
+    end: float,
+) -> list[Interval]:
+    step = SAMPLING_STEPS.get(constraint.type)
+    if constraint.type == "moon_not_void":
+        return _moon_not_void(start, end)
+    if constraint.type == "direct":
+        body = _body_id(constraint.body)
+        if body not in {BODY_REGISTRY[name] for name in STATION_BODIES}:
+            raise ValueError(f"Estações só são indexadas para: {', '.join(STATION_BODIES)}")
+        return _direct(sky, body, start, end)
+    if constraint.type == "asc_in_sign":
+        wanted = sign_index(constraint.sign or "")
+        changes = _asc_changes(sky, start, end)
+        if changes is None:
+            return _label_intervals(start, end, step, lambda jd: _asc_sign(sky, jd), wanted)
+        return _sign_intervals(start, end, _asc_sign(sky, start), changes, wanted)
+    body = _body_id(constraint.body)
+    if constraint.type == "body_in_sign":
+        wanted = sign_index(constraint.sign or "")
+        changes = _ingress_changes(body, start, end)
+
+        def sign_at(jd: float) -> int:
+            return int(sky.position(jd, body)[0] // 30)
+
+        if changes is None:
+            return _label_intervals(start, end, step, sign_at, wanted)
+        return _sign_intervals(start, end, sign_at(start), changes, wanted)
+    if constraint.type == "body_in_house":
+
+        def house_at(jd: float) -> int:
+            longitude, latitude, _ = sky.position(jd, body)
+            try:
+                return int(
+                    swe.house_pos(
+                        sky.armc(jd), sky.latitude, sky.obliquity, (longitude, latitude), house_system
+                    )
+                )
+            except swe.Error as exc:
+                raise ValueError(f"Sistema de casas indisponível nesta latitude: {exc}") from exc
+
+        return _label_intervals(start, end, step, house_at, constraint.house)
+
+    others = [BODY_REGISTRY[name] for name in INGRESS_BODIES if BODY_REGISTRY[name] != body]
+
+    def has_hard_aspect(jd: float) -> bool:
+        target = sky.position(jd, body)[0]
+        return any(
+            abs((target - sky.position(jd, other)[0] - angle + 180) % 360 - 180) <= constraint.orb
+            for other in others
+            for angle in HARD_ASPECTS
+        )
+
+    return _label_intervals(start, end, step, has_hard_aspect, False)
+
+
+def _local_isoformat(jd: float, tzinfo: tzinfo | None) -> str:
+    return _jd_to_datetime(jd).astimezone(tzinfo).replace(microsecond=0).isoformat()
+
+
+def search_elections(payload: ElectionalRequest) -> ElectionalResponse:
+    location = place_location(payload.place)
+    local_start = datetime.combine(payload.start_date, datetime.min.time())
+    local_end = datetime.combine(payload.end_date + timedelta(days=1), datetime.min.time())
+    start = _julian_day(local_to_utc(local_start, location.timezone))
+    end = _julian_day(local_to_utc(local_end, location.timezone))
+
+    sky = _Sky(location, start)
+    house_system = payload.house_system.encode("ascii")
+    windows = reduce(
+        intersect,
+        (
+            _constraint_intervals(constraint, sky, house_system, start, end)
+            for constraint in payload.constraints
+        ),
+    )
+    zone = gettz(location.timezone)
+    min_duration = payload.min_duration_minutes * _MINUTE
+    return ElectionalResponse(
+        place=location.place,
+        timezone=location.timezone,
+        latitude=round(location.latitude, 6),
+        longitude=round(location.longitude, 6),
+        windows=[
+            ElectionalWindow(
+                start=_format_utc_datetime(_jd_to_datetime(begin)),
+                end=_format_utc_datetime(_jd_to_datetime(finish)),
+                local_start=_local_isoformat(begin, zone),
+                local_end=_local_isoformat(finish, zone),
+                duration_minutes=round((finish - begin) * 1440, 1),
+            )
+            for begin, finish in windows
+            if finish - begin >= min_duration
+        ],
+    )
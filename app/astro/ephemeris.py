@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, time, timedelta
+import hashlib
+import math
 import os
-from typing import Callable, Iterable
+import random
+from typing import Callable, Hashable, Iterable, Iterator, TypeVar
 
+from dateutil.tz import gettz
 import swisseph as swe
 
 from app.api.models import (
@@ -14,37 +19,67 @@ from app.api.models import (
     ChartMetadata,
     ChartPoints,
     HouseCusp,
+    LotPosition,
     LunationRequest,
     LunationResponse,
     NatalChartRequest,
     NatalChartResponse,
     PlanetPosition,
     ProgressionRequest,
+    RelocationEntry,
+    RelocationRequest,
     SignPosition,
     SolarReturnRequest,
 )
-from app.astro.aspects import calculate_aspects
-from app.astro.geocode import geocode_place
+from app.astro.aspects import ASPECTS, AspectResult, find_aspects
+from app.astro.bodies import BODY_REGISTRY, DEFAULT_BODIES, ensure_asteroid_files, resolve_bodies
+from app.astro.dignities import chart_sect, dignity_labels, dignity_masks
+from app.astro.geocode import geocode_place, normalize_place
 from app.astro.houses import calculate_houses
+from app.astro.lots import compiled_lots, evaluate_lots
+from app.astro.precision import calc_flags, check_bodies, configure_ephemeris_path, moshier_supports
 from app.astro.interpretations import get_interpretation
 from app.astro.timezone import local_to_utc, resolve_timezone
 from app.core.config import settings
+from app.utils.lru import LRUCache
 from app.utils.signs import describe_sign, to_sign_position
 
-PLANETS = {
-    "Sun": swe.SUN,
-    "Moon": swe.MOON,
-    "Mercury": swe.MERCURY,
-    "Venus": swe.VENUS,
-    "Mars": swe.MARS,
-    "Jupiter": swe.JUPITER,
-    "Saturn": swe.SATURN,
-    "Uranus": swe.URANUS,
-    "Neptune": swe.NEPTUNE,
-    "Pluto": swe.PLUTO,
-    "True Node": swe.TRUE_NODE,
-    "Chiron": swe.CHIRON,
+# Conjunto padrão de corpos; cada pedido pode escolher outro via ``bodies``.
+PLANETS = {name: BODY_REGISTRY[name] for name in DEFAULT_BODIES}
+
+# Longitude média em J2000 (graus) e movimento médio diário, usados só pelo mock
+# sintético para gerar posições plausíveis sem efemérides.
+SYNTHETIC_ELEMENTS = {
+    "Sun": (280.460, 0.9856474),
+    "Moon": (218.316, 13.176396),
+    "Mercury": (252.251, 4.092339),
+    "Venus": (181.980, 1.602131),
+    "Mars": (355.433, 0.524039),
+    "Jupiter": (34.351, 0.083056),
+    "Saturn": (50.077, 0.033371),
+    "Uranus": (314.055, 0.011698),
+    "Neptune": (304.349, 0.005965),
+    "Pluto": (238.929, 0.003968),
+    "True Node": (125.045, -0.052954),
+    "Chiron": (251.630, 0.019520),
+}
+SYNTHETIC_SPEEDS = {
+    "Sun": (0.95, 1.02),
+    "Moon": (11.8, 15.2),
+    "Mercury": (-1.2, 2.2),
+    "Venus": (-0.6, 1.25),
+    "Mars": (-0.4, 0.8),
+    "Jupiter": (-0.13, 0.24),
+    "Saturn": (-0.08, 0.13),
+    "Uranus": (-0.04, 0.06),
+    "Neptune": (-0.03, 0.04),
+    "Pluto": (-0.03, 0.04),
+    "True Node": (-0.2, 0.05),
+    "Chiron": (-0.06, 0.1),
 }
+SYNTHETIC_ELONGATION = {"Mercury": 27.8, "Venus": 47.0}
+SYNTHETIC_OBLIQUITY = 23.4393
+_J2000 = datetime(2000, 1, 1, 12)
 
 SIDEREAL_MODES = {
     "FAGAN_BRADLEY": swe.SIDM_FAGAN_BRADLEY,
@@ -53,6 +88,9 @@ SIDEREAL_MODES = {
     "RAMAN": swe.SIDM_RAMAN,
 }
 
+# Incremente ao mudar qualquer resultado de mapa: invalida os ETags já emitidos.
+ENGINE_REVISION = 4
+
 
 @dataclass(frozen=True)
 class EphemerisResult:
@@ -61,14 +99,15 @@ class EphemerisResult:
     speed: float
 
 
-def _setup_ephemeris(zodiac: str, sidereal_mode: str | None) -> list[str]:
+def _setup_ephemeris(
+    zodiac: str, sidereal_mode: str | None, precision: str = "precise"
+) -> list[str]:
     flags: list[str] = []
-    ephemeris_path = os.getenv("ASTRO_EPHEMERIS_PATH") or settings.ephemeris_path
-    if ephemeris_path:
-        swe.set_ephe_path(ephemeris_path)
-        flags.append(f"EPHE_PATH={ephemeris_path}")
+    if precision == "fast":
+        flags.append("MOSHIER")
     else:
-        flags.append("DEFAULT_EPHE")
+        ephemeris_path = configure_ephemeris_path()
+        flags.append(f"EPHE_PATH={ephemeris_path}" if ephemeris_path else "DEFAULT_EPHE")
     if zodiac == "sidereal":
         mode_key = (sidereal_mode or "LAHIRI").upper()
         mode = SIDEREAL_MODES.get(mode_key)
@@ -83,11 +122,219 @@ def _setup_ephemeris(zodiac: str, sidereal_mode: str | None) -> list[str]:
     return flags
 
 
-def _calc_body(jd_ut: float, body: int) -> EphemerisResult:
-    data, _ = swe.calc_ut(jd_ut, body)
+def _calc_body(jd_ut: float, body: int, flags: int) -> EphemerisResult:
+    data, _ = swe.calc_ut(jd_ut, body, flags)
     return EphemerisResult(longitude=data[0], latitude=data[1], speed=data[3])
 
 
+# Posições dos corpos não dependem do local: para um mesmo instante (quantizado)
+# zodíaco e precisão, todos os pedidos compartilham o mesmo "retrato do céu".
+SkyKey = tuple[int | float, str, str | None, str]
+_SKY_CACHE: LRUCache[SkyKey, dict[int, EphemerisResult]] = LRUCache(settings.sky_cache_size)
+
+
+def _sky_positions(
+    jd_ut: float,
+    bodies: Iterable[int],
+    zodiac: str = "tropical",
+    sidereal_mode: str | None = None,
+    precision: str = "precise",
+) -> dict[int, EphemerisResult]:
+    quantum = settings.sky_cache_quantum_seconds / 86400
+    step = round(jd_ut / quantum) if quantum > 0 else jd_ut
+    key = (
+        step,
+        zodiac,
+        (sidereal_mode or "LAHIRI").upper() if zodiac == "sidereal" else None,
+        precision,
+    )
+    flags = calc_flags(precision)
+    snapshot = _SKY_CACHE.get(key)
+    if snapshot is None:
+        snapshot = {}
+        _SKY_CACHE.put(key, snapshot)
+    quantized_jd = step * quantum if quantum > 0 else jd_ut
+    positions: dict[int, EphemerisResult] = {}
+    for body in bodies:
+        result = snapshot.get(body)
+        if result is None:
+            result = snapshot[body] = _calc_body(quantized_jd, body, flags)
+        positions[body] = result
+    return positions
+
+
+def sky_cache_stats() -> dict[str, float]:
+    return _SKY_CACHE.stats()
+
+
+@dataclass(frozen=True)
+class ChartLocation:
+    latitude: float
+    longitude: float
+    place: str
+    timezone: str
+
+
+@dataclass(frozen=True)
+class ChartTime:
+    utc_dt: datetime
+    jd_ut: float
+
+
+@dataclass(frozen=True, slots=True)
+class ChartBodies:
+    """Corpos de um mapa em arrays paralelos, na ordem de ``names``."""
+
+    names: tuple[str, ...]
+    longitudes: array
+    latitudes: array
+    speeds: array
+
+
+@dataclass(frozen=True, slots=True)
+class ChartHouses:
+    cusps: array
+    asc: float
+    mc: float
+    vertex: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Chart:
+    """Mapa calculado na forma compacta em que o motor trabalha.
+
+    Sem um objeto por corpo ou cúspide: floats em ``array('d')``, e a casa e a
+    máscara de dignidades de cada corpo em ``bytes``; os lotes seguem a ordem
+    de ``compiled_lots().names``. Corpos e casas saem dos caches de estágio, então
+    mapas do mesmo instante ou local dividem os mesmos arrays. Os modelos da API
+    só são montados na resposta, por ``chart_response``.
+    """
+
+    location: ChartLocation
+    time: ChartTime
+    bodies: ChartBodies
+    houses: ChartHouses
+    placement: bytes
+    dignities: bytes
+    lots: array
+    aspects: tuple[AspectResult, ...]
+    summary: tuple[str, ...]
+    ephemeris_flags: tuple[str, ...]
+
+
+# O mapa natal é um pipeline de estágios, cada um memoizado exatamente pelas
+# próprias entradas: mudar só os orbs refaz apenas os aspectos; mudar só o
+# sistema de casas refaz casas e posicionamento.
+CHART_STAGES = ("location", "time", "bodies", "houses", "placement", "aspects", "summary")
+_STAGE_CACHES: dict[str, LRUCache] = {
+    stage: LRUCache(settings.chart_stage_cache_size) for stage in CHART_STAGES
+}
+
+T = TypeVar("T")
+
+
+def _memoize(stage: str, key: Hashable, factory: Callable[[], T]) -> T:
+    return _STAGE_CACHES[stage].get_or_compute(key, factory)
+
+
+def _compute_location(place: str) -> ChartLocation:
+    lat, lon, normalized_place = geocode_place(place)
+    return ChartLocation(
+        latitude=lat,
+        longitude=lon,
+        place=normalized_place,
+        timezone=resolve_timezone(lat, lon),
+    )
+
+
+def place_location(place: str) -> ChartLocation:
+    """Local geocodificado e fuso de ``place``; em modo mock, (0, 0) em UTC."""
+    if _mock_mode():
+        return ChartLocation(latitude=0.0, longitude=0.0, place=place, timezone="UTC")
+    return _memoize("location", normalize_place(place), lambda: _compute_location(place))
+
+
+def _compute_time(birth_date: date, birth_time: time, timezone_name: str) -> ChartTime:
+    utc_dt = local_to_utc(datetime.combine(birth_date, birth_time), timezone_name)
+    return ChartTime(utc_dt=utc_dt, jd_ut=_julian_day(utc_dt))
+
+
+def selected_bodies(names: Iterable[str] | None, precision: str = "precise") -> dict[str, int]:
+    if names is not None:
+        return resolve_bodies(names)
+    if precision == "fast":
+        # O conjunto padrão no Moshier fica sem Chiron, que só existe em arquivo.
+        return {name: body for name, body in PLANETS.items() if moshier_supports(body)}
+    return dict(PLANETS)
+
+
+def _compute_bodies(
+    jd_ut: float,
+    zodiac: str,
+    sidereal_mode: str | None,
+    selection: tuple[tuple[str, int], ...],
+    precision: str = "precise",
+) -> ChartBodies:
+    check_bodies((name for name, _ in selection), (body for _, body in selection), precision)
+    ensure_asteroid_files(body for _, body in selection)
+    try:
+        sky = _sky_positions(
+            jd_ut, (body for _, body in selection), zodiac, sidereal_mode, precision
+        )
+    except swe.Error as exc:
+        raise RuntimeError(f"Efemérides indisponíveis: {exc}") from exc
+    results = [sky[body] for _, body in selection]
+    return ChartBodies(
+        names=tuple(name for name, _ in selection),
+        longitudes=array("d", (result.longitude for result in results)),
+        latitudes=array("d", (result.latitude for result in results)),
+        speeds=array("d", (result.speed for result in results)),
+    )
+
+
+def _compute_houses(jd_ut: float, lat: float, lon: float, house_system: str) -> ChartHouses:
+    cusps, ascmc = calculate_houses(jd_ut, lat, lon, house_system)
+    return ChartHouses(
+        cusps=array("d", _normalize_cusps(cusps)), asc=ascmc[0], mc=ascmc[1], vertex=ascmc[3]
+    )
+
+
+def _birth_moment(
+    birth_date: date, birth_time: time, birth_place: str, location: ChartLocation | None = None
+) -> tuple[ChartLocation, ChartTime]:
+    if location is None:
+        location = _memoize(
+            "location",
+            normalize_place(birth_place),
+            lambda: _compute_location(birth_place),
+        )
+    chart_time = _memoize(
+        "time",
+        (birth_date, birth_time, location.timezone),
+        lambda: _compute_time(birth_date, birth_time, location.timezone),
+    )
+    return location, chart_time
+
+
+def chart_cache_stats() -> dict[str, object]:
+    return {
+        "sky_snapshot": _SKY_CACHE.stats(),
+        "stages": {stage: cache.stats() for stage, cache in _STAGE_CACHES.items()},
+    }
+
+
+def engine_version() -> str:
+    """O que, além do payload, muda um mapa: motor, efemérides e modo mock."""
+    ephemeris_path = os.getenv("ASTRO_EPHEMERIS_PATH") or settings.ephemeris_path or "moshier"
+    return f"{ENGINE_REVISION}/{swe.version}/{ephemeris_path}/{_mock_mode() or 'live'}"
+
+
+def clear_chart_caches() -> None:
+    _SKY_CACHE.clear()
+    for cache in _STAGE_CACHES.values():
+        cache.clear()
+
+
 def _angle_diff(value: float, target: float) -> float:
     return (value - target + 180) % 360 - 180
 
@@ -101,14 +348,14 @@ def _julian_day(value: datetime) -> float:
     )
 
 
-def _sun_longitude(value: datetime) -> float:
+def _sun_longitude(value: datetime, precision: str = "precise") -> float:
     jd_ut = _julian_day(value)
-    return _calc_body(jd_ut, swe.SUN).longitude
+    return _sky_positions(jd_ut, (swe.SUN,), precision=precision)[swe.SUN].longitude
 
 
-def _moon_longitude(value: datetime) -> float:
+def _moon_longitude(value: datetime, precision: str = "precise") -> float:
     jd_ut = _julian_day(value)
-    return _calc_body(jd_ut, swe.MOON).longitude
+    return _sky_positions(jd_ut, (swe.MOON,), precision=precision)[swe.MOON].longitude
 
 
 def _find_event_time(
@@ -216,7 +463,10 @@ def _mock_response(payload: NatalChartRequest) -> NatalChartResponse:
         )
     ]
     summary = _build_summary(
-        planets, sample_points.asc, sample_points.mc, payload.language
+        {planet.name: planet.sign for planet in planets},
+        sample_points.asc,
+        sample_points.mc,
+        payload.language,
     )
     return NatalChartResponse(
         metadata=metadata,
@@ -228,25 +478,323 @@ def _mock_response(payload: NatalChartRequest) -> NatalChartResponse:
     )
 
 
+def _synthetic_chart(payload: NatalChartRequest) -> Chart:
+    # Mapa completo e determinístico derivado de um hash do nascimento: as
+    # longitudes seguem os movimentos médios a partir da data (céu plausível) e
+    # o hash só adiciona variação, velocidades, a localização e os aspectos.
+    # Nome, precisão, orbs e idioma não mudam o céu e ficam fora do hash; o
+    # sistema de casas é aplicado de verdade sobre o ARMC sintético.
+    birth = payload.model_dump_json(include={"birth_date", "birth_time", "birth_place", "bodies"})
+    digest = hashlib.blake2b(birth.encode(), digest_size=8).digest()
+    rng = random.Random(int.from_bytes(digest, "big"))
+    place_digest = hashlib.blake2b(payload.birth_place.lower().encode(), digest_size=8).digest()
+    place_rng = random.Random(int.from_bytes(place_digest, "big"))
+    lat = place_rng.uniform(-55.0, 60.0)
+    lon = place_rng.uniform(-180.0, 180.0)
+
+    local_dt = datetime.combine(payload.birth_date, payload.birth_time)
+    days = (local_dt - _J2000).total_seconds() / 86400
+    sun_longitude = (SYNTHETIC_ELEMENTS["Sun"][0] + SYNTHETIC_ELEMENTS["Sun"][1] * days) % 360
+    armc = (sun_longitude + 180 + 15 * local_dt.hour + local_dt.minute / 4 + lon) % 360
+    house_cusps, ascmc = swe.houses_armc(
+        armc, lat, SYNTHETIC_OBLIQUITY, payload.house_system.encode()
+    )
+    cusps = array("d", _normalize_cusps(list(house_cusps)))
+    asc_longitude, mc_longitude, vertex = ascmc[0], ascmc[1], ascmc[3]
+
+    names = tuple(selected_bodies(payload.bodies))
+    longitudes, latitudes, speeds = array("d"), array("d"), array("d")
+    for name in names:
+        epoch, motion = SYNTHETIC_ELEMENTS.get(name, (rng.uniform(0, 360), 0.0))
+        if name in SYNTHETIC_ELONGATION:
+            elongation = SYNTHETIC_ELONGATION[name]
+            longitude = sun_longitude + rng.uniform(-elongation, elongation)
+        else:
+            longitude = epoch + motion * days + rng.uniform(-2.0, 2.0)
+        speed = rng.uniform(*SYNTHETIC_SPEEDS.get(name, (-0.1, 0.1)))
+        latitude = rng.uniform(-5.1, 5.1) if name == "Moon" else rng.uniform(-2.0, 2.0)
+        longitudes.append(longitude % 360)
+        latitudes.append(0.0 if name == "Sun" else latitude)
+        speeds.append(speed)
+
+    asc_position = to_sign_position(asc_longitude)
+    mc_position = to_sign_position(mc_longitude)
+    utc_dt = local_dt.replace(tzinfo=gettz("UTC"))
+    placement = bytes(_resolve_house(longitude, cusps) for longitude in longitudes)
+    sect = _chart_sect(names, placement)
+    return Chart(
+        location=ChartLocation(
+            latitude=lat, longitude=lon, place=payload.birth_place, timezone="UTC"
+        ),
+        time=ChartTime(utc_dt=utc_dt, jd_ut=_julian_day(utc_dt)),
+        bodies=ChartBodies(
+            names=names, longitudes=longitudes, latitudes=latitudes, speeds=speeds
+        ),
+        houses=ChartHouses(cusps=cusps, asc=asc_longitude, mc=mc_longitude, vertex=vertex),
+        placement=placement,
+        dignities=dignity_masks(names, longitudes, sect),
+        lots=evaluate_lots(compiled_lots(), names, longitudes, asc_longitude, mc_longitude, sect),
+        aspects=_synthetic_aspects(rng, names, speeds, payload.aspects.orbs.model_dump()),
+        summary=tuple(
+            _build_summary(
+                {name: to_sign_position(longitude).sign for name, longitude in zip(names, longitudes)},
+                asc_position,
+                mc_position,
+                payload.language,
+            )
+        ),
+        ephemeris_flags=("MOCK_MODE", "SYNTHETIC"),
+    )
+
+
+def _synthetic_aspects(
+    rng: random.Random, names: tuple[str, ...], speeds: array, orbs: dict[str, float]
+) -> tuple[AspectResult, ...]:
+    # Sorteados pelo hash em vez de medidos nas longitudes: ``find_aspects``
+    # custaria mais que o resto do mapa. Os orbs respeitam os limites pedidos.
+    pairs = [(i, j) for i in range(len(names)) for j in range(i + 1, len(names))]
+    kinds = [name for name in ASPECTS if orbs.get(name, -1) >= 0]
+    if not kinds:
+        return ()
+    chosen = sorted(rng.sample(pairs, min(len(pairs), rng.randint(len(names) // 2, len(names)))))
+    aspects = []
+    for i, j in chosen:
+        kind = rng.choice(kinds)
+        aspects.append(
+            AspectResult(
+                planet1=names[i],
+                planet2=names[j],
+                type=kind,
+                exact_angle=ASPECTS[kind],
+                orb=round(rng.uniform(0, orbs[kind]), 3),
+                applying=None if speeds[i] == speeds[j] else rng.random() < 0.5,
+            )
+        )
+    return tuple(aspects)
+
+
+def _mock_mode() -> str | None:
+    env_value = os.getenv("ASTRO_MOCK_MODE", "").lower()
+    if settings.mock_mode == "synthetic" or env_value == "synthetic":
+        return "synthetic"
+    if settings.mock_mode is True or env_value in {"1", "true", "yes"}:
+        return "static"
+    return None
+
+
+def compute_chart(payload: NatalChartRequest, location: ChartLocation | None = None) -> Chart:
+    """Mapa natal na forma compacta, para quem continua calculando sobre ele.
+
+    ``location`` já resolvido (ver ``place_location``) dispensa o geocoding.
+    """
+    mock_mode = _mock_mode()
+    if mock_mode == "synthetic":
+        return _synthetic_chart(payload)
+    if mock_mode:
+        return _chart_from_response(_mock_response(payload))
+
+    location, chart_time = _birth_moment(
+        payload.birth_date, payload.birth_time, payload.birth_place, location
+    )
+    return _compute_chart(payload, location, chart_time)
+
+
 def calculate_natal_chart(payload: NatalChartRequest) -> NatalChartResponse:
-    if settings.mock_mode or os.getenv("ASTRO_MOCK_MODE", "").lower() in {"1", "true", "yes"}:
+    if _mock_mode() == "static":
         return _mock_response(payload)
+    return chart_response(compute_chart(payload), payload)
 
-    lat, lon, normalized_place = geocode_place(payload.birth_place)
-    timezone_name = resolve_timezone(lat, lon)
-    local_dt = datetime.combine(payload.birth_date, payload.birth_time)
-    utc_dt = local_to_utc(local_dt, timezone_name)
-    jd_ut = _julian_day(utc_dt)
 
-    ephemeris_flags = _setup_ephemeris(payload.zodiac, payload.sidereal_mode)
+def calculate_relocations(payload: RelocationRequest) -> Iterator[RelocationEntry]:
+    """Mapas relocados: mesmo instante de nascimento, casas refeitas por local.
+
+    O instante e o zodíaco são validados antes do primeiro resultado, para que
+    erros do pedido ainda virem 400. Corpos, aspectos e resumo saem dos caches de
+    estágio após o primeiro local; por local só rodam geocoding (uma vez por
+    endereço normalizado), timezone, casas e posicionamento.
+    """
+    if _mock_mode():
+        return _mock_relocations(payload)
+    _setup_ephemeris(payload.zodiac, payload.sidereal_mode, payload.precision)
+    _, chart_time = _birth_moment(payload.birth_date, payload.birth_time, payload.birth_place)
+    return _relocated_charts(payload, chart_time)
+
+
+def _relocated_charts(
+    payload: RelocationRequest, chart_time: ChartTime
+) -> Iterator[RelocationEntry]:
+    for place, location in _resolve_locations(payload.locations):
+        if isinstance(location, ValueError):
+            yield RelocationEntry(place=place, error=str(location))
+            continue
+        local_dt = chart_time.utc_dt.astimezone(gettz(location.timezone))
+        relocated = payload.model_copy(
+            update={
+                "birth_place": place,
+                "birth_date": local_dt.date(),
+                "birth_time": local_dt.time().replace(tzinfo=None),
+            }
+        )
+        chart = _compute_chart(relocated, location, chart_time)
+        yield RelocationEntry(place=place, chart=chart_response(chart, relocated))
+
 
-    cusps, ascmc = calculate_houses(jd_ut, lat, lon, payload.house_system)
-    normalized_cusps = _normalize_cusps(cusps)
-    asc_position = to_sign_position(ascmc[0])
-    mc_position = to_sign_position(ascmc[1])
+def _mock_relocations(payload: RelocationRequest) -> Iterator[RelocationEntry]:
+    for place in payload.locations:
+        relocated = payload.model_copy(update={"birth_place": place})
+        yield RelocationEntry(place=place, chart=calculate_natal_chart(relocated))
 
+
+def _resolve_locations(
+    places: Iterable[str],
+) -> Iterator[tuple[str, ChartLocation | ValueError]]:
+    # O Nominatim não tem endpoint em lote e exige 1 req/s: o lote deduplica os
+    # endereços normalizados e reaproveita o estágio "location" (geocode + timezone).
+    resolved: dict[str, ChartLocation | ValueError] = {}
+    for place in places:
+        key = normalize_place(place)
+        if key not in resolved:
+            try:
+                resolved[key] = _memoize("location", key, lambda: _compute_location(key))
+            except ValueError as exc:
+                resolved[key] = exc
+        yield place, resolved[key]
+
+
+def _chart_positions(
+    payload: NatalChartRequest, location: ChartLocation, chart_time: ChartTime
+) -> tuple[Hashable, ChartBodies, Hashable, ChartHouses]:
+    bodies_key = (
+        chart_time.jd_ut,
+        payload.zodiac,
+        payload.sidereal_mode,
+        tuple(selected_bodies(payload.bodies, payload.precision).items()),
+        payload.precision,
+    )
+    bodies = _memoize(
+        "bodies",
+        bodies_key,
+        lambda: _compute_bodies(
+            chart_time.jd_ut,
+            payload.zodiac,
+            payload.sidereal_mode,
+            bodies_key[3],
+            payload.precision,
+        ),
+    )
+    houses_key = (
+        chart_time.jd_ut,
+        location.latitude,
+        location.longitude,
+        payload.house_system,
+    )
+    houses = _memoize(
+        "houses",
+        houses_key,
+        lambda: _compute_houses(
+            chart_time.jd_ut, location.latitude, location.longitude, payload.house_system
+        ),
+    )
+    return bodies_key, bodies, houses_key, houses
+
+
+def _chart_from_response(chart: NatalChartResponse) -> Chart:
+    # Só para o mock estático, que nasce como resposta da API.
+    utc_dt = datetime.fromisoformat(chart.metadata.utc_datetime.replace("Z", "+00:00"))
+    cusps = array("d", (house.longitude for house in chart.houses))
+    names = tuple(planet.name for planet in chart.planets)
+    longitudes = array("d", (planet.longitude for planet in chart.planets))
+    placement = bytes(planet.house for planet in chart.planets)
+    sect = _chart_sect(names, placement)
+    return Chart(
+        location=ChartLocation(
+            latitude=chart.metadata.latitude,
+            longitude=chart.metadata.longitude,
+            place=chart.metadata.birth_place,
+            timezone=chart.metadata.timezone,
+        ),
+        time=ChartTime(utc_dt=utc_dt, jd_ut=_julian_day(utc_dt)),
+        bodies=ChartBodies(
+            names=names,
+            longitudes=longitudes,
+            latitudes=array("d", (planet.latitude for planet in chart.planets)),
+            speeds=array("d", (planet.speed for planet in chart.planets)),
+        ),
+        houses=ChartHouses(cusps=cusps, asc=cusps[0], mc=cusps[9]),
+        placement=placement,
+        dignities=dignity_masks(names, longitudes, sect),
+        lots=evaluate_lots(compiled_lots(), names, longitudes, cusps[0], cusps[9], sect),
+        aspects=tuple(AspectResult(**item.model_dump()) for item in chart.aspects),
+        summary=tuple(chart.summary),
+        ephemeris_flags=tuple(chart.metadata.ephemeris_flags),
+    )
+
+
+def _compute_chart(
+    payload: NatalChartRequest, location: ChartLocation, chart_time: ChartTime
+) -> Chart:
+    ephemeris_flags = _setup_ephemeris(payload.zodiac, payload.sidereal_mode, payload.precision)
+    bodies_key, bodies, houses_key, houses = _chart_positions(payload, location, chart_time)
+    placement = _memoize(
+        "placement",
+        (bodies_key, houses_key),
+        lambda: bytes(_resolve_house(longitude, houses.cusps) for longitude in bodies.longitudes),
+    )
+    sect = _chart_sect(bodies.names, placement)
+    orbs = payload.aspects.orbs.model_dump()
+    aspects = _memoize(
+        "aspects",
+        (bodies_key, tuple(sorted(orbs.items()))),
+        lambda: tuple(find_aspects(bodies.names, bodies.longitudes, bodies.speeds, orbs)),
+    )
+    asc_position = to_sign_position(houses.asc)
+    mc_position = to_sign_position(houses.mc)
+    summary = _memoize(
+        "summary",
+        (bodies_key, asc_position, mc_position, payload.language),
+        lambda: tuple(
+            _build_summary(
+                {
+                    name: to_sign_position(longitude).sign
+                    for name, longitude in zip(bodies.names, bodies.longitudes)
+                },
+                asc_position,
+                mc_position,
+                payload.language,
+            )
+        ),
+    )
+    return Chart(
+        location=location,
+        time=chart_time,
+        bodies=bodies,
+        houses=houses,
+        placement=placement,
+        dignities=dignity_masks(bodies.names, bodies.longitudes, sect),
+        lots=evaluate_lots(
+            compiled_lots(), bodies.names, bodies.longitudes, houses.asc, houses.mc, sect
+        ),
+        aspects=aspects,
+        summary=summary,
+        ephemeris_flags=tuple(ephemeris_flags),
+    )
+
+
+def _chart_sect(names: tuple[str, ...], placement: bytes) -> int:
+    # A seita (Sol acima ou abaixo do horizonte) escolhe o regente de
+    # triplicidade e inverte as fórmulas dos lotes à noite.
+    return chart_sect(placement[names.index("Sun")] if "Sun" in names else None)
+
+
+def _sign_position(longitude: float) -> SignPosition:
+    position = to_sign_position(longitude)
+    return SignPosition(sign=position.sign, degree=position.degree, minute=position.minute)
+
+
+def chart_response(chart: Chart, payload: NatalChartRequest) -> NatalChartResponse:
+    """Converte o mapa compacto no modelo da API; ``payload`` dá nome, data e opções."""
     houses = []
-    for idx, cusp in enumerate(normalized_cusps, start=1):
+    for idx, cusp in enumerate(chart.houses.cusps, start=1):
         sign_pos = to_sign_position(cusp)
         houses.append(
             HouseCusp(
@@ -258,91 +806,111 @@ def calculate_natal_chart(payload: NatalChartRequest) -> NatalChartResponse:
             )
         )
 
-    planets: list[PlanetPosition] = []
-    aspects_input: list[dict[str, float]] = []
-    for name, body in PLANETS.items():
-        result = _calc_body(jd_ut, body)
-        sign_pos = to_sign_position(result.longitude)
-        house_number = _resolve_house(result.longitude, normalized_cusps)
+    bodies = chart.bodies
+    planets = []
+    for name, longitude, latitude, speed, house_number, dignities in zip(
+        bodies.names,
+        bodies.longitudes,
+        bodies.latitudes,
+        bodies.speeds,
+        chart.placement,
+        chart.dignities,
+    ):
+        sign_pos = to_sign_position(longitude)
         planets.append(
             PlanetPosition(
                 name=name,
-                longitude=round(result.longitude, 6),
-                latitude=round(result.latitude, 6),
-                speed=round(result.speed, 6),
+                longitude=round(longitude, 6),
+                latitude=round(latitude, 6),
+                speed=round(speed, 6),
                 sign=sign_pos.sign,
                 degree=sign_pos.degree,
                 minute=sign_pos.minute,
                 house=house_number,
-                retrograde=result.speed < 0,
-                dignities=None,
+                retrograde=speed < 0,
+                dignities=dignity_labels(dignities),
             )
         )
-        aspects_input.append(
-            {"name": name, "longitude": result.longitude, "speed": result.speed}
-        )
-
-    aspects = [
-        AspectEntry(
-            planet1=item.planet1,
-            planet2=item.planet2,
-            type=item.type,
-            exact_angle=item.exact_angle,
-            orb=item.orb,
-            applying=item.applying,
-        )
-        for item in calculate_aspects(aspects_input, payload.aspects.orbs.model_dump())
-    ]
-
-    summary = _build_summary(planets, asc_position, mc_position, payload.language)
 
     metadata = ChartMetadata(
         full_name=payload.full_name,
-        birth_place=normalized_place,
+        birth_place=chart.location.place,
         birth_date=str(payload.birth_date),
         birth_time=_format_birth_time(payload.birth_time),
-        timezone=timezone_name,
-        utc_datetime=_format_utc_datetime(utc_dt),
-        latitude=round(lat, 6),
-        longitude=round(lon, 6),
+        timezone=chart.location.timezone,
+        utc_datetime=_format_utc_datetime(chart.time.utc_dt),
+        latitude=round(chart.location.latitude, 6),
+        longitude=round(chart.location.longitude, 6),
         zodiac=payload.zodiac,
         house_system=payload.house_system,
         sidereal_mode=payload.sidereal_mode,
-        ephemeris_flags=ephemeris_flags,
+        ephemeris_flags=list(chart.ephemeris_flags),
     )
 
-    points = ChartPoints(
-        asc=SignPosition(
-            sign=asc_position.sign,
-            degree=asc_position.degree,
-            minute=asc_position.minute,
-        ),
-        mc=SignPosition(
-            sign=mc_position.sign,
-            degree=mc_position.degree,
-            minute=mc_position.minute,
-        ),
-    )
+    lots = []
+    for name, longitude in zip(compiled_lots().names, chart.lots):
+        if not math.isnan(longitude):  # NaN: lote indisponível neste mapa
+            sign_pos = to_sign_position(longitude)
+            lots.append(
+                LotPosition(
+                    name=name,
+                    longitude=round(longitude, 6),
+                    sign=sign_pos.sign,
+                    degree=sign_pos.degree,
+                    minute=sign_pos.minute,
+                )
+            )
+    fortune = next((lot for lot in lots if lot.name == "Fortune"), None)
 
     return NatalChartResponse(
         metadata=metadata,
-        points=points,
+        points=ChartPoints(
+            asc=_sign_position(chart.houses.asc),
+            mc=_sign_position(chart.houses.mc),
+            vertex=None if chart.houses.vertex is None else _sign_position(chart.houses.vertex),
+            fortune=None
+            if fortune is None
+            else SignPosition(sign=fortune.sign, degree=fortune.degree, minute=fortune.minute),
+            lots=lots,
+        ),
         houses=houses,
         planets=planets,
-        aspects=aspects,
-        summary=summary,
+        aspects=[
+            AspectEntry(
+                planet1=item.planet1,
+                planet2=item.planet2,
+                type=item.type,
+                exact_angle=item.exact_angle,
+                orb=item.orb,
+                applying=item.applying,
+            )
+            for item in chart.aspects
+        ],
+        summary=list(chart.summary),
     )
 
 
-def calculate_solar_return(payload: SolarReturnRequest) -> NatalChartResponse:
-    natal_chart = calculate_natal_chart(payload)
+def calculate_solar_return(
+    payload: SolarReturnRequest, natal_chart: NatalChartResponse | None = None
+) -> NatalChartResponse:
+    if _mock_mode():
+        # Em modo mock não há efemérides nem geocoding para buscar o retorno.
+        return calculate_natal_chart(
+            NatalChartRequest(
+                **payload.model_dump(exclude={"target_year", "birth_date"}),
+                birth_date=_same_day_in_year(payload.birth_date, payload.target_year),
+            )
+        )
+    if natal_chart is None:
+        natal_chart = calculate_natal_chart(payload)
     natal_sun = next(
         (planet for planet in natal_chart.planets if planet.name == "Sun"), None
     )
     if natal_sun is None:
         raise RuntimeError("Não foi possível determinar o Sol natal.")
-    lat, lon, normalized_place = geocode_place(payload.birth_place)
-    timezone_name = resolve_timezone(lat, lon)
+    # O mapa natal já traz o local resolvido; não é preciso geocodificar de novo.
+    normalized_place = natal_chart.metadata.birth_place
+    timezone_name = natal_chart.metadata.timezone
     base_local = datetime(
         payload.target_year,
         payload.birth_date.month,
@@ -355,7 +923,12 @@ def calculate_solar_return(payload: SolarReturnRequest) -> NatalChartResponse:
     end_local = base_local + timedelta(days=3)
     start_utc = local_to_utc(start_local, timezone_name)
     end_utc = local_to_utc(end_local, timezone_name)
-    event_utc = _find_event_time(start_utc, end_utc, _sun_longitude, natal_sun.longitude)
+    event_utc = _find_event_time(
+        start_utc,
+        end_utc,
+        lambda value: _sun_longitude(value, payload.precision),
+        natal_sun.longitude,
+    )
     return calculate_natal_chart(
         NatalChartRequest(
             full_name=payload.full_name,
@@ -367,10 +940,18 @@ def calculate_solar_return(payload: SolarReturnRequest) -> NatalChartResponse:
             zodiac=payload.zodiac,
             sidereal_mode=payload.sidereal_mode,
             aspects=payload.aspects,
+            precision=payload.precision,
         )
     )
 
 
+def _same_day_in_year(value: date, year: int) -> date:
+    try:
+        return value.replace(year=year)
+    except ValueError:
+        return value.replace(year=year, day=28)
+
+
 def calculate_progression(payload: ProgressionRequest) -> NatalChartResponse:
     delta_days = (payload.target_date - payload.birth_date).days
     progressed_date = payload.birth_date + timedelta(days=delta_days / 365.2422)
@@ -385,6 +966,7 @@ def calculate_progression(payload: ProgressionRequest) -> NatalChartResponse:
             zodiac=payload.zodiac,
             sidereal_mode=payload.sidereal_mode,
             aspects=payload.aspects,
+            precision=payload.precision,
         )
     )
 
@@ -395,12 +977,14 @@ def calculate_lunation(payload: LunationRequest) -> LunationResponse:
     end = reference + timedelta(days=30)
     target = 0.0 if payload.phase == "new" else 180.0
 
+    precision = payload.precision
+
     def moon_phase(value: datetime) -> float:
-        return (_moon_longitude(value) - _sun_longitude(value)) % 360
+        return (_moon_longitude(value, precision) - _sun_longitude(value, precision)) % 360
 
     event_utc = _find_event_time(start, end, moon_phase, target)
-    moon_lon = _moon_longitude(event_utc)
-    sun_lon = _sun_longitude(event_utc)
+    moon_lon = _moon_longitude(event_utc, precision)
+    sun_lon = _sun_longitude(event_utc, precision)
     summary = (
         "Lua Nova"
         if payload.phase == "new" and payload.language == "pt-BR"
@@ -419,8 +1003,11 @@ def calculate_lunation(payload: LunationRequest) -> LunationResponse:
     )
 
 
-def build_ai_interpretation(payload: AIInterpretationRequest) -> AIInterpretationResponse:
-    chart = calculate_natal_chart(payload)
+def build_ai_interpretation(
+    payload: AIInterpretationRequest, chart: NatalChartResponse | None = None
+) -> AIInterpretationResponse:
+    if chart is None:
+        chart = calculate_natal_chart(payload)
     sun = next((p for p in chart.planets if p.name == "Sun"), None)
     moon = next((p for p in chart.planets if p.name == "Moon"), None)
     asc = chart.points.asc
@@ -533,8 +1120,9 @@ def build_ai_interpretation(payload: AIInterpretationRequest) -> AIInterpretatio
     )
 
 
-def build_rtf_report(payload: NatalChartRequest) -> str:
-    chart = calculate_natal_chart(payload)
+def build_rtf_report(payload: NatalChartRequest, chart: NatalChartResponse | None = None) -> str:
+    if chart is None:
+        chart = calculate_natal_chart(payload)
     lines = [
         r"{\rtf1\ansi\deff0",
         r"{\b AstroLumen Report}\par",
@@ -563,47 +1151,48 @@ def _resolve_house(longitude: float, cusps: list[float]) -> int:
 
 
 def _build_summary(
-    planets: Iterable[PlanetPosition],
+    signs: dict[str, str],
     asc: SignPosition,
     mc: SignPosition,
     language: str,
 ) -> list[str]:
-    sun = next((p for p in planets if p.name == "Sun"), None)
-    moon = next((p for p in planets if p.name == "Moon"), None)
-    venus = next((p for p in planets if p.name == "Venus"), None)
-    mars = next((p for p in planets if p.name == "Mars"), None)
+    # ``signs``: signo de cada corpo, pelo nome.
+    sun = signs.get("Sun")
+    moon = signs.get("Moon")
+    venus = signs.get("Venus")
+    mars = signs.get("Mars")
     summary = []
     if language == "pt-BR":
         if sun:
-            sun_label, sun_element, sun_modality = describe_sign(sun.sign, language)
+            sun_label, sun_element, sun_modality = describe_sign(sun, language)
             summary.append(f"Sol em {sun_label} ({sun_element}, {sun_modality})")
         if moon:
-            moon_label, moon_element, moon_modality = describe_sign(moon.sign, language)
+            moon_label, moon_element, moon_modality = describe_sign(moon, language)
             summary.append(f"Lua em {moon_label} ({moon_element}, {moon_modality})")
         asc_label, asc_element, asc_modality = describe_sign(asc.sign, language)
         summary.append(f"Ascendente em {asc_label} ({asc_element}, {asc_modality})")
         if venus:
-            venus_label, _, _ = describe_sign(venus.sign, language)
+            venus_label, _, _ = describe_sign(venus, language)
             summary.append(f"Vênus em {venus_label}")
         if mars:
-            mars_label, _, _ = describe_sign(mars.sign, language)
+            mars_label, _, _ = describe_sign(mars, language)
             summary.append(f"Marte em {mars_label}")
         mc_label, _, _ = describe_sign(mc.sign, language)
         summary.append(f"MC em {mc_label}")
     else:
         if sun:
-            sun_label, sun_element, sun_modality = describe_sign(sun.sign, language)
+            sun_label, sun_element, sun_modality = describe_sign(sun, language)
             summary.append(f"Sun in {sun_label} ({sun_element}, {sun_modality})")
         if moon:
-            moon_label, moon_element, moon_modality = describe_sign(moon.sign, language)
+            moon_label, moon_element, moon_modality = describe_sign(moon, language)
             summary.append(f"Moon in {moon_label} ({moon_element}, {moon_modality})")
         asc_label, asc_element, asc_modality = describe_sign(asc.sign, language)
         summary.append(f"Ascendant in {asc_label} ({asc_element}, {asc_modality})")
         if venus:
-            venus_label, _, _ = describe_sign(venus.sign, language)
+            venus_label, _, _ = describe_sign(venus, language)
             summary.append(f"Venus in {venus_label}")
         if mars:
-            mars_label, _, _ = describe_sign(mars.sign, language)
+            mars_label, _, _ = describe_sign(mars, language)
             summary.append(f"Mars in {mars_label}")
         mc_label, _, _ = describe_sign(mc.sign, language)
         summary.append(f"MC in {mc_label}")
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import csv
+from datetime import timedelta
+import io
+from itertools import chain
+import json
+from typing import Iterator
+
+import numpy as np
+import swisseph as swe
+
+from app.api.models import EphemerisTableRequest
+from app.astro.bodies import ensure_asteroid_files
+from app.astro.ephemeris import selected_bodies
+from app.astro.events import _julian_day, _sample
+from app.astro.precision import calc_flags, check_bodies
+from app.utils.signs import SIGNS, to_sign_positions
+
+# Dias por bloco: cada bloco vira texto e é enviado antes do próximo ser calculado.
+CHUNK_DAYS = 366
+_SIGN_NAMES = np.array(SIGNS)
+
+
+def table_columns(names: tuple[str, ...]) -> list[str]:
+    columns = ["date"]
+    for name in names:
+        columns.extend(
+            f"{name}_{field}" for field in ("longitude", "sign", "degree", "minute", "retrograde")
+        )
+    return columns
+
+
+def ephemeris_table(payload: EphemerisTableRequest) -> Iterator[str]:
+    """Tabela diária às 00:00 UT, em blocos de texto CSV ou NDJSON.
+
+    Corpos e precisão são validados, e o primeiro bloco calculado, antes do
+    retorno: erros do pedido ou de efemérides ainda viram 400/500. Depois disso
+    só um bloco de ``CHUNK_DAYS`` dias fica em memória por vez.
+    """
+    bodies = selected_bodies(payload.bodies, payload.precision)
+    check_bodies(bodies, bodies.values(), payload.precision)
+    ensure_asteroid_files(bodies.values())
+    flags = calc_flags(payload.precision)
+    chunks = _table_chunks(payload, tuple(bodies), tuple(bodies.values()), flags)
+    try:
+        first = next(chunks)
+    except swe.Error as exc:
+        raise RuntimeError(f"Efemérides indisponíveis: {exc}") from exc
+    return chain([first], chunks)
+
+
+def _table_chunks(
+    payload: EphemerisTableRequest,
+    names: tuple[str, ...],
+    bodies: tuple[int, ...],
+    flags: int,
+) -> Iterator[str]:
+    total_days = (payload.end_date - payload.start_date).days + 1
+    start_jd = _julian_day(payload.start_date)
+    columns = table_columns(names)
+    header = ",".join(columns) + "\n" if payload.format == "csv" else ""
+    for offset in range(0, total_days, CHUNK_DAYS):
+        days = np.arange(offset, min(offset + CHUNK_DAYS, total_days))
+        jds = start_jd + days
+        dates = [(payload.start_date + timedelta(days=int(day))).isoformat() for day in days]
+        samples = []
+        for body in bodies:
+            longitudes, speeds = _sample(body, jds, flags)
+            signs, degrees, minutes = to_sign_positions(longitudes)
+            samples.append(
+                (
+                    np.round(longitudes, 6).tolist(),
+                    _SIGN_NAMES[signs].tolist(),
+                    degrees.tolist(),
+                    minutes.tolist(),
+                    (speeds < 0).tolist(),
+                )
+            )
+        buffer = io.StringIO()
+        buffer.write(header)
+        header = ""
+        if payload.format == "csv":
+            writer = csv.writer(buffer, lineterminator="\n")
+            for row, date_label in enumerate(dates):
+                values = [date_label]
+                for sample in samples:
+                    values.extend(column[row] for column in sample)
+                writer.writerow(values)
+        else:
+            for row, date_label in enumerate(dates):
+                entry = {
+                    "date": date_label,
+                    "bodies": [
+                        {
+                            "name": name,
+                            "longitude": longitudes[row],
+                            "sign": signs[row],
+                            "degree": degrees[row],
+                            "minute": minutes[row],
+                            "retrograde": retrograde[row],
+                        }
+                        for name, (longitudes, signs, degrees, minutes, retrograde) in zip(
+                            names, samples
+                        )
+                    ],
+                }
+                buffer.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        yield buffer.getvalue()
@@ -0,0 +1,410 @@
+"""Índice pré-computado de ingressos, estações e Lua fora de curso.
+
+O índice cobre um intervalo fixo (1900–2100 por padrão) e fica em disco como
+arrays ``.npy`` ordenados por dia juliano, abertos com ``mmap``. Uma consulta por
+intervalo é uma bisseção (``searchsorted``) mais um slice.
+
+    python -m app.astro.events                    # gera em settings.event_index_path
+    python -m app.astro.events --start 1950 --end 2050 --output /tmp/events
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+import json
+from pathlib import Path
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable
+
+import numpy as np
+import swisseph as swe
+
+from app.api.models import (
+    EventEntry,
+    EventListResponse,
+    EventRangeRequest,
+    VoidOfCourseEntry,
+    VoidOfCourseResponse,
+)
+from app.astro.bodies import BODY_REGISTRY, _ephemeris_path, resolve_bodies
+from app.astro.ephemeris import _format_utc_datetime
+from app.astro.precision import calc_flags
+from app.core.config import settings
+from app.utils.signs import SIGNS
+
+INDEX_VERSION = 1
+EVENT_KINDS = ("ingress", "station_retrograde", "station_direct")
+INGRESS, STATION_RETROGRADE, STATION_DIRECT = range(len(EVENT_KINDS))
+INGRESS_BODIES = (
+    "Sun",
+    "Moon",
+    "Mercury",
+    "Venus",
+    "Mars",
+    "Jupiter",
+    "Saturn",
+    "Uranus",
+    "Neptune",
+    "Pluto",
+)
+STATION_BODIES = INGRESS_BODIES[2:]
+# Lua fora de curso: do último aspecto ptolomaico exato a Sol..Plutão até o ingresso.
+VOC_ASPECT_MULTIPLES = frozenset({0, 2, 3, 4, 6, 8, 9, 10})
+MOON_STEP_DAYS = 0.5
+_J2000 = 2451545.0
+_EPOCH_J2000 = datetime(2000, 1, 1, 12, tzinfo=timezone.utc)
+_ARRAYS = ("jd", "body", "kind", "sign", "voc_start", "voc_end", "voc_sign")
+
+
+@dataclass(frozen=True)
+class EventIndex:
+    start_jd: float
+    end_jd: float
+    jd: np.ndarray
+    body: np.ndarray
+    kind: np.ndarray
+    sign: np.ndarray
+    voc_start: np.ndarray
+    voc_end: np.ndarray
+    voc_sign: np.ndarray
+
+    def events(self, start_jd: float, end_jd: float) -> slice:
+        return slice(
+            int(np.searchsorted(self.jd, start_jd, side="left")),
+            int(np.searchsorted(self.jd, end_jd, side="right")),
+        )
+
+    def void_of_course(self, start_jd: float, end_jd: float) -> slice:
+        # Os períodos não se sobrepõem, então início e fim estão ambos ordenados.
+        return slice(
+            int(np.searchsorted(self.voc_end, start_jd, side="right")),
+            int(np.searchsorted(self.voc_start, end_jd, side="left")),
+        )
+
+
+def _julian_day(value: date) -> float:
+    return swe.julday(value.year, value.month, value.day, 0.0)
+
+
+def _jd_to_datetime(jd: float) -> datetime:
+    return _EPOCH_J2000 + timedelta(days=jd - _J2000)
+
+
+def _calc_flags() -> int:
+    # Sem arquivos configurados, Moshier direto evita a busca de arquivo a cada chamada.
+    return calc_flags("precise" if _ephemeris_path() else "fast")
+
+
+def _sample(body: int, jds: np.ndarray, flags: int) -> tuple[np.ndarray, np.ndarray]:
+    longitudes = np.empty(len(jds))
+    speeds = np.empty(len(jds))
+    for index, jd in enumerate(jds.tolist()):
+        data, _ = swe.calc_ut(jd, body, flags)
+        longitudes[index] = data[0]
+        speeds[index] = data[3]
+    return longitudes, speeds
+
+
+def _root(fn: Callable[[float], float], lo: float, hi: float, tolerance: float = 1e-5) -> float:
+    """Illinois (regula falsi modificada) num intervalo com troca de sinal."""
+    f_lo, f_hi = fn(lo), fn(hi)
+    if f_lo == 0:
+        return lo
+    side = 0
+    estimate = hi
+    for _ in range(50):
+        if f_hi == f_lo:
+            break
+        estimate = (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+        value = fn(estimate)
+        if value == 0 or hi - lo < tolerance:
+            break
+        if value * f_hi > 0:
+            hi, f_hi = estimate, value
+            if side == -1:
+                f_lo /= 2
+            side = -1
+        else:
+            lo, f_lo = estimate, value
+            if side == 1:
+                f_hi /= 2
+            side = 1
+        if abs(value) < 1e-9:
+            break
+    return estimate
+
+
+def _wrap(value: float) -> float:
+    return (value + 180.0) % 360.0 - 180.0
+
+
+def _ingresses(
+    body: int, jds: np.ndarray, longitudes: np.ndarray, flags: int
+) -> list[tuple[float, int, int, int]]:
+    unwrapped = np.unwrap(longitudes, period=360.0)
+    sectors = np.floor(unwrapped / 30.0)
+    events = []
+    for index in np.flatnonzero(np.diff(sectors) != 0).tolist():
+        boundary = 30.0 * max(sectors[index], sectors[index + 1])
+        jd = _root(
+            lambda t: _wrap(swe.calc_ut(t, body, flags)[0][0] - boundary),
+            float(jds[index]),
+            float(jds[index + 1]),
+        )
+        sign = int(sectors[index + 1]) % 12
+        events.append((jd, body, INGRESS, sign))
+    return events
+
+
+def _stations(
+    body: int, jds: np.ndarray, longitudes: np.ndarray, speeds: np.ndarray, flags: int
+) -> list[tuple[float, int, int, int]]:
+    events = []
+    for index in np.flatnonzero(np.diff(np.sign(speeds)) != 0).tolist():
+        jd = _root(
+            lambda t: swe.calc_ut(t, body, flags)[0][3],
+            float(jds[index]),
+            float(jds[index + 1]),
+        )
+        kind = STATION_RETROGRADE if speeds[index] > 0 else STATION_DIRECT
+        sign = int(swe.calc_ut(jd, body, flags)[0][0] // 30) % 12
+        events.append((jd, body, kind, sign))
+    return events
+
+
+def _moon_aspect_times(
+    moon_jds: np.ndarray,
+    moon_unwrapped: np.ndarray,
+    planets: dict[int, tuple[np.ndarray, np.ndarray]],
+    day_jds: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Instantes aproximados (interpolação linear) dos aspectos da Lua a cada planeta.
+
+    A Lua é sempre mais rápida, então a elongação desenrolada é crescente e cruza
+    no máximo um múltiplo de 30 graus por passo de meio dia.
+    """
+    times, bodies, angles = [], [], []
+    for body, (longitudes, _) in planets.items():
+        planet = np.interp(moon_jds, day_jds, np.unwrap(longitudes, period=360.0))
+        elongation = moon_unwrapped - planet
+        sectors = np.floor(elongation / 30.0)
+        steps = np.flatnonzero(np.diff(sectors) > 0)
+        multiples = sectors[steps + 1].astype(np.int64)
+        keep = np.isin(multiples % 12, list(VOC_ASPECT_MULTIPLES))
+        steps, multiples = steps[keep], multiples[keep]
+        fraction = (multiples * 30.0 - elongation[steps]) / (
+            elongation[steps + 1] - elongation[steps]
+        )
+        times.append(moon_jds[steps] + fraction * MOON_STEP_DAYS)
+        bodies.append(np.full(len(steps), body))
+        angles.append((multiples % 12) * 30.0)
+    order = np.argsort(np.concatenate(times), kind="stable")
+    return (
+        np.concatenate(times)[order],
+        np.concatenate(bodies)[order],
+        np.concatenate(angles)[order],
+    )
+
+
+def _refine_aspect(jd: float, body: int, angle: float, flags: int) -> float:
+    for _ in range(2):
+        moon = swe.calc_ut(jd, swe.MOON, flags)[0]
+        planet = swe.calc_ut(jd, body, flags)[0]
+        jd -= _wrap(moon[0] - planet[0] - angle) / (moon[3] - planet[3])
+    return jd
+
+
+def build_event_index(start_year: int = 1900, end_year: int = 2100) -> dict[str, np.ndarray]:
+    if end_year <= start_year:
+        raise ValueError("end_year deve ser maior que start_year")
+    flags = _calc_flags()
+    start_jd = swe.julday(start_year, 1, 1, 0.0)
+    end_jd = swe.julday(end_year, 1, 1, 0.0)
+    day_jds = np.arange(start_jd - 1, end_jd + 2, 1.0)
+    moon_jds = np.arange(start_jd - 1, end_jd + 1 + MOON_STEP_DAYS, MOON_STEP_DAYS)
+
+    events: list[tuple[float, int, int, int]] = []
+    planets: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+    for name in INGRESS_BODIES:
+        body = BODY_REGISTRY[name]
+        if body == swe.MOON:
+            continue
+        longitudes, speeds = planets[body] = _sample(body, day_jds, flags)
+        events.extend(_ingresses(body, day_jds, longitudes, flags))
+        if name in STATION_BODIES:
+            events.extend(_stations(body, day_jds, longitudes, speeds, flags))
+
+    moon_longitudes, _ = _sample(swe.MOON, moon_jds, flags)
+    moon_ingresses = _ingresses(swe.MOON, moon_jds, moon_longitudes, flags)
+    events.extend(moon_ingresses)
+
+    aspect_jds, aspect_bodies, aspect_angles = _moon_aspect_times(
+        moon_jds, np.unwrap(moon_longitudes, period=360.0), planets, day_jds
+    )
+    ingress_jds = np.array([event[0] for event in moon_ingresses])
+    last_aspect = np.searchsorted(aspect_jds, ingress_jds) - 1
+    voc_start, voc_end, voc_sign = [], [], []
+    for position in range(1, len(moon_ingresses)):
+        previous, ingress = ingress_jds[position - 1], ingress_jds[position]
+        index = last_aspect[position]
+        if index < 0 or aspect_jds[index] < previous:
+            begin = previous
+        else:
+            begin = _refine_aspect(
+                float(aspect_jds[index]),
+                int(aspect_bodies[index]),
+                float(aspect_angles[index]),
+                flags,
+            )
+            begin = min(max(begin, previous), ingress)
+        if begin < ingress:
+            voc_start.append(begin)
+            voc_end.append(ingress)
+            voc_sign.append(moon_ingresses[position - 1][3])
+
+    events = sorted(event for event in events if start_jd <= event[0] < end_jd)
+    voc = [
+        period
+        for period in zip(voc_start, voc_end, voc_sign)
+        if period[1] >= start_jd and period[0] < end_jd
+    ]
+    return {
+        "jd": np.array([event[0] for event in events], dtype=np.float64),
+        "body": np.array([event[1] for event in events], dtype=np.int16),
+        "kind": np.array([event[2] for event in events], dtype=np.int8),
+        "sign": np.array([event[3] for event in events], dtype=np.int8),
+        "voc_start": np.array([period[0] for period in voc], dtype=np.float64),
+        "voc_end": np.array([period[1] for period in voc], dtype=np.float64),
+        "voc_sign": np.array([period[2] for period in voc], dtype=np.int8),
+        "meta": {
+            "version": INDEX_VERSION,
+            "start_jd": start_jd,
+            "end_jd": end_jd,
+            "flags": flags,
+        },
+    }
+
+
+def write_event_index(arrays: dict[str, object], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".events-", dir=path.parent))
+    try:
+        for name in _ARRAYS:
+            np.save(staging / f"{name}.npy", arrays[name])
+        (staging / "meta.json").write_text(json.dumps(arrays["meta"]))
+        if path.exists():
+            shutil.rmtree(path)
+        staging.rename(path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    load_event_index.cache_clear()
+
+
+@lru_cache(maxsize=4)
+def load_event_index(path: str | None = None) -> EventIndex:
+    directory = Path(path or settings.event_index_path)
+    meta_path = directory / "meta.json"
+    if not meta_path.exists():
+        raise RuntimeError(
+            f"Índice de eventos não encontrado em {directory}; gere com python -m app.astro.events."
+        )
+    meta = json.loads(meta_path.read_text())
+    if meta.get("version") != INDEX_VERSION:
+        raise RuntimeError("Índice de eventos desatualizado; gere novamente com python -m app.astro.events.")
+    arrays = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in _ARRAYS}
+    return EventIndex(start_jd=meta["start_jd"], end_jd=meta["end_jd"], **arrays)
+
+
+def _query_range(index: EventIndex, payload: EventRangeRequest) -> tuple[float, float]:
+    start_jd = _julian_day(payload.start_date)
+    end_jd = _julian_day(payload.end_date + timedelta(days=1))
+    if start_jd < index.start_jd or end_jd > index.end_jd:
+        raise ValueError(
+            "Intervalo fora da cobertura do índice "
+            f"({_jd_to_datetime(index.start_jd).date()} a "
+            f"{_jd_to_datetime(index.end_jd - 1).date()})."
+        )
+    return start_jd, end_jd
+
+
+def _event_entries(payload: EventRangeRequest, kinds: tuple[int, ...]) -> EventListResponse:
+    index = load_event_index()
+    window = index.events(*_query_range(index, payload))
+    body = np.asarray(index.body[window])
+    kind = np.asarray(index.kind[window])
+    mask = np.isin(kind, kinds)
+    if payload.bodies is not None:
+        mask &= np.isin(body, list(resolve_bodies(payload.bodies).values()))
+    names = {body_id: name for name, body_id in BODY_REGISTRY.items()}
+    return EventListResponse(
+        events=[
+            EventEntry(
+                utc_datetime=_format_utc_datetime(_jd_to_datetime(jd)),
+                body=names[body_id],
+                type=EVENT_KINDS[kind_id],
+                sign=SIGNS[sign],
+            )
+            for jd, body_id, kind_id, sign in zip(
+                np.asarray(index.jd[window])[mask].tolist(),
+                body[mask].tolist(),
+                kind[mask].tolist(),
+                np.asarray(index.sign[window])[mask].tolist(),
+            )
+        ]
+    )
+
+
+def list_ingresses(payload: EventRangeRequest) -> EventListResponse:
+    return _event_entries(payload, (INGRESS,))
+
+
+def list_stations(payload: EventRangeRequest) -> EventListResponse:
+    return _event_entries(payload, (STATION_RETROGRADE, STATION_DIRECT))
+
+
+def list_void_of_course(payload: EventRangeRequest) -> VoidOfCourseResponse:
+    index = load_event_index()
+    window = index.void_of_course(*_query_range(index, payload))
+    return VoidOfCourseResponse(
+        periods=[
+            VoidOfCourseEntry(
+                start=_format_utc_datetime(_jd_to_datetime(start)),
+                end=_format_utc_datetime(_jd_to_datetime(end)),
+                sign=SIGNS[sign],
+                next_sign=SIGNS[(sign + 1) % 12],
+            )
+            for start, end, sign in zip(
+                np.asarray(index.voc_start[window]).tolist(),
+                np.asarray(index.voc_end[window]).tolist(),
+                np.asarray(index.voc_sign[window]).tolist(),
+            )
+        ]
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", type=int, default=1900, help="Ano inicial (inclusive).")
+    parser.add_argument("--end", type=int, default=2100, help="Ano final (exclusive).")
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    output = args.output or Path(settings.event_index_path)
+    started = time.perf_counter()
+    arrays = build_event_index(args.start, args.end)
+    write_event_index(arrays, output)
+    print(
+        f"{len(arrays['jd'])} eventos e {len(arrays['voc_start'])} períodos fora de curso "
+        f"gravados em {output} ({time.perf_counter() - started:.1f}s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
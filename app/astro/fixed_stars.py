@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import swisseph as swe
+
+from app.api.models import (
+    FixedStarConjunction,
+    FixedStarParan,
+    FixedStarPosition,
+    FixedStarRequest,
+    FixedStarResponse,
+)
+from app.astro.astrocartography import ANGLES, equatorial_coordinates, semi_diurnal_arc
+from app.astro.ephemeris import compute_chart
+from app.utils.signs import to_sign_position
+
+CATALOGUE_PATH = Path(__file__).with_name("data") / "fixed_stars.csv"
+_J2000 = 2451545.0
+
+
+@dataclass(frozen=True)
+class StarCatalogue:
+    names: tuple[str, ...]
+    vectors: np.ndarray
+    magnitudes: np.ndarray
+
+
+def _parse_sexagesimal(value: str) -> float:
+    sign = -1.0 if value.startswith("-") else 1.0
+    degrees, minutes, seconds = (float(part) for part in value.lstrip("+-").split(":"))
+    return sign * (degrees + minutes / 60 + seconds / 3600)
+
+
+@lru_cache(maxsize=1)
+def load_star_catalogue(path: Path = CATALOGUE_PATH) -> StarCatalogue:
+    """Carrega o catálogo uma vez como vetores unitários equatoriais J2000.
+
+    Substitui ``swe.fixstar``, que relê o ``sefstars.txt`` a cada chamada. As
+    posições não incluem movimento próprio (erro abaixo de 0,15 grau em ±200 anos
+    para as estrelas do catálogo).
+    """
+    with path.open(encoding="utf-8") as handle:
+        rows = list(csv.DictReader(line for line in handle if not line.startswith("#")))
+    if not rows:
+        raise RuntimeError(f"Catálogo de estrelas vazio: {path}")
+    ra = np.radians([_parse_sexagesimal(row["ra"]) * 15 for row in rows])
+    dec = np.radians([_parse_sexagesimal(row["dec"]) for row in rows])
+    vectors = np.column_stack((np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), np.sin(dec)))
+    return StarCatalogue(
+        names=tuple(row["name"] for row in rows),
+        vectors=vectors,
+        magnitudes=np.array([float(row["magnitude"]) for row in rows]),
+    )
+
+
+def precession_matrix(jd_ut: float) -> np.ndarray:
+    """Matriz de precessão IAU 1976 de J2000 para o equador médio da data."""
+    t = (jd_ut - _J2000) / 36525
+    zeta, z, theta = np.radians(
+        np.array(
+            [
+                2306.2181 * t + 0.30188 * t**2 + 0.017998 * t**3,
+                2306.2181 * t + 1.09468 * t**2 + 0.018203 * t**3,
+                2004.3109 * t - 0.42665 * t**2 - 0.041833 * t**3,
+            ]
+        )
+        / 3600
+    )
+    cz, sz = np.cos(zeta), np.sin(zeta)
+    cZ, sZ = np.cos(z), np.sin(z)
+    ct, st = np.cos(theta), np.sin(theta)
+    return np.array(
+        [
+            [cz * ct * cZ - sz * sZ, -sz * ct * cZ - cz * sZ, -st * cZ],
+            [cz * ct * sZ + sz * cZ, -sz * ct * sZ + cz * cZ, -st * sZ],
+            [cz * st, -sz * st, ct],
+        ]
+    )
+
+
+def star_positions(
+    catalogue: StarCatalogue, jd_ut: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Longitude/latitude eclípticas e ascensão reta/declinação da data, em graus."""
+    nutation, _ = swe.calc_ut(jd_ut, swe.ECL_NUT)
+    mean_obliquity, nutation_longitude = np.radians(nutation[1]), nutation[2]
+    x, y, z = (catalogue.vectors @ precession_matrix(jd_ut).T).T
+    right_ascension = np.degrees(np.arctan2(y, x)) % 360.0
+    declination = np.degrees(np.arcsin(np.clip(z, -1.0, 1.0)))
+    ecl_y = y * np.cos(mean_obliquity) + z * np.sin(mean_obliquity)
+    ecl_z = z * np.cos(mean_obliquity) - y * np.sin(mean_obliquity)
+    longitude = (np.degrees(np.arctan2(ecl_y, x)) + nutation_longitude) % 360.0
+    latitude = np.degrees(np.arcsin(np.clip(ecl_z, -1.0, 1.0)))
+    return longitude, latitude, right_ascension, declination
+
+
+def angle_sidereal_times(
+    right_ascension: np.ndarray, declination: np.ndarray, latitude: float
+) -> np.ndarray:
+    """Tempo sidéreo local (graus) em que cada ponto cruza ASC, DSC, MC e IC."""
+    semi_arc = semi_diurnal_arc(declination, latitude)
+    return np.stack(
+        (
+            right_ascension - semi_arc,
+            right_ascension + semi_arc,
+            right_ascension,
+            right_ascension + 180.0,
+        ),
+        axis=-1,
+    ) % 360.0
+
+
+def _signed_separation(values: np.ndarray) -> np.ndarray:
+    return (values + 180.0) % 360.0 - 180.0
+
+
+def calculate_fixed_stars(payload: FixedStarRequest) -> FixedStarResponse:
+    catalogue = load_star_catalogue()
+    chart = compute_chart(payload)
+    selected = np.flatnonzero(catalogue.magnitudes <= payload.max_magnitude)
+    names = [catalogue.names[index] for index in selected]
+    star_lon, star_lat, star_ra, star_dec = (
+        values[selected] for values in star_positions(catalogue, chart.time.jd_ut)
+    )
+
+    bodies = chart.bodies
+    point_names = [*bodies.names, "ASC", "MC"]
+    point_lon = np.append(np.frombuffer(bodies.longitudes), (chart.houses.asc, chart.houses.mc))
+    conjunction_orbs = np.abs(_signed_separation(star_lon[:, None] - point_lon[None, :]))
+    star_rows, point_cols = np.nonzero(conjunction_orbs <= payload.orb)
+
+    nutation, _ = swe.calc_ut(chart.time.jd_ut, swe.ECL_NUT)
+    body_ra, body_dec = equatorial_coordinates(
+        np.frombuffer(bodies.longitudes),
+        np.frombuffer(bodies.latitudes),
+        nutation[0],
+    )
+    latitude = chart.location.latitude
+    star_times = angle_sidereal_times(star_ra, star_dec, latitude)
+    body_times = angle_sidereal_times(body_ra, body_dec, latitude)
+    paran_orbs = np.abs(
+        _signed_separation(star_times[:, :, None, None] - body_times[None, None, :, :])
+    )
+    with np.errstate(invalid="ignore"):
+        parans = np.argwhere(paran_orbs <= payload.paran_orb)
+
+    stars = []
+    for name, longitude, star_latitude, magnitude in zip(
+        names, star_lon.tolist(), star_lat.tolist(), catalogue.magnitudes[selected].tolist()
+    ):
+        sign_pos = to_sign_position(longitude)
+        stars.append(
+            FixedStarPosition(
+                name=name,
+                longitude=round(longitude, 6),
+                latitude=round(star_latitude, 6),
+                magnitude=magnitude,
+                sign=sign_pos.sign,
+                degree=sign_pos.degree,
+                minute=sign_pos.minute,
+            )
+        )
+    return FixedStarResponse(
+        stars=stars,
+        conjunctions=sorted(
+            (
+                FixedStarConjunction(
+                    star=names[row],
+                    point=point_names[col],
+                    orb=round(float(conjunction_orbs[row, col]), 3),
+                )
+                for row, col in zip(star_rows.tolist(), point_cols.tolist())
+            ),
+            key=lambda item: item.orb,
+        ),
+        parans=sorted(
+            (
+                FixedStarParan(
+                    star=names[star],
+                    star_angle=ANGLES[star_angle],
+                    body=bodies.names[body],
+                    body_angle=ANGLES[body_angle],
+                    orb=round(float(paran_orbs[star, star_angle, body, body_angle]), 3),
+                )
+                for star, star_angle, body, body_angle in parans.tolist()
+            ),
+            key=lambda item: item.orb,
+        ),
+    )
@@ -4,5 +4,5 @@ import swisseph as swe
 
 
 def calculate_houses(jd_ut: float, lat: float, lon: float, house_system: str) -> tuple[list[float], list[float]]:
-    cusps, ascmc = swe.houses(jd_ut, lat, lon, house_system)
+    cusps, ascmc = swe.houses(jd_ut, lat, lon, house_system.encode("ascii"))
     return list(cusps), list(ascmc)
@@ -103,7 +103,10 @@ def _seed_interpretations(connection: sqlite3.Connection) -> None:
         f"INSERT OR IGNORE INTO interpretations ({', '.join(columns)}) "
         f"VALUES ({placeholders})"
     )
-    connection.executemany(statement, samples)
+    connection.executemany(
+        statement,
+        [{column: sample.get(column) for column in columns} for sample in samples],
+    )
 
 
 def get_interpretation(
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+import json
+from pathlib import Path
+import re
+from typing import Iterable
+
+import numpy as np
+
+from app.astro.bodies import resolve_bodies
+from app.astro.dignities import NIGHT, UNKNOWN_SECT
+from app.core.config import settings
+
+DATA_PATH = Path(__file__).with_name("data") / "lots.json"
+ANGLE_OPERANDS = ("ASC", "MC")
+_TERM_SEPARATOR = re.compile(r"\s+([+-])\s+")
+
+
+@dataclass(frozen=True)
+class CompiledLots:
+    """Fórmulas de lotes como matrizes de coeficientes sobre ``operands``.
+
+    Cada linha é um lote já expandido (um lote que cita outro recebe a linha
+    dele), uma matriz para mapas diurnos e outra para noturnos. Avaliar todos os
+    lotes de um mapa é um produto matriz-vetor.
+    """
+
+    names: tuple[str, ...]
+    operands: tuple[str, ...]
+    day: np.ndarray
+    night: np.ndarray
+    reversible: np.ndarray
+
+
+def _parse_formula(name: str, formula: str) -> list[tuple[int, str]]:
+    parts = _TERM_SEPARATOR.split(formula.strip())
+    if len(parts) < 3 or len(parts) % 2 == 0:
+        raise RuntimeError(f"Fórmula inválida no lote {name}: {formula!r}")
+    terms = [(1, parts[0])]
+    terms.extend((1 if sign == "+" else -1, operand) for sign, operand in zip(parts[1::2], parts[2::2]))
+    return terms
+
+
+def compile_lots(definitions: Iterable[dict]) -> CompiledLots:
+    definitions = list(definitions)
+    names: list[str] = []
+    operands = list(ANGLE_OPERANDS)
+    parsed: list[tuple[list[tuple[int, str]], bool]] = []
+    for definition in definitions:
+        name = definition["name"]
+        if name in names or name in ANGLE_OPERANDS:
+            raise RuntimeError(f"Lote duplicado: {name}")
+        terms = []
+        for sign, operand in _parse_formula(name, definition["formula"]):
+            if operand not in ANGLE_OPERANDS and operand not in names:
+                try:
+                    (operand,) = resolve_bodies([operand])
+                except ValueError as exc:
+                    raise RuntimeError(f"Operando desconhecido no lote {name}: {operand}") from exc
+                if operand not in operands:
+                    operands.append(operand)
+            terms.append((sign, operand))
+        names.append(name)
+        parsed.append((terms, bool(definition.get("reverse_at_night", False))))
+
+    index = {operand: column for column, operand in enumerate(operands)}
+    day = np.zeros((len(names), len(operands)))
+    night = np.zeros((len(names), len(operands)))
+    lot_rows = {name: row for row, name in enumerate(names)}
+    for row, (terms, reverse) in enumerate(parsed):
+        for position, (sign, operand) in enumerate(terms):
+            # À noite, A + B - C vira A + C - B: troca o sinal de todos menos o primeiro.
+            night_sign = -sign if reverse and position > 0 else sign
+            if operand in lot_rows:
+                day[row] += sign * day[lot_rows[operand]]
+                night[row] += night_sign * night[lot_rows[operand]]
+            else:
+                day[row, index[operand]] += sign
+                night[row, index[operand]] += night_sign
+    return CompiledLots(
+        names=tuple(names),
+        operands=tuple(operands),
+        day=day,
+        night=night,
+        reversible=np.any(day != night, axis=1),
+    )
+
+
+def _read_definitions(path: Path | str) -> list[dict]:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+@lru_cache(maxsize=1)
+def compiled_lots() -> CompiledLots:
+    """Lotes padrão mais os de ``ASTRO_LOTS_PATH``, compilados uma vez."""
+    definitions = _read_definitions(DATA_PATH)
+    if settings.lots_path:
+        definitions.extend(_read_definitions(settings.lots_path))
+    return compile_lots(definitions)
+
+
+def evaluate_lots(
+    lots: CompiledLots,
+    names: Iterable[str],
+    longitudes: Iterable[float],
+    asc: float,
+    mc: float,
+    sect: int,
+) -> array:
+    """Longitude de cada lote, na ordem de ``lots.names``; NaN se indisponível.
+
+    Um lote fica indisponível quando cita um corpo fora do mapa, ou quando
+    inverte à noite e a seita é desconhecida (mapa sem o Sol).
+    """
+    values = np.zeros(len(lots.operands))
+    present = np.zeros(len(lots.operands), dtype=bool)
+    values[:2] = asc, mc
+    present[:2] = True
+    column = {operand: index for index, operand in enumerate(lots.operands)}
+    for name, longitude in zip(names, longitudes):
+        if name in column:
+            values[column[name]] = longitude
+            present[column[name]] = True
+    matrix = lots.night if sect == NIGHT else lots.day
+    result = np.mod(matrix @ values, 360)
+    result[np.any(matrix[:, ~present] != 0, axis=1)] = np.nan
+    if sect == UNKNOWN_SECT:
+        result[lots.reversible] = np.nan
+    return array("d", result.tolist())
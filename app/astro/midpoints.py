@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.api.models import (
+    AspectEntry,
+    HarmonicPosition,
+    HarmonicRequest,
+    HarmonicResponse,
+    MidpointContact,
+    MidpointEntry,
+    MidpointRequest,
+    MidpointResponse,
+    NatalChartRequest,
+)
+from app.astro.aspects import find_aspects
+from app.astro.ephemeris import compute_chart
+from app.utils.signs import to_sign_position
+
+
+def midpoint_tree(longitudes: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pontos médios (pelo arco menor) de todos os pares ``i < j``."""
+    first, second = np.triu_indices(len(longitudes), k=1)
+    arc = (longitudes[second] - longitudes[first]) % 360.0
+    arc = np.where(arc > 180.0, arc - 360.0, arc)
+    return first, second, (longitudes[first] + arc / 2.0) % 360.0
+
+
+def midpoint_contacts(
+    longitudes: np.ndarray,
+    first: np.ndarray,
+    second: np.ndarray,
+    midpoints: np.ndarray,
+    orb: float,
+    dial: float,
+) -> list[tuple[int, int, float]]:
+    """Contatos ponto/ponto médio no disco ``dial`` (360, 180, 90 ou 45 graus).
+
+    Os pontos médios reduzidos ao disco são ordenados uma vez; cada ponto busca a
+    janela ``[p - orb, p + orb]`` por bisseção (``searchsorted``), com cópias
+    deslocadas de ``dial`` para cobrir a volta do disco. O custo é
+    O(n² log n + contatos) em vez de O(n³).
+    """
+    reduced = midpoints % dial
+    order = np.argsort(reduced, kind="stable")
+    ordered = reduced[order]
+    extended = np.concatenate((ordered - dial, ordered, ordered + dial))
+    targets = longitudes % dial
+    starts = np.searchsorted(extended, targets - orb, side="left")
+    stops = np.searchsorted(extended, targets + orb, side="right")
+
+    contacts = []
+    for point, (start, stop) in enumerate(zip(starts.tolist(), stops.tolist())):
+        for position in range(start, stop):
+            index = int(order[position % len(order)])
+            if first[index] == point or second[index] == point:
+                continue
+            contacts.append((point, index, abs(float(extended[position] - targets[point]))))
+    return contacts
+
+
+def harmonic_longitudes(longitudes: np.ndarray, harmonic: int) -> np.ndarray:
+    return (longitudes * harmonic) % 360.0
+
+
+def _chart_points(payload: NatalChartRequest) -> tuple[list[str], np.ndarray, np.ndarray]:
+    chart = compute_chart(payload)
+    bodies, houses = chart.bodies, chart.houses
+    names = [*bodies.names, "ASC", "MC"]
+    longitudes = np.append(np.frombuffer(bodies.longitudes), (houses.asc, houses.mc))
+    speeds = np.append(np.frombuffer(bodies.speeds), (0.0, 0.0))
+    return names, longitudes, speeds
+
+
+def calculate_midpoints(payload: MidpointRequest) -> MidpointResponse:
+    names, longitudes, _ = _chart_points(payload)
+    first, second, midpoints = midpoint_tree(longitudes)
+    contacts = midpoint_contacts(longitudes, first, second, midpoints, payload.orb, payload.dial)
+
+    entries = []
+    for index, longitude in enumerate(midpoints.tolist()):
+        sign_pos = to_sign_position(longitude)
+        entries.append(
+            MidpointEntry(
+                point1=names[first[index]],
+                point2=names[second[index]],
+                longitude=round(longitude, 6),
+                sign=sign_pos.sign,
+                degree=sign_pos.degree,
+                minute=sign_pos.minute,
+            )
+        )
+    return MidpointResponse(
+        dial=payload.dial,
+        orb=payload.orb,
+        midpoints=entries,
+        contacts=[
+            MidpointContact(
+                point=names[point],
+                midpoint=f"{entries[index].point1}/{entries[index].point2}",
+                angle=_contact_angle(longitudes[point], midpoints[index], payload.dial),
+                orb=round(orb, 3),
+            )
+            for point, index, orb in sorted(contacts, key=lambda item: item[2])
+        ],
+    )
+
+
+def _contact_angle(point: float, midpoint: float, dial: float) -> float:
+    separation = (point - midpoint) % 360.0
+    angle = round(separation / dial) * dial % 360.0
+    return min(angle, 360.0 - angle)
+
+
+def calculate_harmonic(payload: HarmonicRequest) -> HarmonicResponse:
+    names, longitudes, speeds = _chart_points(payload)
+    harmonic = harmonic_longitudes(longitudes, payload.harmonic)
+    positions = []
+    for name, longitude in zip(names, harmonic.tolist()):
+        sign_pos = to_sign_position(longitude)
+        positions.append(
+            HarmonicPosition(
+                name=name,
+                longitude=round(longitude, 6),
+                sign=sign_pos.sign,
+                degree=sign_pos.degree,
+                minute=sign_pos.minute,
+            )
+        )
+    aspects = find_aspects(
+        names,
+        harmonic.tolist(),
+        (speeds * payload.harmonic).tolist(),
+        payload.aspects.orbs.model_dump(),
+    )
+    return HarmonicResponse(
+        harmonic=payload.harmonic,
+        positions=positions,
+        aspects=[
+            AspectEntry(
+                planet1=item.planet1,
+                planet2=item.planet2,
+                type=item.type,
+                exact_angle=item.exact_angle,
+                orb=item.orb,
+                applying=item.applying,
+            )
+            for item in aspects
+        ],
+    )
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, tzinfo
+import math
+
+import numpy as np
+import swisseph as swe
+from dateutil.tz import gettz
+
+from app.api.models import (
+    PlanetaryDay,
+    PlanetaryHour,
+    PlanetaryHoursRequest,
+    PlanetaryHoursResponse,
+)
+from app.astro.ephemeris import _julian_day, place_location
+from app.astro.events import _calc_flags, _jd_to_datetime
+from app.astro.timezone import local_to_utc
+from app.core.config import settings
+from app.utils.lru import LRUCache
+
+# Ordem caldaica: cada hora é regida pelo planeta seguinte da sequência.
+CHALDEAN_ORDER = ("Saturn", "Jupiter", "Mars", "Sun", "Venus", "Mercury", "Moon")
+# Regente do dia por ``date.weekday()`` (segunda = 0).
+DAY_RULERS = ("Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Sun")
+# Duas casas decimais (~1 km) mudam o nascer/ocaso em poucos segundos.
+LOCATION_DECIMALS = 2
+
+
+@dataclass(frozen=True)
+class RiseSetTable:
+    """Nascer/ocaso do Sol e da Lua para cada dia local de um ano (dias julianos UT).
+
+    O índice ``i`` corresponde a 1º de janeiro + ``i`` dias; há um dia extra no fim
+    para o nascer do Sol que encerra a última noite. ``NaN`` indica evento ausente
+    no dia (Sol circumpolar ou dia lunar sem nascer/ocaso).
+    """
+
+    year: int
+    timezone: str
+    midnight: np.ndarray
+    sunrise: np.ndarray
+    sunset: np.ndarray
+    moonrise: np.ndarray
+    moonset: np.ndarray
+
+
+_TABLES: LRUCache[tuple[float, float, str, int], RiseSetTable] = LRUCache(
+    settings.rise_set_cache_size
+)
+
+
+def _events(
+    midnights: np.ndarray, body: int, event: int, geopos: tuple[float, float, float], flags: int
+) -> np.ndarray:
+    times = np.full(len(midnights) - 1, np.nan)
+    # O próximo evento encontrado vale para todos os dias até ele, sem repetir a
+    # busca de ``rise_trans`` a cada dia quando ele cai semanas adiante.
+    upcoming = -math.inf
+    for index, (start, end) in enumerate(zip(midnights[:-1].tolist(), midnights[1:].tolist())):
+        if upcoming < start:
+            found, tret = swe.rise_trans(start, body, event, geopos, 0.0, 0.0, flags)
+            if found != 0:
+                continue
+            upcoming = tret[0]
+        if upcoming < end:
+            times[index] = upcoming
+    return times
+
+
+def build_rise_set_table(
+    latitude: float, longitude: float, timezone: str, year: int
+) -> RiseSetTable:
+    first = datetime(year, 1, 1)
+    days = (date(year + 1, 1, 1) - first.date()).days + 1
+    midnights = np.array(
+        [
+            _julian_day(local_to_utc(first + timedelta(days=offset), timezone))
+            for offset in range(days + 1)
+        ]
+    )
+    geopos = (longitude, latitude, 0.0)
+    flags = _calc_flags()
+    try:
+        return RiseSetTable(
+            year=year,
+            timezone=timezone,
+            midnight=midnights[:-1],
+            sunrise=_events(midnights, swe.SUN, swe.CALC_RISE, geopos, flags),
+            sunset=_events(midnights, swe.SUN, swe.CALC_SET, geopos, flags),
+            moonrise=_events(midnights, swe.MOON, swe.CALC_RISE, geopos, flags),
+            moonset=_events(midnights, swe.MOON, swe.CALC_SET, geopos, flags),
+        )
+    except swe.Error as exc:
+        raise RuntimeError(f"Falha ao calcular nascer/ocaso: {exc}") from exc
+
+
+def rise_set_table(latitude: float, longitude: float, timezone: str, year: int) -> RiseSetTable:
+    key = (round(latitude, LOCATION_DECIMALS), round(longitude, LOCATION_DECIMALS), timezone, year)
+    return _TABLES.get_or_compute(key, lambda: build_rise_set_table(*key))
+
+
+def planetary_hours(
+    sunrise: float, sunset: float, next_sunrise: float, day_ruler: str
+) -> list[tuple[str, float, float]]:
+    """24 horas desiguais: 12 do nascer ao ocaso e 12 do ocaso ao nascer seguinte."""
+    first = CHALDEAN_ORDER.index(day_ruler)
+    edges = np.concatenate(
+        (np.linspace(sunrise, sunset, 13), np.linspace(sunset, next_sunrise, 13)[1:])
+    ).tolist()
+    return [
+        (CHALDEAN_ORDER[(first + number) % 7], edges[number], edges[number + 1])
+        for number in range(24)
+    ]
+
+
+def _local_isoformat(jd: float, zone: tzinfo | None) -> str | None:
+    if math.isnan(jd):
+        return None
+    return _jd_to_datetime(jd).astimezone(zone).replace(microsecond=0).isoformat()
+
+
+def calculate_planetary_hours(payload: PlanetaryHoursRequest) -> PlanetaryHoursResponse:
+    location = place_location(payload.place)
+    zone = gettz(location.timezone)
+    days = []
+    for offset in range(payload.days):
+        day = payload.start_date + timedelta(days=offset)
+        table = rise_set_table(location.latitude, location.longitude, location.timezone, day.year)
+        index = day.timetuple().tm_yday - 1
+        sunrise, sunset = float(table.sunrise[index]), float(table.sunset[index])
+        next_sunrise = float(table.sunrise[index + 1])
+        ruler = DAY_RULERS[day.weekday()]
+        hours = []
+        # Sem nascer e ocaso no mesmo dia (latitudes polares) não há horas planetárias.
+        edges = (sunrise, sunset, next_sunrise)
+        if not any(math.isnan(value) for value in edges) and sunrise < sunset:
+            hours = [
+                PlanetaryHour(
+                    number=number,
+                    ruler=hour_ruler,
+                    period="day" if number <= 12 else "night",
+                    start=_local_isoformat(start, zone),
+                    end=_local_isoformat(end, zone),
+                )
+                for number, (hour_ruler, start, end) in enumerate(
+                    planetary_hours(sunrise, sunset, next_sunrise, ruler), start=1
+                )
+            ]
+        days.append(
+            PlanetaryDay(
+                date=day,
+                day_ruler=ruler,
+                sunrise=_local_isoformat(sunrise, zone),
+                sunset=_local_isoformat(sunset, zone),
+                moonrise=_local_isoformat(float(table.moonrise[index]), zone),
+                moonset=_local_isoformat(float(table.moonset[index]), zone),
+                hours=hours,
+            )
+        )
+    return PlanetaryHoursResponse(
+        place=location.place,
+        timezone=location.timezone,
+        latitude=round(location.latitude, 6),
+        longitude=round(location.longitude, 6),
+        days=days,
+    )
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import swisseph as swe
+
+from app.astro.bodies import _ephemeris_path
+
+# "fast": Moshier embutido no Swiss Ephemeris, sem arquivos nem I/O.
+# "precise": arquivos .se1 de ASTRO_EPHEMERIS_PATH (sem eles, o próprio Swiss
+# Ephemeris cai para Moshier).
+PRECISION_TIERS = ("fast", "precise")
+
+# O Moshier cobre Sol a Plutão, nodos e apogeus lunares; Chiron, Ceres–Vesta e
+# asteroides numerados só existem nos arquivos.
+_MOSHIER_LAST_BODY = swe.OSCU_APOG
+
+_configured_path: str | None = None
+
+
+def configure_ephemeris_path() -> str:
+    """Aponta o Swiss Ephemeris para ``ASTRO_EPHEMERIS_PATH`` uma vez por processo.
+
+    ``swe.set_ephe_path`` fecha e reabre os arquivos; só é chamado de novo se o
+    caminho configurado mudar.
+    """
+    global _configured_path
+    path = _ephemeris_path()
+    if path and path != _configured_path:
+        swe.set_ephe_path(path)
+        _configured_path = path
+    return path
+
+
+def calc_flags(precision: str) -> int:
+    if precision == "fast":
+        return swe.FLG_MOSEPH | swe.FLG_SPEED
+    if precision != "precise":
+        raise ValueError("precision inválido. Use: fast ou precise.")
+    configure_ephemeris_path()
+    return swe.FLG_SWIEPH | swe.FLG_SPEED
+
+
+def moshier_supports(body: int) -> bool:
+    return 0 <= body <= _MOSHIER_LAST_BODY
+
+
+def check_bodies(names: Iterable[str], bodies: Iterable[int], precision: str) -> None:
+    if precision != "fast":
+        return
+    missing = [name for name, body in zip(names, bodies) if not moshier_supports(body)]
+    if missing:
+        raise ValueError(
+            f"Corpos que exigem arquivos de efemérides (use precision=precise): {', '.join(missing)}"
+        )
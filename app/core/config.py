@@ -11,7 +11,7 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_prefix="ASTRO_")
 
     app_name: str = "AstroLumen"
-    mock_mode: bool = False
+    mock_mode: bool | Literal["synthetic"] = False
     ephemeris_path: str | None = None
     rate_limit_enabled: bool = True
     rate_limit_requests: int = 30
@@ -30,6 +30,29 @@ class Settings(BaseSettings):
         return value
     geocode_timeout: float = 10.0
     geocode_min_delay_seconds: float = 1.0
+    sky_cache_size: int = 4096
+    sky_cache_quantum_seconds: float = 1.0
+    chart_stage_cache_size: int = 1024
+    event_index_path: str = "app/astro/data/events"
+    rise_set_cache_size: int = 256
+    chart_http_max_age: int = 86400
+    jobs_db_path: str = "jobs.db"
+    job_workers: int = 2
+    job_processes: bool = True
+    job_poll_interval_seconds: float = 1.0
+    job_stale_after_seconds: float = 120.0
+    job_result_ttl_seconds: float = 86400.0
+    job_max_attempts: int = 3
+    chart_store_path: str = "charts.db"
+    chart_store_ttl_seconds: float = 30 * 86400.0
+    chart_store_cache_size: int = 1024
+    admission_enabled: bool = True
+    admission_chart_concurrency: int = 8
+    admission_chart_queue_deadline_seconds: float = 2.0
+    admission_lookup_concurrency: int = 64
+    admission_lookup_queue_deadline_seconds: float = 0.5
+    admission_window_size: int = 200
+    lots_path: str | None = None
 
 
 @lru_cache(maxsize=1)
@@ -0,0 +1,20 @@
+from app.jobs.queue import Job, JobQueue
+from app.jobs.worker import (
+    JOB_KINDS,
+    JobWorkerPool,
+    get_job_queue,
+    notify_job_workers,
+    start_job_workers,
+    stop_job_workers,
+)
+
+__all__ = [
+    "JOB_KINDS",
+    "Job",
+    "JobQueue",
+    "JobWorkerPool",
+    "get_job_queue",
+    "notify_job_workers",
+    "start_job_workers",
+    "stop_job_workers",
+]
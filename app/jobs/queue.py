@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import sqlite3
+import time
+from typing import Iterator
+import uuid
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+
+@dataclass(frozen=True)
+class Job:
+    id: str
+    kind: str
+    payload: str
+    priority: int
+    status: str
+    progress: float
+    attempts: int
+    error: str | None
+    created_at: float
+    started_at: float | None
+    finished_at: float | None
+    expires_at: float | None
+
+
+_JOB_COLUMNS = (
+    "id, kind, payload, priority, status, progress, attempts, error, "
+    "created_at, started_at, finished_at, expires_at"
+)
+
+
+class JobQueue:
+    """Fila de jobs persistida em SQLite.
+
+    Cada operação abre sua conexão (os workers rodam em threads) e a retirada
+    da fila é um ``UPDATE ... RETURNING`` atômico, seguro também entre processos.
+    Quem executa um job renova ``heartbeat_at``; um job ``running`` sem heartbeat
+    recente pertencia a um processo que caiu e ``recover()`` o devolve à fila, até
+    ``max_attempts`` tentativas. Entradas parciais gravadas com o progresso
+    (``job_partials``) sobrevivem à queda: a próxima tentativa continua delas.
+    """
+
+    def __init__(self, path: str | Path, result_ttl_seconds: float, max_attempts: int) -> None:
+        self.path = Path(path)
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL,
+                    progress REAL NOT NULL DEFAULT 0,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    result TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    heartbeat_at REAL,
+                    expires_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_jobs_queue
+                    ON jobs(status, priority DESC, created_at);
+                CREATE INDEX IF NOT EXISTS idx_jobs_expires_at ON jobs(expires_at);
+                CREATE TABLE IF NOT EXISTS job_partials (
+                    job_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    entry TEXT NOT NULL,
+                    PRIMARY KEY (job_id, position)
+                );
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Autocommit: cada comando é sua própria transação.
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def submit(self, kind: str, payload: str, priority: int = 0) -> Job:
+        job_id = uuid.uuid4().hex
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO jobs (id, kind, payload, priority, status, created_at) "
+                "VALUES (?, ?, ?, ?, 'queued', ?)",
+                (job_id, kind, payload, priority, time.time()),
+            )
+        job = self.get(job_id)
+        assert job is not None
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._connect() as connection:
+            row = connection.execute(
+                f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (job_id, time.time()),
+            ).fetchone()
+        return Job(**row) if row else None
+
+    def result(self, job_id: str) -> str | None:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT result FROM jobs WHERE id = ? AND status = 'succeeded' "
+                "AND expires_at > ?",
+                (job_id, time.time()),
+            ).fetchone()
+        return row["result"] if row else None
+
+    def claim(self) -> Job | None:
+        """Retira o próximo job (maior prioridade, mais antigo) e o marca ``running``."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"""
+                UPDATE jobs
+                SET status = 'running', started_at = ?1, heartbeat_at = ?1, attempts = attempts + 1
+                WHERE id = (
+                    SELECT id FROM jobs WHERE status = 'queued'
+                    ORDER BY priority DESC, created_at LIMIT 1
+                ) AND status = 'queued'
+                RETURNING {_JOB_COLUMNS}
+                """,
+                (time.time(),),
+            ).fetchall()
+        return Job(**rows[0]) if rows else None
+
+    def report_progress(self, job_id: str, progress: float, entry: object | None = None) -> None:
+        """Grava o progresso e, se houver, mais uma entrada parcial do resultado."""
+        with self._connect() as connection:
+            updated = connection.execute(
+                "UPDATE jobs SET progress = ?, heartbeat_at = ? WHERE id = ? AND status = 'running'",
+                (min(max(progress, 0.0), 1.0), time.time(), job_id),
+            ).rowcount
+            if updated and entry is not None:
+                connection.execute(
+                    "INSERT INTO job_partials (job_id, position, entry) "
+                    "SELECT ?1, COUNT(*), ?2 FROM job_partials WHERE job_id = ?1",
+                    (job_id, json.dumps(entry, ensure_ascii=False)),
+                )
+
+    def partial_results(self, job_id: str) -> list[object]:
+        """Entradas parciais já gravadas, na ordem em que foram reportadas."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT entry FROM job_partials WHERE job_id = ? ORDER BY position", (job_id,)
+            ).fetchall()
+        return [json.loads(row["entry"]) for row in rows]
+
+    def heartbeat(self, job_ids: list[str]) -> None:
+        if not job_ids:
+            return
+        with self._connect() as connection:
+            connection.execute(
+                f"UPDATE jobs SET heartbeat_at = ? WHERE status = 'running' "
+                f"AND id IN ({', '.join('?' * len(job_ids))})",
+                (time.time(), *job_ids),
+            )
+
+    def complete(self, job_id: str, result: object) -> None:
+        self._finish(job_id, "succeeded", result=json.dumps(result, ensure_ascii=False))
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._finish(job_id, "failed", error=error)
+
+    def _finish(
+        self, job_id: str, status: str, result: str | None = None, error: str | None = None
+    ) -> None:
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, "
+                "expires_at = ?, progress = CASE WHEN ? = 'succeeded' THEN 1 ELSE progress END "
+                "WHERE id = ?",
+                (status, result, error, now, now + self.result_ttl_seconds, status, job_id),
+            )
+            connection.execute("DELETE FROM job_partials WHERE job_id = ?", (job_id,))
+
+    def recover(self, stale_after_seconds: float) -> int:
+        """Devolve à fila os jobs interrompidos; os que esgotaram as tentativas falham.
+
+        O progresso só volta a zero quando não há entradas parciais para retomar.
+        """
+        now = time.time()
+        stale = now - stale_after_seconds
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ?, expires_at = ? "
+                "WHERE status = 'running' AND heartbeat_at < ? AND attempts >= ?",
+                (
+                    "Job interrompido repetidamente; tentativas esgotadas.",
+                    now,
+                    now + self.result_ttl_seconds,
+                    stale,
+                    self.max_attempts,
+                ),
+            )
+            # Quem esgotou as tentativas não será retomado.
+            connection.execute(
+                "DELETE FROM job_partials WHERE job_id NOT IN "
+                "(SELECT id FROM jobs WHERE status IN ('queued', 'running'))"
+            )
+            return connection.execute(
+                "UPDATE jobs SET status = 'queued', progress = CASE WHEN EXISTS "
+                "(SELECT 1 FROM job_partials WHERE job_id = jobs.id) THEN progress ELSE 0 END "
+                "WHERE status = 'running' AND heartbeat_at < ?",
+                (stale,),
+            ).rowcount
+
+    def purge_expired(self) -> int:
+        with self._connect() as connection:
+            return connection.execute(
+                "DELETE FROM jobs WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+
+    def counts(self) -> dict[str, int]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT status, COUNT(*) AS total FROM jobs GROUP BY status"
+            ).fetchall()
+        totals = {status: 0 for status in JOB_STATUSES}
+        totals.update({row["status"]: row["total"] for row in rows})
+        return totals
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import lru_cache
+import logging
+import multiprocessing
+import threading
+from typing import Any, Callable, Protocol
+
+from pydantic import BaseModel
+
+from app.api.models import (
+    AstrocartographyRequest,
+    NatalChartRequest,
+    ProgressionRequest,
+    RelocationRequest,
+    SolarReturnRequest,
+)
+from app.astro.astrocartography import calculate_astrocartography
+from app.astro.ephemeris import (
+    calculate_natal_chart,
+    calculate_progression,
+    calculate_relocations,
+    calculate_solar_return,
+)
+from app.core.config import settings
+from app.jobs.queue import Job, JobQueue
+
+logger = logging.getLogger(__name__)
+
+class ProgressCallback(Protocol):
+    """Grava o progresso; ``entry`` é uma entrada parcial a guardar para uma retomada."""
+
+    def __call__(self, value: float, entry: object | None = None) -> None: ...
+
+
+JobRun = Callable[[Any, ProgressCallback, list[Any]], object]
+
+
+@dataclass(frozen=True)
+class JobKind:
+    """Tipo de job: ``run`` recebe o payload, o callback de progresso e as
+    entradas parciais de uma tentativa anterior.
+
+    Tipos de uma etapa só (``reports_progress=False``) não têm progresso real a
+    mostrar: o status traz ``progress`` nulo até o job terminar.
+    """
+
+    request_model: type[BaseModel]
+    run: JobRun
+    reports_progress: bool = True
+
+
+# Fração reportada quando o cálculo termina e só falta gravar o resultado.
+_COMPUTED = 0.9
+
+
+def _single(compute: Callable[[Any], BaseModel]) -> JobRun:
+    def run(payload: BaseModel, progress: ProgressCallback, done: list[Any]) -> object:
+        return compute(payload).model_dump(mode="json")
+
+    return run
+
+
+def _solar_return(
+    payload: SolarReturnRequest, progress: ProgressCallback, done: list[Any]
+) -> object:
+    # Duas etapas: mapa natal (Sol natal e local resolvido) e busca do retorno.
+    natal_chart = calculate_natal_chart(payload)
+    progress(_COMPUTED / 2)
+    result = calculate_solar_return(payload, natal_chart)
+    progress(_COMPUTED)
+    return result.model_dump(mode="json")
+
+
+def _relocations(payload: RelocationRequest, progress: ProgressCallback, done: list[Any]) -> object:
+    # Cada local calculado é gravado com o progresso; uma nova tentativa depois
+    # de uma queda continua do primeiro local sem entrada.
+    entries = list(done)
+    remaining = payload.locations[len(entries):]
+    if remaining:
+        for entry in calculate_relocations(payload.model_copy(update={"locations": remaining})):
+            entries.append(entry.model_dump(mode="json"))
+            progress(len(entries) / len(payload.locations), entries[-1])
+    return entries
+
+
+JOB_KINDS: dict[str, JobKind] = {
+    "natal": JobKind(NatalChartRequest, _single(calculate_natal_chart), reports_progress=False),
+    "solar_return": JobKind(SolarReturnRequest, _solar_return),
+    "progression": JobKind(
+        ProgressionRequest, _single(calculate_progression), reports_progress=False
+    ),
+    "relocation": JobKind(RelocationRequest, _relocations),
+    "astrocartography": JobKind(
+        AstrocartographyRequest, _single(calculate_astrocartography), reports_progress=False
+    ),
+}
+
+
+def execute_job(queue: JobQueue, job: Job) -> None:
+    """Executa um job já retirado da fila e grava progresso, resultado ou erro."""
+    kind = JOB_KINDS.get(job.kind)
+    if kind is None:
+        queue.fail(job.id, f"Tipo de job desconhecido: {job.kind}")
+        return
+    try:
+        payload = kind.request_model.model_validate_json(job.payload)
+        result = kind.run(
+            payload,
+            lambda value, entry=None: queue.report_progress(job.id, value, entry),
+            queue.partial_results(job.id),
+        )
+    except (ValueError, RuntimeError) as exc:
+        queue.fail(job.id, str(exc))
+        return
+    except Exception:
+        logger.exception("Failed to run job", extra={"job_id": job.id, "kind": job.kind})
+        queue.fail(job.id, "Erro interno ao executar o job.")
+        return
+    queue.complete(job.id, result)
+
+
+_PROCESS_QUEUES: dict[tuple[str, float, int], JobQueue] = {}
+
+
+def _execute_in_process(path: str, result_ttl_seconds: float, max_attempts: int, job: Job) -> None:
+    # No processo filho, progresso e resultado vão direto para o SQLite da fila.
+    key = (path, result_ttl_seconds, max_attempts)
+    queue = _PROCESS_QUEUES.get(key)
+    if queue is None:
+        queue = _PROCESS_QUEUES[key] = JobQueue(path, result_ttl_seconds, max_attempts)
+    execute_job(queue, job)
+
+
+class JobWorkerPool:
+    """Threads que consomem a ``JobQueue`` e uma thread de manutenção.
+
+    Com ``processes=True`` cada thread só despacha: o cálculo roda num pool de
+    processos (``spawn``) e não disputa o GIL com a API. O processo filho grava
+    progresso e resultado direto na fila. A manutenção renova o heartbeat dos
+    jobs em execução, devolve à fila jobs abandonados por processos que caíram
+    e apaga resultados vencidos.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        workers: int,
+        poll_interval_seconds: float,
+        stale_after_seconds: float,
+        processes: bool = False,
+    ) -> None:
+        self.queue = queue
+        self.workers = workers
+        self.poll_interval_seconds = poll_interval_seconds
+        self.stale_after_seconds = stale_after_seconds
+        self.processes = processes
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._running: set[str] = set()
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def start(self) -> None:
+        self.queue.recover(self.stale_after_seconds)
+        self._stop.clear()
+        if self.processes:
+            self._executor = self._new_executor()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"astro-job-{index}", daemon=True)
+            for index in range(self.workers)
+        ]
+        self._threads.append(
+            threading.Thread(target=self._maintain, name="astro-job-maintenance", daemon=True)
+        )
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        if self._executor is not None:
+            # Um job já em execução no filho termina e grava o próprio resultado.
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            job = self.queue.claim()
+            if job is None:
+                self._wake.wait(self.poll_interval_seconds)
+                self._wake.clear()
+                continue
+            with self._lock:
+                self._running.add(job.id)
+            try:
+                self.run_job(job)
+            finally:
+                with self._lock:
+                    self._running.discard(job.id)
+
+    def run_job(self, job: Job) -> None:
+        executor = self._executor
+        if executor is None:
+            execute_job(self.queue, job)
+            return
+        queue = self.queue
+        try:
+            executor.submit(
+                _execute_in_process, str(queue.path), queue.result_ttl_seconds, queue.max_attempts, job
+            ).result()
+        except BrokenProcessPool:
+            logger.exception("Failed to run job", extra={"job_id": job.id, "kind": job.kind})
+            queue.fail(job.id, "Erro interno ao executar o job.")
+            with self._lock:
+                # Um filho morreu: o pool inteiro fica inutilizável e é recriado.
+                if self._executor is executor and not self._stop.is_set():
+                    self._executor = self._new_executor()
+        except Exception:
+            logger.exception("Failed to run job", extra={"job_id": job.id, "kind": job.kind})
+            queue.fail(job.id, "Erro interno ao executar o job.")
+
+    def _maintain(self) -> None:
+        # O heartbeat precisa vencer bem antes de ``stale_after_seconds``.
+        interval = min(self.stale_after_seconds / 3, 30.0)
+        while not self._stop.wait(interval):
+            try:
+                with self._lock:
+                    running = list(self._running)
+                self.queue.heartbeat(running)
+                self.queue.recover(self.stale_after_seconds)
+                self.queue.purge_expired()
+            except Exception:
+                logger.exception("Failed to maintain job queue")
+
+
+@lru_cache(maxsize=1)
+def get_job_queue() -> JobQueue:
+    return JobQueue(
+        settings.jobs_db_path,
+        result_ttl_seconds=settings.job_result_ttl_seconds,
+        max_attempts=settings.job_max_attempts,
+    )
+
+
+_POOL: JobWorkerPool | None = None
+
+
+def start_job_workers() -> JobWorkerPool:
+    global _POOL
+    if _POOL is None:
+        _POOL = JobWorkerPool(
+            get_job_queue(),
+            workers=settings.job_workers,
+            poll_interval_seconds=settings.job_poll_interval_seconds,
+            stale_after_seconds=settings.job_stale_after_seconds,
+            processes=settings.job_processes,
+        )
+        _POOL.start()
+    return _POOL
+
+
+def stop_job_workers() -> None:
+    global _POOL
+    if _POOL is not None:
+        _POOL.stop()
+        _POOL = None
+
+
+def notify_job_workers() -> None:
+    if _POOL is not None:
+        _POOL.notify()
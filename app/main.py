@@ -8,9 +8,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.api.routes import router as api_router
+from app.astro.fixed_stars import load_star_catalogue
+from app.astro.lots import compiled_lots
 from app.astro.interpretations import init_interpretations_store
 from app.core.config import settings
 from app.core.logging import configure_logging
+from app.jobs import start_job_workers, stop_job_workers
+from app.utils.admission import AdmissionMiddleware, admission_stats
 from app.utils.rate_limit import rate_limit
 
 
@@ -38,6 +42,9 @@ async def add_process_time_header(request: Request, call_next):
     return response
 
 
+app.add_middleware(AdmissionMiddleware)
+
+
 @app.exception_handler(ValueError)
 async def value_error_handler(_: Request, exc: ValueError):
     return JSONResponse(status_code=400, content={"detail": str(exc)})
@@ -53,6 +60,11 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/health/admission")
+async def health_admission() -> dict[str, object]:
+    return admission_stats()
+
+
 app.include_router(
     api_router,
     prefix="/v1",
@@ -64,8 +76,13 @@ app.include_router(
 async def on_startup() -> None:
     logger.info("AstroLumen API starting", extra={"mock_mode": settings.mock_mode})
     init_interpretations_store()
+    load_star_catalogue()
+    compiled_lots()
+    if settings.job_workers > 0:
+        start_job_workers()
 
 
 @app.on_event("shutdown")
 async def on_shutdown() -> None:
     logger.info("AstroLumen API shutting down")
+    stop_job_workers()
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import lru_cache
+import json
 import math
+import mmap
+import os
+from pathlib import Path
 import random
 import re
-from typing import Iterable
+from typing import BinaryIO, Iterable, Iterator
 
 
 @dataclass(frozen=True)
@@ -140,13 +147,26 @@ class AnomalyDetector:
 
 
 class UserBehaviorSimulator:
-    """Simula comportamento de usuário com cadeia de Markov simples."""
+    """Simula comportamento de usuário com cadeia de Markov simples.
+
+    As tabelas cumulativas de transição são pré-calculadas no construtor, então
+    cada passo custa um sorteio e uma busca binária.
+    """
 
     def __init__(self, transition_map: dict[str, dict[str, float]], seed: int = 42) -> None:
         if not transition_map:
             raise ValueError("transition_map não pode ser vazio")
         self.transition_map = transition_map
         self._rng = random.Random(seed)
+        self._tables: dict[str, tuple[tuple[str, ...], tuple[float, ...]]] = {}
+        for state, options in transition_map.items():
+            cumulative: list[float] = []
+            total = 0.0
+            for weight in options.values():
+                total += weight
+                cumulative.append(total)
+            if options and total > 0:
+                self._tables[state] = (tuple(options), tuple(cumulative))
 
     def simulate(self, start_state: str, steps: int) -> list[str]:
         if steps < 1:
@@ -161,20 +181,14 @@ class UserBehaviorSimulator:
         return path
 
     def _next_state(self, current_state: str) -> str:
-        options = self.transition_map.get(current_state)
-        if not options:
+        table = self._tables.get(current_state)
+        if table is None:
             return current_state
-        total = sum(options.values())
-        if total <= 0:
+        states, cumulative = table
+        index = bisect_left(cumulative, self._rng.random() * cumulative[-1])
+        if index == len(states):
             return current_state
-
-        roll = self._rng.random() * total
-        cumulative = 0.0
-        for state, weight in options.items():
-            cumulative += weight
-            if roll <= cumulative:
-                return state
-        return current_state
+        return states[index]
 
 
 class LogRootCauseAnalyzer:
@@ -198,33 +212,491 @@ class LogRootCauseAnalyzer:
         },
     }
 
+    DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+    SAMPLE_LIMIT = 5
+    TIME_BUCKETS = {"minute", "hour", "day"}
+
     @classmethod
-    def analyze(cls, log_lines: Iterable[str]) -> dict[str, object]:
+    def analyze(
+        cls,
+        log_lines: Iterable[str],
+        patterns: dict[str, dict[str, object]] | None = None,
+    ) -> dict[str, object]:
+        pattern_map = patterns or cls.ERROR_PATTERNS
         matches: Counter[str] = Counter()
         for line in log_lines:
-            for key, config in cls.ERROR_PATTERNS.items():
+            for key, config in pattern_map.items():
                 if config["regex"].search(line):
                     matches[key] += 1
 
         insights: list[dict[str, str | int]] = []
         for key, count in matches.most_common():
-            metadata = cls.ERROR_PATTERNS[key]
+            metadata = pattern_map[key]
+            insights.append(
+                {
+                    "type": key,
+                    "occurrences": count,
+                    "cause": metadata["cause"],
+                    "suggestion": metadata["suggestion"],
+                }
+            )
+
+        return {
+            "generated_at": datetime.now(UTC).isoformat(),
+            "total_patterns_detected": sum(matches.values()),
+            "insights": insights,
+        }
+
+    @classmethod
+    def analyze_file(
+        cls,
+        path: str | os.PathLike[str],
+        *,
+        patterns: dict[str, dict[str, object]] | None = None,
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        bucket: str = "hour",
+        sample_limit: int | None = None,
+    ) -> dict[str, object]:
+        """Analisa um arquivo de log grande em passada única.
+
+        O arquivo é mapeado em memória e dividido em blocos alinhados a quebras de
+        linha; cada bloco é processado por um pool de processos com uma única
+        expressão combinada de todos os padrões.
+        """
+        pattern_map = patterns or cls.ERROR_PATTERNS
+        spec = _pattern_spec(pattern_map)
+        limit = cls.SAMPLE_LIMIT if sample_limit is None else sample_limit
+        cls._validate_scan_options(bucket, limit)
+        file_path = os.fspath(path)
+        size = os.path.getsize(file_path)
+        partials: list[dict[str, object]] = []
+        if size:
+            with open(file_path, "rb") as handle, mmap.mmap(
+                handle.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped:
+                ranges = _line_aligned_ranges(mapped, chunk_size or cls.DEFAULT_CHUNK_SIZE)
+            if workers == 1 or len(ranges) == 1:
+                partials = [
+                    _scan_file_range(file_path, start, end, spec, bucket, limit)
+                    for start, end in ranges
+                ]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    partials = list(
+                        executor.map(
+                            _scan_file_range,
+                            [file_path] * len(ranges),
+                            [start for start, _ in ranges],
+                            [end for _, end in ranges],
+                            [spec] * len(ranges),
+                            [bucket] * len(ranges),
+                            [limit] * len(ranges),
+                        )
+                    )
+        return cls._build_scan_report(pattern_map, partials, limit)
+
+    @classmethod
+    def analyze_stream(
+        cls,
+        stream: BinaryIO,
+        *,
+        patterns: dict[str, dict[str, object]] | None = None,
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        bucket: str = "hour",
+        sample_limit: int | None = None,
+    ) -> dict[str, object]:
+        """Analisa um fluxo binário (ex.: stdin) em blocos alinhados a linhas."""
+        pattern_map = patterns or cls.ERROR_PATTERNS
+        spec = _pattern_spec(pattern_map)
+        limit = cls.SAMPLE_LIMIT if sample_limit is None else sample_limit
+        cls._validate_scan_options(bucket, limit)
+        chunks = _iter_stream_chunks(stream, chunk_size or cls.DEFAULT_CHUNK_SIZE)
+        if workers == 1:
+            partials = [_scan_bytes(chunk, spec, bucket, limit) for chunk in chunks]
+        else:
+            partials = []
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Limita os blocos em voo para não materializar o fluxo inteiro.
+                max_pending = 2 * (workers or os.cpu_count() or 1)
+                pending: deque[Future[dict[str, object]]] = deque()
+                for chunk in chunks:
+                    pending.append(executor.submit(_scan_bytes, chunk, spec, bucket, limit))
+                    if len(pending) >= max_pending:
+                        partials.append(pending.popleft().result())
+                partials.extend(future.result() for future in pending)
+        return cls._build_scan_report(pattern_map, partials, limit)
+
+    @staticmethod
+    def load_pattern_pack(path: str | os.PathLike[str]) -> dict[str, dict[str, object]]:
+        """Carrega um pacote de padrões em JSON.
+
+        Formato: ``{"chave": {"regex": "...", "flags": "i", "cause": "...",
+        "suggestion": "..."}}``. O resultado tem o mesmo formato de
+        ``ERROR_PATTERNS`` e pode ser combinado com ele.
+        """
+        raw = json.loads(Path(path).read_text(encoding="utf-8"))
+        if not isinstance(raw, dict) or not raw:
+            raise ValueError("Pacote de padrões deve ser um objeto JSON não vazio")
+        pack: dict[str, dict[str, object]] = {}
+        for key, config in raw.items():
+            if not isinstance(config, dict) or "regex" not in config:
+                raise ValueError(f"Padrão '{key}' sem campo 'regex'")
+            flags = 0
+            for flag in str(config.get("flags", "")):
+                if flag not in _INLINE_FLAGS:
+                    raise ValueError(f"Flag de regex inválida em '{key}': {flag}")
+                flags |= _INLINE_FLAGS[flag]
+            pack[key] = {
+                "regex": re.compile(str(config["regex"]), flags),
+                "cause": str(config.get("cause", key)),
+                "suggestion": str(config.get("suggestion", "")),
+            }
+        return pack
+
+    @classmethod
+    def _validate_scan_options(cls, bucket: str, sample_limit: int) -> None:
+        if bucket not in cls.TIME_BUCKETS:
+            raise ValueError("bucket deve ser 'minute', 'hour' ou 'day'")
+        if sample_limit < 0:
+            raise ValueError("sample_limit não pode ser negativo")
+
+    @classmethod
+    def _build_scan_report(
+        cls,
+        pattern_map: dict[str, dict[str, object]],
+        partials: list[dict[str, object]],
+        sample_limit: int,
+    ) -> dict[str, object]:
+        matches: Counter[str] = Counter()
+        samples: dict[str, list[str]] = {}
+        buckets: dict[str, Counter[str]] = {}
+        lines_scanned = 0
+        bytes_scanned = 0
+        for partial in partials:
+            matches.update(partial["counts"])
+            lines_scanned += partial["lines"]
+            bytes_scanned += partial["bytes"]
+            for key, lines in partial["samples"].items():
+                kept = samples.setdefault(key, [])
+                kept.extend(lines[: sample_limit - len(kept)])
+            for key, counts in partial["buckets"].items():
+                buckets.setdefault(key, Counter()).update(counts)
+
+        insights: list[dict[str, object]] = []
+        for key, count in matches.most_common():
+            metadata = pattern_map[key]
             insights.append(
                 {
                     "type": key,
                     "occurrences": count,
                     "cause": metadata["cause"],
                     "suggestion": metadata["suggestion"],
+                    "samples": samples.get(key, []),
+                    "time_buckets": dict(sorted(buckets.get(key, Counter()).items())),
                 }
             )
 
         return {
             "generated_at": datetime.now(UTC).isoformat(),
             "total_patterns_detected": sum(matches.values()),
+            "lines_scanned": lines_scanned,
+            "bytes_scanned": bytes_scanned,
+            "chunks": len(partials),
             "insights": insights,
         }
 
 
+_INLINE_FLAGS = {
+    "i": re.IGNORECASE,
+    "m": re.MULTILINE,
+    "s": re.DOTALL,
+    "x": re.VERBOSE,
+}
+_TIMESTAMP_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})[T ](\d{2}):(\d{2})")
+_SAMPLE_MAX_CHARS = 500
+
+PatternSpec = tuple[tuple[str, str, int], ...]
+
+
+def _pattern_spec(pattern_map: dict[str, dict[str, object]]) -> PatternSpec:
+    # Os padrões viajam para os workers como texto + flags (picklable e hashable).
+    return tuple(
+        (key, config["regex"].pattern, config["regex"].flags & ~re.UNICODE)
+        for key, config in pattern_map.items()
+    )
+
+
+_GLOBAL_FLAGS_PREFIX = re.compile(r"^\(\?[aiLmsux]+\)")
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+_OPAQUE_ESCAPES = set("NxuU0")
+_TEXT_ANCHORS = {"A": "^", "Z": "$"}
+
+Prefilter = tuple[re.Pattern[str], bool]
+
+
+@lru_cache(maxsize=32)
+def _compile_spec(
+    spec: PatternSpec,
+) -> tuple[tuple[Prefilter, ...], tuple[tuple[str, re.Pattern[str]], ...]]:
+    """Monta a alternância combinada usada como pré-filtro de linhas.
+
+    O ``re`` só usa a busca rápida por primeiro caractere quando a alternância é
+    plana e sensível a maiúsculas, então os padrões são achatados (sem grupos de
+    captura) e os case-insensitive rodam sobre o texto em minúsculas. Cada linha
+    candidata é confirmada depois com os padrões originais.
+
+    O pré-filtro roda sobre o bloco inteiro, então usa MULTILINE (``^``/``$``
+    por linha, como em ``analyze``) e nunca DOTALL. Padrões com
+    retrorreferências não entram na alternância, que renumeraria os grupos: cada
+    um vira um pré-filtro próprio.
+    """
+    sensitive: list[str] = []
+    insensitive: list[str] = []
+    insensitive_lowerable = True
+    compiled = []
+    prefilters: list[Prefilter] = []
+    for key, pattern, flags in spec:
+        compiled.append((key, re.compile(pattern, flags)))
+        if _BACKREFERENCE.search(pattern):
+            prefilters.append(
+                (
+                    re.compile(
+                        _GLOBAL_FLAGS_PREFIX.sub("", pattern),
+                        (flags | re.MULTILINE) & ~re.DOTALL,
+                    ),
+                    False,
+                )
+            )
+            continue
+        body, lowerable = _flatten_pattern(pattern)
+        scoped = "".join(
+            letter
+            for letter, flag in _INLINE_FLAGS.items()
+            if flags & flag and letter not in "ims"
+        )
+        if scoped:
+            body = f"(?{scoped}:{body})"
+        if flags & re.IGNORECASE:
+            insensitive.append(body)
+            insensitive_lowerable = insensitive_lowerable and lowerable
+        else:
+            sensitive.append(body)
+
+    if sensitive:
+        prefilters.append((re.compile("|".join(sensitive), re.MULTILINE), False))
+    if insensitive:
+        combined = "|".join(insensitive)
+        if insensitive_lowerable:
+            prefilters.append((re.compile(combined, re.MULTILINE), True))
+        else:
+            prefilters.append((re.compile(combined, re.IGNORECASE | re.MULTILINE), False))
+    return tuple(prefilters), tuple(compiled)
+
+
+def _flatten_pattern(pattern: str) -> tuple[str, bool]:
+    """Remove grupos de captura e indica se o padrão casa igual em minúsculas.
+
+    ``\\A`` e ``\\Z`` viram ``^`` e ``$``: no bloco, início e fim são de linha.
+    """
+    body = _GLOBAL_FLAGS_PREFIX.sub("", pattern)
+    output: list[str] = []
+    lowerable = True
+    in_class = False
+    index = 0
+    while index < len(body):
+        char = body[index]
+        if char == "\\":
+            escape = body[index : index + 2]
+            if escape[1:] in _OPAQUE_ESCAPES:
+                lowerable = False
+            if not in_class and escape[1:] in _TEXT_ANCHORS:
+                escape = _TEXT_ANCHORS[escape[1:]]
+            output.append(escape)
+            index += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            output.append(char)
+            index += 1
+            if body.startswith("^", index):
+                output.append("^")
+                index += 1
+            if body.startswith("]", index):
+                output.append("]")
+                index += 1
+            continue
+        elif char == "(":
+            if body.startswith("(?P<", index):
+                index = body.index(">", index) + 1
+                output.append("(?:")
+                continue
+            if not body.startswith("(?", index):
+                output.append("(?:")
+                index += 1
+                continue
+        if char.isupper():
+            lowerable = False
+        output.append(char)
+        index += 1
+    return _strip_outer_group("".join(output)), lowerable
+
+
+def _strip_outer_group(body: str) -> str:
+    if not body.startswith("(?:") or not body.endswith(")"):
+        return body
+    depth = 0
+    in_class = False
+    index = 0
+    while index < len(body):
+        char = body[index]
+        if char == "\\":
+            index += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return body[3:-1] if index == len(body) - 1 else body
+        index += 1
+    return body
+
+
+def _line_aligned_ranges(buffer: mmap.mmap, chunk_size: int) -> list[tuple[int, int]]:
+    if chunk_size < 1:
+        raise ValueError("chunk_size deve ser >= 1")
+    size = len(buffer)
+    ranges: list[tuple[int, int]] = []
+    start = 0
+    while start < size:
+        end = min(size, start + chunk_size)
+        if end < size:
+            newline = buffer.find(b"\n", end - 1)
+            end = size if newline == -1 else newline + 1
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _iter_stream_chunks(stream: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    if chunk_size < 1:
+        raise ValueError("chunk_size deve ser >= 1")
+    pending = b""
+    while True:
+        block = stream.read(chunk_size)
+        if not block:
+            break
+        pending += block
+        cut = pending.rfind(b"\n")
+        if cut == -1:
+            continue
+        yield pending[: cut + 1]
+        pending = pending[cut + 1 :]
+    if pending:
+        yield pending
+
+
+def _scan_file_range(
+    path: str,
+    start: int,
+    end: int,
+    spec: PatternSpec,
+    bucket: str,
+    sample_limit: int,
+) -> dict[str, object]:
+    with open(path, "rb") as handle, mmap.mmap(
+        handle.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        return _scan_bytes(mapped[start:end], spec, bucket, sample_limit)
+
+
+def _scan_bytes(
+    data: bytes,
+    spec: PatternSpec,
+    bucket: str,
+    sample_limit: int,
+) -> dict[str, object]:
+    prefilters, patterns = _compile_spec(spec)
+    text = data.decode("utf-8", errors="replace")
+    if "\r" in text:
+        # As linhas são confirmadas sem o "\r"; assim ``$`` casa igual no bloco.
+        text = text.replace("\r\n", "\n")
+    counts: Counter[str] = Counter()
+    samples: dict[str, list[str]] = {}
+    buckets: dict[str, Counter[str]] = {}
+    candidates: set[int] = set()
+    lowered: str | None = None
+    for prefilter, use_lowered in prefilters:
+        haystack = text
+        if use_lowered:
+            if lowered is None:
+                lowered = text.lower()
+            if len(lowered) != len(text):
+                # Alguns caracteres mudam de tamanho ao baixar a caixa.
+                prefilter = re.compile(prefilter.pattern, re.IGNORECASE)
+            else:
+                haystack = lowered
+        last_line_start = -1
+        for match in prefilter.finditer(haystack):
+            line_start = haystack.rfind("\n", 0, match.start()) + 1
+            if line_start != last_line_start:
+                candidates.add(line_start)
+                last_line_start = line_start
+            # Um casamento que atravessa "\n" (ex.: ``\s*``) consome o começo da
+            # linha seguinte, onde pode estar o casamento real: todas as linhas
+            # que ele toca viram candidatas.
+            newline = haystack.find("\n", match.start(), match.end())
+            while newline != -1:
+                last_line_start = newline + 1
+                candidates.add(last_line_start)
+                newline = haystack.find("\n", newline + 1, match.end())
+
+    for line_start in sorted(candidates):
+        line_end = text.find("\n", line_start)
+        line = text[line_start : line_end if line_end != -1 else len(text)].rstrip("\r")
+        bucket_key = _time_bucket(line, bucket)
+        for key, regex in patterns:
+            if not regex.search(line):
+                continue
+            counts[key] += 1
+            kept = samples.setdefault(key, [])
+            if len(kept) < sample_limit:
+                kept.append(line[:_SAMPLE_MAX_CHARS])
+            if bucket_key is not None:
+                buckets.setdefault(key, Counter())[bucket_key] += 1
+
+    line_count = text.count("\n")
+    if text and not text.endswith("\n"):
+        line_count += 1
+    return {
+        "counts": counts,
+        "samples": samples,
+        "buckets": buckets,
+        "lines": line_count,
+        "bytes": len(data),
+    }
+
+
+def _time_bucket(line: str, bucket: str) -> str | None:
+    found = _TIMESTAMP_PATTERN.search(line, 0, 64)
+    if not found:
+        return None
+    day, hour, minute = found.groups()
+    if bucket == "day":
+        return day
+    if bucket == "hour":
+        return f"{day}T{hour}:00"
+    return f"{day}T{hour}:{minute}"
+
+
 def _median(values: list[float]) -> float:
     ordered = sorted(values)
     mid = len(ordered) // 2
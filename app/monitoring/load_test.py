@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+import json
+import logging
+import math
+import random
+import time
+from typing import Any, Callable
+
+import httpx
+
+from app.monitoring.health_analytics import UserBehaviorSimulator
+
+PLACES = [
+    "São Paulo, Brasil",
+    "Rio de Janeiro, Brasil",
+    "Lisboa, Portugal",
+    "London, UK",
+    "New York, USA",
+]
+
+DEFAULT_TRANSITIONS: dict[str, dict[str, float]] = {
+    "landing": {"natal": 0.6, "lunation": 0.25, "exit": 0.15},
+    "natal": {
+        "interpretation": 0.35,
+        "report": 0.2,
+        "solar_return": 0.15,
+        "progression": 0.1,
+        "exit": 0.2,
+    },
+    "interpretation": {"report": 0.3, "solar_return": 0.2, "exit": 0.5},
+    "report": {"exit": 1.0},
+    "solar_return": {"progression": 0.3, "exit": 0.7},
+    "progression": {"exit": 1.0},
+    "lunation": {"natal": 0.4, "exit": 0.6},
+}
+
+
+@dataclass(frozen=True)
+class RequestTemplate:
+    """Requisição HTTP disparada quando o usuário simulado entra em um estado."""
+
+    method: str
+    path: str
+    build_payload: Callable[[random.Random], dict[str, Any]] | None = None
+
+
+def _birth_payload(rng: random.Random) -> dict[str, Any]:
+    birth_date = date(1950, 1, 1) + timedelta(days=rng.randrange(365 * 55))
+    return {
+        "full_name": f"Load User {rng.randrange(1_000_000)}",
+        "birth_date": birth_date.isoformat(),
+        "birth_time": f"{rng.randrange(24):02d}:{rng.randrange(60):02d}",
+        "birth_place": rng.choice(PLACES),
+        "language": rng.choice(["pt-BR", "en"]),
+    }
+
+
+def _solar_return_payload(rng: random.Random) -> dict[str, Any]:
+    return {**_birth_payload(rng), "target_year": rng.randrange(2020, 2031)}
+
+
+def _progression_payload(rng: random.Random) -> dict[str, Any]:
+    target = date(2020, 1, 1) + timedelta(days=rng.randrange(365 * 10))
+    return {**_birth_payload(rng), "target_date": target.isoformat()}
+
+
+def _interpretation_payload(rng: random.Random) -> dict[str, Any]:
+    return {
+        **_birth_payload(rng),
+        "focus": rng.choice(["general", "relationships", "career"]),
+    }
+
+
+def _lunation_payload(rng: random.Random) -> dict[str, Any]:
+    reference = date(2024, 1, 1) + timedelta(days=rng.randrange(365 * 3))
+    return {
+        "reference_date": reference.isoformat(),
+        "phase": rng.choice(["new", "full"]),
+        "language": rng.choice(["pt-BR", "en"]),
+    }
+
+
+STATE_REQUESTS: dict[str, RequestTemplate] = {
+    "landing": RequestTemplate("GET", "/health"),
+    "natal": RequestTemplate("POST", "/v1/chart/natal", _birth_payload),
+    "interpretation": RequestTemplate(
+        "POST", "/v1/interpretation/ai", _interpretation_payload
+    ),
+    "report": RequestTemplate("POST", "/v1/report/doc", _birth_payload),
+    "solar_return": RequestTemplate(
+        "POST", "/v1/chart/solar-return", _solar_return_payload
+    ),
+    "progression": RequestTemplate("POST", "/v1/chart/progression", _progression_payload),
+    "lunation": RequestTemplate("POST", "/v1/lunation", _lunation_payload),
+}
+
+
+@dataclass(frozen=True)
+class RequestSample:
+    state: str
+    status: int
+    latency_ms: float
+
+    @property
+    def ok(self) -> bool:
+        return 0 < self.status < 400
+
+
+@dataclass
+class LoadTestReport:
+    users: int
+    duration_s: float
+    samples: list[RequestSample] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, object]:
+        statuses = Counter(str(sample.status) for sample in self.samples)
+        by_state: dict[str, list[RequestSample]] = {}
+        for sample in self.samples:
+            by_state.setdefault(sample.state, []).append(sample)
+        return {
+            "users": self.users,
+            "requests": len(self.samples),
+            "errors": sum(1 for sample in self.samples if not sample.ok),
+            "duration_s": round(self.duration_s, 3),
+            "throughput_rps": round(len(self.samples) / self.duration_s, 2)
+            if self.duration_s > 0
+            else 0.0,
+            "status_counts": dict(sorted(statuses.items())),
+            "latency_ms": _latency_summary(self.samples),
+            "states": {
+                state: {
+                    "requests": len(samples),
+                    "errors": sum(1 for sample in samples if not sample.ok),
+                    "latency_ms": _latency_summary(samples),
+                }
+                for state, samples in sorted(by_state.items())
+            },
+        }
+
+
+class LoadTestHarness:
+    """Reproduz jornadas do ``UserBehaviorSimulator`` como carga HTTP concorrente.
+
+    Cada usuário simulado percorre a própria jornada em sequência; os usuários
+    rodam em paralelo via asyncio, limitados por ``concurrency`` conexões. Estados
+    sem requisição mapeada (ex.: ``exit``) encerram a jornada.
+    """
+
+    def __init__(
+        self,
+        simulator: UserBehaviorSimulator,
+        requests: dict[str, RequestTemplate] | None = None,
+        *,
+        app: Any | None = None,
+        base_url: str | None = None,
+        concurrency: int = 100,
+        timeout: float = 30.0,
+        think_time_s: float = 0.0,
+        seed: int = 42,
+    ) -> None:
+        if (app is None) == (base_url is None):
+            raise ValueError("Informe exatamente um entre app e base_url")
+        if concurrency < 1:
+            raise ValueError("concurrency deve ser >= 1")
+        if think_time_s < 0:
+            raise ValueError("think_time_s não pode ser negativo")
+        self.simulator = simulator
+        self.requests = requests if requests is not None else STATE_REQUESTS
+        self._app = app
+        self._base_url = base_url
+        self._concurrency = concurrency
+        self._timeout = timeout
+        self._think_time_s = think_time_s
+        self._rng = random.Random(seed)
+
+    async def run(self, users: int, steps: int, start_state: str = "landing") -> LoadTestReport:
+        if users < 1:
+            raise ValueError("users deve ser >= 1")
+        journeys = [
+            self._plan_journey(start_state, steps) for _ in range(users)
+        ]
+        samples: list[RequestSample] = []
+        semaphore = asyncio.Semaphore(self._concurrency)
+        # O ASGITransport não dispara o lifespan; os eventos de startup/shutdown
+        # do app (ex.: init_interpretations_store) rodam aqui.
+        router = getattr(self._app, "router", None)
+        if router is not None:
+            await router.startup()
+        try:
+            async with self._client() as client:
+                started = time.perf_counter()
+                await asyncio.gather(
+                    *(self._replay(client, semaphore, journey, samples) for journey in journeys)
+                )
+                duration = time.perf_counter() - started
+        finally:
+            if router is not None:
+                await router.shutdown()
+        return LoadTestReport(users=users, duration_s=duration, samples=samples)
+
+    def _plan_journey(
+        self, start_state: str, steps: int
+    ) -> list[tuple[str, RequestTemplate, dict[str, Any] | None]]:
+        journey = []
+        for state in self.simulator.simulate(start_state, steps):
+            template = self.requests.get(state)
+            if template is None:
+                break
+            payload = template.build_payload(self._rng) if template.build_payload else None
+            journey.append((state, template, payload))
+        return journey
+
+    async def _replay(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        journey: list[tuple[str, RequestTemplate, dict[str, Any] | None]],
+        samples: list[RequestSample],
+    ) -> None:
+        for state, template, payload in journey:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.request(template.method, template.path, json=payload)
+                    status = response.status_code
+                except httpx.HTTPError:
+                    status = 0
+                latency_ms = (time.perf_counter() - started) * 1000
+            samples.append(RequestSample(state=state, status=status, latency_ms=latency_ms))
+            if self._think_time_s:
+                await asyncio.sleep(self._think_time_s)
+
+    def _client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(max_connections=self._concurrency)
+        if self._app is not None:
+            return httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=self._app, raise_app_exceptions=False),
+                base_url="http://loadtest",
+                timeout=self._timeout,
+                limits=limits,
+            )
+        return httpx.AsyncClient(base_url=self._base_url, timeout=self._timeout, limits=limits)
+
+
+def _percentile(ordered: list[float], quantile: float) -> float:
+    index = min(len(ordered) - 1, math.ceil(len(ordered) * quantile) - 1)
+    return ordered[max(index, 0)]
+
+
+def _latency_summary(samples: list[RequestSample]) -> dict[str, float]:
+    if not samples:
+        return {"avg": 0.0, "p50": 0.0, "p90": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(sample.latency_ms for sample in samples)
+    return {
+        "avg": round(sum(ordered) / len(ordered), 3),
+        "p50": round(_percentile(ordered, 0.50), 3),
+        "p90": round(_percentile(ordered, 0.90), 3),
+        "p95": round(_percentile(ordered, 0.95), 3),
+        "p99": round(_percentile(ordered, 0.99), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Gera carga na API a partir de jornadas simuladas de usuários."
+    )
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--think-time", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--base-url",
+        help="URL de um servidor em execução; se omitido, usa o app em processo.",
+    )
+    args = parser.parse_args(argv)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    app = None
+    if args.base_url is None:
+        from app.main import app
+
+    harness = LoadTestHarness(
+        UserBehaviorSimulator(DEFAULT_TRANSITIONS, seed=args.seed),
+        app=app,
+        base_url=args.base_url,
+        concurrency=args.concurrency,
+        think_time_s=args.think_time,
+        seed=args.seed,
+    )
+    report = asyncio.run(harness.run(users=args.users, steps=args.steps))
+    print(json.dumps(report.as_dict(), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
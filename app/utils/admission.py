@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import logging
+import math
+import time
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.monitoring.health_analytics import PerformanceMonitor
+
+logger = logging.getLogger(__name__)
+
+
+class Overloaded(Exception):
+    """A fila não consegue atender dentro do prazo; ``retry_after`` em segundos."""
+
+    def __init__(self, route_class: str, retry_after: int) -> None:
+        super().__init__(f"Serviço sobrecarregado ({route_class}); tente novamente.")
+        self.route_class = route_class
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Limita requisições simultâneas de uma classe de rotas, com fila e prazo.
+
+    Com todas as vagas ocupadas, a espera estimada na fila é a posição vezes o
+    p95 ao vivo do ``PerformanceMonitor`` dividido pelas vagas (uma vaga libera,
+    em média, a cada p95/vagas). Se a estimativa passa do prazo, a requisição é
+    recusada na hora; se entra na fila e o prazo vence, também.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        queue_deadline_seconds: float,
+        window_size: int = 200,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency deve ser >= 1")
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.queue_deadline_seconds = queue_deadline_seconds
+        self.monitor = PerformanceMonitor(window_size=window_size)
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        # Um future por requisição na fila: não prende o controlador a um event loop.
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    def p95_seconds(self) -> float:
+        return self.monitor.snapshot()["p95_latency_ms"] / 1000
+
+    def estimated_wait(self, position: int) -> float:
+        return position * self.p95_seconds() / self.max_concurrency
+
+    def _reject(self, wait: float) -> Overloaded:
+        self.rejected += 1
+        return Overloaded(self.name, max(1, math.ceil(wait)))
+
+    async def acquire(self) -> None:
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        wait = self.estimated_wait(len(self._waiters) + 1)
+        if wait > self.queue_deadline_seconds:
+            raise self._reject(wait)
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_deadline_seconds)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled():
+                # A vaga chegou junto com o prazo ou o cancelamento: devolve.
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            raise self._reject(self.estimated_wait(len(self._waiters) + 1)) from None
+        self.admitted += 1
+
+    def release(self, latency_seconds: float | None = None, ok: bool = True) -> None:
+        """Libera a vaga e alimenta o monitor com a latência de quem a ocupava."""
+        if latency_seconds is not None:
+            self.monitor.record(latency_seconds * 1000, ok=ok)
+        # A vaga passa direto para o primeiro da fila, sem decrementar ``in_flight``.
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "queue_deadline_seconds": self.queue_deadline_seconds,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            **self.monitor.snapshot(),
+        }
+
+
+# Ordem importa: o primeiro prefixo que casar define a classe.
+ROUTE_CLASSES: tuple[tuple[str, str], ...] = (
+    ("/v1/chart/cache-stats", "lookup"),
+    ("/v1/chart/", "chart"),
+    ("/v1/electional/", "chart"),
+    ("/v1/ephemeris/", "chart"),
+    ("/v1/planetary-hours", "chart"),
+    ("/v1/lunation", "chart"),
+    ("/v1/report/", "chart"),
+    ("/v1/interpretation/", "chart"),
+    ("/v1/", "lookup"),
+)
+
+CONTROLLERS: dict[str, AdmissionController] = {
+    "chart": AdmissionController(
+        "chart",
+        settings.admission_chart_concurrency,
+        settings.admission_chart_queue_deadline_seconds,
+        settings.admission_window_size,
+    ),
+    "lookup": AdmissionController(
+        "lookup",
+        settings.admission_lookup_concurrency,
+        settings.admission_lookup_queue_deadline_seconds,
+        settings.admission_window_size,
+    ),
+}
+
+
+def route_controller(path: str) -> AdmissionController | None:
+    for prefix, route_class in ROUTE_CLASSES:
+        if path.startswith(prefix):
+            return CONTROLLERS[route_class]
+    return None
+
+
+def admission_stats() -> dict[str, object]:
+    return {name: controller.stats() for name, controller in CONTROLLERS.items()}
+
+
+class AdmissionMiddleware:
+    """Middleware ASGI que passa cada requisição HTTP pelo controlador da sua classe.
+
+    A vaga é devolvida quando sai a última parte do corpo (respostas em
+    streaming, como a relocação, trabalham enquanto enviam) e, em qualquer
+    caso, no ``finally`` em volta do app: cliente que desconecta antes ou
+    durante o corpo, ou exceção na rota, não deixam a vaga presa.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        controller = None
+        if scope["type"] == "http" and settings.admission_enabled:
+            controller = route_controller(scope["path"])
+        if controller is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await controller.acquire()
+        except Overloaded as exc:
+            logger.warning(
+                "Request shed",
+                extra={"route_class": exc.route_class, "path": scope["path"]},
+            )
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": str(exc)},
+                headers={"Retry-After": str(exc.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        released = False
+
+        def release(ok: bool) -> None:
+            nonlocal released
+            if not released:
+                released = True
+                controller.release(time.perf_counter() - started, ok=ok)
+
+        async def send_and_track(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                release(status_code < 500)
+
+        try:
+            await self.app(scope, receive, send_and_track)
+        finally:
+            release(False)
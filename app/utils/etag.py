@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import hashlib
+
+
+def strong_etag(*parts: str) -> str:
+    digest = hashlib.blake2b("\n".join(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Comparação fraca (RFC 9110) usada por ``If-None-Match``: ``*`` ou lista de tags."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
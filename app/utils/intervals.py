@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+Interval = tuple[float, float]
+
+
+def intersect(first: Iterable[Interval], second: Iterable[Interval]) -> list[Interval]:
+    """Interseção de duas listas ordenadas de intervalos disjuntos ``[início, fim)``."""
+    left, right = list(first), list(second)
+    result: list[Interval] = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        start = max(left[i][0], right[j][0])
+        end = min(left[i][1], right[j][1])
+        if start < end:
+            result.append((start, end))
+        if left[i][1] < right[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def complement(intervals: Iterable[Interval], start: float, end: float) -> list[Interval]:
+    result: list[Interval] = []
+    cursor = start
+    for begin, finish in intervals:
+        if finish <= cursor:
+            continue
+        if begin >= end:
+            break
+        if begin > cursor:
+            result.append((cursor, begin))
+        cursor = max(cursor, finish)
+    if cursor < end:
+        result.append((cursor, end))
+    return result
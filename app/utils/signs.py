@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
+
 SIGNS = [
     "Áries",
     "Touro",
@@ -107,6 +109,23 @@ def to_sign_position(degree: float) -> SignPosition:
     return SignPosition(sign=SIGNS[sign_index], degree=degree_int, minute=minute)
 
 
+def to_sign_positions(degrees: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Versão vetorizada de ``to_sign_position``: índices em ``SIGNS``, graus e minutos."""
+    normalized = np.mod(degrees, 360.0)
+    sign_indices = (normalized // 30).astype(np.int64)
+    degree_in_sign = normalized % 30
+    degree_ints = degree_in_sign.astype(np.int64)
+    # np.rint arredonda meio para par, como o round do Python.
+    minutes = np.rint((degree_in_sign - degree_ints) * 60).astype(np.int64)
+    carry = minutes == 60
+    degree_ints[carry] += 1
+    minutes[carry] = 0
+    wrap = degree_ints == 30
+    degree_ints[wrap] = 0
+    sign_indices[wrap] = (sign_indices[wrap] + 1) % 12
+    return sign_indices, degree_ints, minutes
+
+
 def describe_sign(sign: str, language: str) -> tuple[str, str, str]:
     meta = SIGN_METADATA.get(sign)
     if not meta:
@@ -115,3 +134,12 @@ def describe_sign(sign: str, language: str) -> tuple[str, str, str]:
     element = meta["element"]["en"] if language == "en" else meta["element"]["pt-BR"]
     modality = meta["modality"]["en"] if language == "en" else meta["modality"]["pt-BR"]
     return label, element, modality
+
+
+def sign_index(name: str) -> int:
+    """Índice do signo pelo nome em português ou inglês (sem diferenciar caixa)."""
+    wanted = name.strip().casefold()
+    for index, sign in enumerate(SIGNS):
+        if wanted in (sign.casefold(), SIGN_METADATA[sign]["en"].casefold()):
+            return index
+    raise ValueError(f"Signo desconhecido: {name}")
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, Generic, Hashable, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Agrupa chamadas concorrentes com a mesma chave em uma única execução.
+
+    A primeira chamada roda ``factory`` no threadpool; as que chegam enquanto ela
+    está em andamento aguardam o mesmo resultado (ou a mesma exceção). A chave sai
+    do registro assim que a execução termina: não é um cache.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Future[T]] = {}
+        self.executions = 0
+        self.shared = 0
+
+    async def run(self, key: Hashable, factory: Callable[[], T]) -> T:
+        future = self._inflight.get(key)
+        if future is None:
+            self.executions += 1
+            future = asyncio.ensure_future(run_in_threadpool(factory))
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.shared += 1
+        # ``shield``: se quem iniciou a execução for cancelado (cliente desconectou),
+        # os demais continuam esperando o mesmo cálculo.
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Hashable, future: asyncio.Future[T]) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # Marca a exceção como consumida mesmo que todos os chamadores tenham saído.
+            future.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> dict[str, int]:
+        return {"in_flight": len(self._inflight), "executions": self.executions, "shared": self.shared}
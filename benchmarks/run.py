@@ -0,0 +1,342 @@
+"""Benchmarks reprodutíveis dos caminhos quentes de ``app.astro``.
+
+Roda offline: o geocoding é substituído por coordenadas fixas e o banco de
+interpretações é criado em um diretório temporário. Os resultados são comparados
+com um baseline em JSON e o processo sai com código 1 quando a vazão de algum
+workload cai além do limite configurado.
+
+    python -m benchmarks.run                       # compara com benchmarks/baseline.json
+    python -m benchmarks.run --update-baseline     # regrava o baseline
+    python -m benchmarks.run --only single_chart --threshold 0.15
+"""
+from __future__ import annotations
+
+import argparse
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+import json
+import os
+from pathlib import Path
+import platform
+import random
+import sys
+import tempfile
+import time as timer
+from typing import Callable, Iterator
+
+import swisseph as swe
+
+from app.api.models import LunationRequest, NatalChartRequest, SolarReturnRequest
+from app.astro import ephemeris
+from app.astro.aspects import calculate_aspects
+from app.astro.interpretations import get_interpretation, init_interpretations_store
+from app.astro.precision import calc_flags
+from app.core.config import settings
+from app.utils.signs import SIGNS, to_sign_position
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.25
+SEED = 20240101
+
+PLACES = {
+    "London, UK": (51.5074, -0.1278, "London, Greater London, England, United Kingdom"),
+    "São Paulo, Brasil": (-23.5505, -46.6333, "São Paulo, Região Sudeste, Brasil"),
+    "New York, USA": (40.7128, -74.0060, "New York, United States"),
+    "Tokyo, Japan": (35.6762, 139.6503, "Tokyo, Japan"),
+}
+
+
+@dataclass(frozen=True)
+class Workload:
+    name: str
+    description: str
+    operations: int
+    run: Callable[[int], None]
+
+
+_GEOCODE_TABLE = {
+    **PLACES,
+    # Revoluções solares geocodificam de novo o endereço normalizado.
+    **{address: (lat, lon, address) for lat, lon, address in PLACES.values()},
+}
+
+
+def _stub_geocode(place: str) -> tuple[float, float, str]:
+    return _GEOCODE_TABLE[place]
+
+
+def _natal_request(rng: random.Random) -> NatalChartRequest:
+    birth_date = date(1900, 1, 1) + timedelta(days=rng.randrange(365 * 120))
+    return NatalChartRequest(
+        full_name="Benchmark",
+        birth_date=birth_date,
+        birth_time=time(rng.randrange(24), rng.randrange(60)),
+        birth_place=rng.choice(sorted(PLACES)),
+        house_system=rng.choice(["P", "K", "W", "R"]),
+    )
+
+
+def _single_chart(operations: int, precision: str = "precise") -> None:
+    # Um minuto a mais por operação: o mesmo mapa, sem acertos no cache de estágios.
+    start = datetime(1815, 12, 10, 10, 0)
+    payloads = [
+        NatalChartRequest(
+            full_name="Ada Lovelace",
+            birth_date=moment.date(),
+            birth_time=moment.time(),
+            birth_place="London, UK",
+            precision=precision,
+        )
+        for moment in (start + timedelta(minutes=index) for index in range(operations))
+    ]
+    for payload in payloads:
+        ephemeris.calculate_natal_chart(payload)
+
+
+def _single_chart_fast(operations: int) -> None:
+    _single_chart(operations, "fast")
+
+
+def _chart_batch(operations: int) -> None:
+    rng = random.Random(SEED)
+    payloads = [_natal_request(rng) for _ in range(operations)]
+    for payload in payloads:
+        ephemeris.calculate_natal_chart(payload)
+
+
+def _lunations_year(operations: int) -> None:
+    requests = [
+        LunationRequest(reference_date=date(2024, 1 + index // 2 % 12, 1), phase=phase)
+        for index, phase in zip(range(operations), ["new", "full"] * operations)
+    ]
+    for request in requests:
+        ephemeris.calculate_lunation(request)
+
+
+def _solar_returns_century(operations: int) -> None:
+    for offset in range(operations):
+        ephemeris.calculate_solar_return(
+            SolarReturnRequest(
+                full_name="Benchmark",
+                birth_date=date(1924, 7, 14),
+                birth_time=time(6, 30),
+                birth_place="São Paulo, Brasil",
+                target_year=1925 + offset % 100,
+            )
+        )
+
+
+def _aspects(operations: int) -> None:
+    rng = random.Random(SEED)
+    bodies = [
+        {"name": name, "longitude": rng.uniform(0, 360), "speed": rng.uniform(-1, 13)}
+        for name in ephemeris.PLANETS
+    ]
+    orbs = {"conjunction": 8, "opposition": 8, "square": 6, "trine": 6, "sextile": 4}
+    for _ in range(operations):
+        calculate_aspects(bodies, orbs)
+
+
+def _resolve_house(operations: int) -> None:
+    rng = random.Random(SEED)
+    cusps = sorted(rng.uniform(0, 360) for _ in range(12))
+    longitudes = [rng.uniform(0, 360) for _ in range(1000)]
+    for index in range(operations):
+        ephemeris._resolve_house(longitudes[index % 1000], cusps)
+
+
+def _sign_position(operations: int) -> None:
+    rng = random.Random(SEED)
+    longitudes = [rng.uniform(-720, 720) for _ in range(1000)]
+    for index in range(operations):
+        to_sign_position(longitudes[index % 1000])
+
+
+def _find_event_time(operations: int) -> None:
+    for index in range(operations):
+        start = datetime(1950 + index, 3, 17)
+        ephemeris._find_event_time(
+            start, start + timedelta(days=6), ephemeris._sun_longitude, 0.0
+        )
+
+
+def _interpretation_lookup(operations: int) -> None:
+    planets = list(ephemeris.PLANETS)
+    for index in range(operations):
+        get_interpretation(
+            "planet_sign",
+            planet=planets[index % len(planets)],
+            sign=SIGNS[index % 12],
+            language="en" if index % 2 else "pt-BR",
+        )
+
+
+WORKLOADS = [
+    Workload("single_chart", "calculate_natal_chart, minuto a minuto", 500, _single_chart),
+    Workload("single_chart_fast", "calculate_natal_chart, precision=fast", 500, _single_chart_fast),
+    Workload("chart_batch_10k", "10k mapas natais variados", 10_000, _chart_batch),
+    Workload("lunations_year", "luas novas e cheias de um ano", 24, _lunations_year),
+    Workload("solar_returns_century", "revoluções solares 1925-2024", 100, _solar_returns_century),
+    Workload("calculate_aspects", "aspectos entre os corpos de PLANETS", 5_000, _aspects),
+    Workload("resolve_house", "_resolve_house", 200_000, _resolve_house),
+    Workload("to_sign_position", "to_sign_position", 200_000, _sign_position),
+    Workload("find_event_time", "_find_event_time do equinócio", 50, _find_event_time),
+    Workload("get_interpretation", "consultas ao banco de interpretações", 2_000, _interpretation_lookup),
+]
+
+
+def _chiron_available() -> bool:
+    try:
+        ephemeris._calc_body(swe.julday(2000, 1, 1, 12.0), swe.CHIRON, calc_flags("precise"))
+    except swe.Error:
+        return False
+    return True
+
+
+@contextmanager
+def offline_environment() -> Iterator[dict[str, object]]:
+    """Prepara o ambiente determinístico: sem rede, sem mock e banco temporário."""
+    saved_env = os.environ.pop("ASTRO_MOCK_MODE", None)
+    saved_settings = (settings.mock_mode, settings.interpretations_db_path)
+    saved_geocode = ephemeris.geocode_place
+    saved_planets = dict(ephemeris.PLANETS)
+    with tempfile.TemporaryDirectory() as workdir:
+        settings.mock_mode = False
+        settings.interpretations_db_path = str(Path(workdir) / "interpretations.db")
+        ephemeris.geocode_place = _stub_geocode
+        # Sem os arquivos seas_*.se1 o Chiron não pode ser calculado; o baseline
+        # registra o conjunto de corpos para só comparar execuções equivalentes.
+        if not _chiron_available():
+            ephemeris.PLANETS.pop("Chiron", None)
+        try:
+            init_interpretations_store()
+            yield {"bodies": list(ephemeris.PLANETS)}
+        finally:
+            ephemeris.PLANETS.clear()
+            ephemeris.PLANETS.update(saved_planets)
+            ephemeris.geocode_place = saved_geocode
+            settings.mock_mode, settings.interpretations_db_path = saved_settings
+            if saved_env is not None:
+                os.environ["ASTRO_MOCK_MODE"] = saved_env
+
+
+def run_workloads(
+    names: list[str] | None = None,
+    *,
+    scale: float = 1.0,
+    repeat: int = 3,
+) -> dict[str, object]:
+    if scale <= 0:
+        raise ValueError("scale deve ser > 0")
+    if repeat < 1:
+        raise ValueError("repeat deve ser >= 1")
+    selected = [w for w in WORKLOADS if names is None or w.name in names]
+    unknown = set(names or []) - {w.name for w in WORKLOADS}
+    if unknown:
+        raise ValueError(f"Workloads desconhecidos: {', '.join(sorted(unknown))}")
+
+    results: dict[str, dict[str, float]] = {}
+    with offline_environment() as environment:
+        for workload in selected:
+            operations = max(1, int(workload.operations * scale))
+            best = float("inf")
+            for _ in range(repeat):
+                # Cada repetição parte de caches frios para medir o mesmo trabalho.
+                ephemeris.clear_chart_caches()
+                started = timer.perf_counter()
+                workload.run(operations)
+                best = min(best, timer.perf_counter() - started)
+            results[workload.name] = {
+                "operations": operations,
+                "seconds": round(best, 6),
+                "ops_per_sec": round(operations / best, 3),
+            }
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "swisseph": swe.version,
+            "bodies": environment["bodies"],
+        },
+        "results": results,
+    }
+
+
+def compare_with_baseline(
+    current: dict[str, object],
+    baseline: dict[str, object],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[str]:
+    """Retorna as regressões: workloads cuja vazão caiu mais que ``threshold``.
+
+    Workload sem entrada no baseline também falha: sem referência, não há gate.
+    """
+    if not 0 < threshold < 1:
+        raise ValueError("threshold deve estar no intervalo (0, 1)")
+    if current["meta"]["bodies"] != baseline["meta"]["bodies"]:
+        return [
+            "Conjunto de corpos difere do baseline "
+            f"({len(current['meta']['bodies'])} vs {len(baseline['meta']['bodies'])}); "
+            "regrave o baseline neste ambiente."
+        ]
+    regressions = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            regressions.append(f"{name}: sem entrada no baseline; regrave com --update-baseline.")
+            continue
+        floor = reference["ops_per_sec"] * (1 - threshold)
+        if result["ops_per_sec"] < floor:
+            drop = 1 - result["ops_per_sec"] / reference["ops_per_sec"]
+            regressions.append(
+                f"{name}: {result['ops_per_sec']:.1f} ops/s "
+                f"(baseline {reference['ops_per_sec']:.1f}, queda de {drop:.0%})"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=float(os.getenv("ASTRO_BENCH_THRESHOLD", DEFAULT_THRESHOLD)),
+        help="Queda máxima de vazão tolerada (0.25 = 25%%).",
+    )
+    parser.add_argument("--only", nargs="+", metavar="WORKLOAD")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Grava os resultados atuais em JSON.")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    current = run_workloads(args.only, scale=args.scale, repeat=args.repeat)
+    for name, result in current["results"].items():
+        print(f"{name:24} {result['ops_per_sec']:>14.1f} ops/s  ({result['seconds']:.3f}s)")
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2, ensure_ascii=False) + "\n")
+    if args.update_baseline:
+        if args.only and args.baseline.exists():
+            # Com --only, os demais workloads do baseline são mantidos.
+            previous = json.loads(args.baseline.read_text())
+            if previous["meta"]["bodies"] == current["meta"]["bodies"]:
+                current = {**current, "results": {**previous["results"], **current["results"]}}
+        args.baseline.write_text(json.dumps(current, indent=2, ensure_ascii=False) + "\n")
+        print(f"Baseline gravado em {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"Baseline {args.baseline} não encontrado; use --update-baseline.")
+        return 1
+
+    regressions = compare_with_baseline(
+        current, json.loads(args.baseline.read_text()), args.threshold
+    )
+    for regression in regressions:
+        print(f"REGRESSÃO {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import pytest
+
+from app.astro import ephemeris
+from app.core.config import settings
+from app.utils import rate_limit
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limit():
+    # Todas as requisições do TestClient vêm do mesmo host ("testclient"); sem
+    # limpar o log, a soma dos testes estoura o limite por minuto.
+    rate_limit._request_log.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def live_mode_by_default(monkeypatch):
+    # Cada teste começa sem ASTRO_MOCK_MODE, venha ele do shell (lido também
+    # pelo settings na importação) ou de outro teste; quem precisa de mock liga
+    # com monkeypatch.setenv.
+    monkeypatch.delenv("ASTRO_MOCK_MODE", raising=False)
+    monkeypatch.setattr(settings, "mock_mode", False)
+
+
+PLACES = {
+    "London": (51.5074, -0.1278, "London"),
+    "Lisboa": (38.7223, -9.1393, "Lisboa"),
+    "Tokyo": (35.6762, 139.6503, "Tokyo"),
+    "New York": (40.7128, -74.0060, "New York"),
+}
+
+
+@pytest.fixture
+def live_chart(monkeypatch):
+    # Mapa ao vivo sem rede: o geocoding sai de PLACES e os caches de estágio
+    # são limpos antes e depois, para nada vazar entre testes.
+    def fake_geocode(place):
+        if place not in PLACES:
+            raise ValueError("Não foi possível encontrar o local informado.")
+        return PLACES[place]
+
+    monkeypatch.setattr("app.astro.ephemeris.geocode_place", fake_geocode)
+    ephemeris.clear_chart_caches()
+    yield
+    ephemeris.clear_chart_caches()
+
+
+@pytest.fixture
+def fake_sky(live_chart, monkeypatch):
+    # Posições determinísticas no lugar do Swiss Ephemeris; devolve a lista dos
+    # corpos pedidos a swe.calc_ut, na ordem das chamadas.
+    calls = []
+
+    def fake_calc_ut(jd_ut, body, *_args):
+        calls.append(body)
+        return (float(body * 25 % 360), 0.0, 1.0, 1.0, 0.0, 0.0), 0
+
+    monkeypatch.setattr("app.astro.ephemeris.swe.calc_ut", fake_calc_ut)
+    return calls
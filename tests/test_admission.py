@@ -0,0 +1,120 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils import admission
+from app.utils.admission import AdmissionController, Overloaded
+
+
+def _busy(controller: AdmissionController, latency_ms: float) -> AdmissionController:
+    for _ in range(20):
+        controller.monitor.record(latency_ms)
+    controller.in_flight = controller.max_concurrency
+    return controller
+
+
+def test_rejects_when_live_p95_exceeds_queue_deadline() -> None:
+    controller = _busy(AdmissionController("chart", 2, queue_deadline_seconds=1.0), 3000)
+
+    # Com as 2 vagas ocupadas e p95 de 3s, o primeiro da fila esperaria ~1.5s.
+    assert controller.estimated_wait(1) == pytest.approx(1.5)
+    with pytest.raises(Overloaded) as excinfo:
+        asyncio.run(controller.acquire())
+    assert excinfo.value.retry_after == 2
+    assert controller.rejected == 1 and controller.stats()["queued"] == 0
+
+
+def test_queued_request_gets_released_slot_or_times_out() -> None:
+    async def scenario() -> None:
+        controller = AdmissionController("lookup", 1, queue_deadline_seconds=0.2)
+        await controller.acquire()
+        waiting = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0.01)
+        assert controller.stats()["queued"] == 1
+        controller.release(0.01)
+        await waiting
+        assert controller.in_flight == 1 and controller.stats()["queued"] == 0
+
+        with pytest.raises(Overloaded):
+            await controller.acquire()
+        assert controller.in_flight == 1 and controller.stats()["queued"] == 0
+        controller.release(0.01)
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_middleware_sheds_heavy_routes_with_retry_after(monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "true")
+    busy = _busy(AdmissionController("chart", 1, queue_deadline_seconds=0.5), 3000)
+    monkeypatch.setitem(admission.CONTROLLERS, "chart", busy)
+    client = TestClient(app)
+
+    shed = client.post(
+        "/v1/chart/natal",
+        json={
+            "full_name": "Ada",
+            "birth_date": "1815-12-10",
+            "birth_time": "10:00",
+            "birth_place": "London",
+        },
+    )
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == "3"
+
+    # Lunação e horas planetárias fazem buscas pesadas: entram na classe ``chart``.
+    lunation = client.post("/v1/lunation", json={"reference_date": "2025-05-10"})
+    assert lunation.status_code == 503
+    lookup = client.get("/v1/chart/cache-stats")
+    assert lookup.status_code == 200
+    stats = client.get("/health/admission").json()
+    assert stats["chart"]["rejected"] == 2
+    assert stats["lookup"]["in_flight"] == 0
+
+
+def test_client_disconnect_before_body_releases_the_slot(monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "true")
+    monkeypatch.setitem(
+        admission.CONTROLLERS, "chart", AdmissionController("chart", 2, queue_deadline_seconds=0.5)
+    )
+    body = json.dumps(
+        {"full_name": "Ada", "birth_date": "1815-12-10", "birth_time": "10:00", "birth_place": "London"}
+    ).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/v1/chart/natal",
+        "raw_path": b"/v1/chart/natal",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), (b"host", b"testserver")],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+
+    async def send(message):
+        raise OSError("cliente desconectou")
+
+    async def post() -> None:
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive():
+            # Depois do corpo, o servidor só avisaria da desconexão; aqui, nunca.
+            if messages:
+                return messages.pop()
+            await asyncio.Event().wait()
+
+        await app(scope, receive, send)
+
+    for _ in range(3):
+        with pytest.raises(OSError):
+            asyncio.run(post())
+
+    stats = TestClient(app).get("/health/admission").json()["chart"]
+    assert stats["in_flight"] == 0 and stats["admitted"] == 3
@@ -0,0 +1,53 @@
+from datetime import date, datetime, time
+
+import swisseph as swe
+from fastapi.testclient import TestClient
+
+from app.api.models import AstrocartographyRequest
+from app.astro.astrocartography import calculate_astrocartography
+from app.astro.ephemeris import _julian_day
+from app.main import app
+
+
+def test_sun_lines_match_house_angles(monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "true")
+    chart = calculate_astrocartography(
+        AstrocartographyRequest(
+            full_name="Test",
+            birth_date=date(1990, 5, 1),
+            birth_time=time(12, 0),
+            birth_place="Greenwich",
+            bodies=["Sun"],
+        )
+    )
+    jd_ut = _julian_day(datetime(1990, 5, 1, 12))
+    sun = swe.calc_ut(jd_ut, swe.SUN)[0][0]
+
+    lines = {line.angle: line for line in chart.lines}
+    assert set(lines) == {"ASC", "DSC", "MC", "IC"}
+    for angle, index in (("ASC", 0), ("MC", 1)):
+        for lon, lat in lines[angle].segments[0][::10]:
+            if abs(lat) > 60:
+                continue
+            _, ascmc = swe.houses(jd_ut, lat, lon, b"P")
+            assert abs((ascmc[index] - sun + 180) % 360 - 180) < 0.05
+
+
+def test_astrocartography_endpoint_rejects_unknown_body(monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "true")
+    client = TestClient(app)
+    payload = {
+        "full_name": "Ada Lovelace",
+        "birth_date": "1815-12-10",
+        "birth_time": "10:00",
+        "birth_place": "London, UK",
+        "bodies": ["Sun", "Vulcan"],
+        "latitude_step": 2,
+    }
+    response = client.post("/v1/chart/astrocartography", json=payload)
+    assert response.status_code == 400
+
+    payload["bodies"] = ["Sun", "Moon"]
+    data = client.post("/v1/chart/astrocartography", json=payload).json()
+    assert len(data["lines"]) == 8
+    assert all(len(point) == 2 for line in data["lines"] for point in line["segments"][0])
@@ -0,0 +1,44 @@
+import json
+from pathlib import Path
+
+from benchmarks.run import WORKLOADS, compare_with_baseline, run_workloads
+
+
+def _result(ops_per_sec: float) -> dict[str, object]:
+    return {
+        "meta": {"bodies": ["Sun", "Moon"]},
+        "results": {"single_chart": {"operations": 10, "seconds": 1.0, "ops_per_sec": ops_per_sec}},
+    }
+
+
+def test_compare_with_baseline_flags_throughput_drop() -> None:
+    assert compare_with_baseline(_result(80.0), _result(100.0), threshold=0.25) == []
+
+    regressions = compare_with_baseline(_result(70.0), _result(100.0), threshold=0.25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("single_chart")
+
+
+def test_compare_with_baseline_fails_without_entry() -> None:
+    current = _result(100.0)
+    current["results"]["single_chart_fast"] = current["results"]["single_chart"]
+
+    regressions = compare_with_baseline(current, _result(100.0), threshold=0.25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("single_chart_fast") and "baseline" in regressions[0]
+
+
+def test_committed_baseline_covers_every_workload() -> None:
+    baseline = json.loads(Path(__file__).parents[1].joinpath("benchmarks", "baseline.json").read_text())
+
+    assert set(baseline["results"]) == {workload.name for workload in WORKLOADS}
+
+
+def test_run_workloads_executes_offline() -> None:
+    report = run_workloads(["single_chart", "to_sign_position"], scale=0.01, repeat=1)
+
+    assert set(report["results"]) == {"single_chart", "to_sign_position"}
+    assert report["results"]["single_chart"]["operations"] == 5
+    assert "Sun" in report["meta"]["bodies"]
@@ -0,0 +1,130 @@
+import csv
+import json
+
+import pytest
+
+from app.astro import bulk_export
+from app.astro.bulk_export import export_charts, main, resume_offset
+
+RECORDS = [
+    {
+        "full_name": f"Pessoa {index}",
+        "birth_date": f"19{60 + index}-05-17",
+        "birth_time": "14:30",
+        "birth_place": place,
+    }
+    for index, place in enumerate(["London", "Paris", "Tokyo", "London", "Lisboa"] * 4)
+]
+
+
+@pytest.fixture
+def records_csv(tmp_path, monkeypatch):
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "synthetic")
+    path = tmp_path / "records.csv"
+    with path.open("w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=[*RECORDS[0], "orb_conjunction", "bodies"])
+        writer.writeheader()
+        writer.writerows(RECORDS)
+        writer.writerow({**RECORDS[0], "birth_date": "1990-13-01"})
+        writer.writerow({**RECORDS[1], "orb_conjunction": "2", "bodies": "Sun,Moon"})
+    return path
+
+
+def test_export_ndjson_captures_row_errors(records_csv, tmp_path) -> None:
+    output = tmp_path / "charts.ndjson"
+    stats = export_charts(records_csv, output, workers=1, chunk_size=7)
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [line["row"] for line in lines] == list(range(len(RECORDS) + 2))
+    assert stats.records == len(RECORDS) + 2 and stats.errors == 1
+    assert "birth_date" in lines[len(RECORDS)]["error"]
+    custom = lines[-1]["chart"]
+    assert [planet["name"] for planet in custom["planets"]] == ["Sun", "Moon"]
+    assert lines[0]["chart"]["metadata"]["full_name"] == "Pessoa 0"
+
+
+def test_export_csv_resumes_after_interruption(records_csv, tmp_path) -> None:
+    full = tmp_path / "full.csv"
+    export_charts(records_csv, full, workers=1, chunk_size=5)
+    partial = tmp_path / "partial.csv"
+    # Processo interrompido no meio de uma linha.
+    partial.write_bytes(full.read_bytes()[: len(full.read_bytes()) // 2])
+
+    stats = export_charts(records_csv, partial, workers=1, chunk_size=5, resume=True)
+
+    assert stats.offset > 0
+    assert stats.records == len(RECORDS) + 2 - stats.offset
+    assert partial.read_bytes() == full.read_bytes()
+    rows = list(csv.DictReader(full.open()))
+    assert rows[0]["Sun_sign"] and rows[0]["Sun_house"]
+    assert rows[len(RECORDS)]["error"]
+
+
+def test_process_pool_matches_in_process_output(records_csv, tmp_path, capsys) -> None:
+    single = tmp_path / "single.ndjson"
+    pooled = tmp_path / "pooled.ndjson"
+    export_charts(records_csv, single, workers=1)
+
+    assert main([str(records_csv), str(pooled), "--workers", "2", "--chunk-size", "4"]) == 0
+
+    assert pooled.read_text() == single.read_text()
+    assert "registros/s" in capsys.readouterr().err
+
+
+def test_resume_reads_only_the_tail_of_the_output(records_csv, tmp_path, monkeypatch) -> None:
+    full = tmp_path / "full.ndjson"
+    export_charts(records_csv, full, workers=1)
+    data = full.read_bytes()
+    # Blocos menores que uma linha: a busca pelo último "\n" atravessa vários.
+    monkeypatch.setattr(bulk_export, "_TAIL_BLOCK", 16)
+
+    partial = tmp_path / "partial.ndjson"
+    cut = data.index(b"\n", len(data) // 2) + 40
+    partial.write_bytes(data[:cut])
+    complete = data.rfind(b"\n", 0, cut) + 1
+    last_row = json.loads(data[data.rfind(b"\n", 0, complete - 1) + 1 : complete])["row"]
+    assert resume_offset(partial, "ndjson") == last_row + 1
+    assert partial.read_bytes() == data[:complete]
+
+    # Linha completa no fim: nada é truncado.
+    assert resume_offset(full, "ndjson") == len(RECORDS) + 2
+    assert full.read_bytes() == data
+
+
+def test_resume_edge_cases(tmp_path) -> None:
+    assert resume_offset(tmp_path / "missing.csv", "csv") == 0
+    empty = tmp_path / "empty.ndjson"
+    empty.write_bytes(b"")
+    assert resume_offset(empty, "ndjson") == 0
+
+    header_only = tmp_path / "header.csv"
+    header_only.write_bytes(b"row,error,full_name\n")
+    assert resume_offset(header_only, "csv") == 0
+    assert header_only.read_bytes() == b"row,error,full_name\n"
+
+    # Interrompido ainda no cabeçalho: o arquivo volta a ficar vazio.
+    torn_header = tmp_path / "torn.csv"
+    torn_header.write_bytes(b"row,err")
+    assert resume_offset(torn_header, "csv") == 0
+    assert torn_header.read_bytes() == b""
+
+    single_line = tmp_path / "single.ndjson"
+    single_line.write_bytes(b'{"row": 0, "error": "x"}\n{"row": 1, "err')
+    assert resume_offset(single_line, "ndjson") == 1
+
+
+def test_export_of_empty_input_writes_only_the_header(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "synthetic")
+    source = tmp_path / "empty.csv"
+    source.write_text("full_name,birth_date,birth_time,birth_place\n")
+    output = tmp_path / "charts.csv"
+
+    stats = export_charts(source, output, workers=1)
+
+    assert stats.records == 0 and stats.records_per_second == 0.0
+    assert output.read_text().splitlines()[0].startswith("row,error")
+    assert len(output.read_text().splitlines()) == 1
+    empty_ndjson = tmp_path / "empty.ndjson"
+    empty_ndjson.write_text("")
+    assert export_charts(empty_ndjson, tmp_path / "charts.ndjson", workers=1).records == 0
+    assert (tmp_path / "charts.ndjson").read_text() == ""
@@ -1,12 +1,12 @@
-import os
-
 from fastapi.testclient import TestClient
 
+from app.api.models import NatalChartRequest
+from app.astro import ephemeris
 from app.main import app
 
 
-def test_natal_chart_mock() -> None:
-    os.environ["ASTRO_MOCK_MODE"] = "true"
+def test_natal_chart_mock(monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "true")
 
     client = TestClient(app)
     payload = {
@@ -20,3 +20,46 @@ def test_natal_chart_mock() -> None:
     data = response.json()
     assert data["metadata"]["full_name"] == "Ada Lovelace"
     assert data["metadata"]["ephemeris_flags"] == ["MOCK_MODE"]
+
+
+def test_natal_chart_synthetic_mock_is_deterministic(monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "synthetic")
+
+    client = TestClient(app)
+    payload = {
+        "full_name": "Ada Lovelace",
+        "birth_date": "1815-12-10",
+        "birth_time": "10:00",
+        "birth_place": "London, UK",
+    }
+    first = client.post("/v1/chart/natal", json=payload).json()
+    second = client.post("/v1/chart/natal", json=payload).json()
+    other = client.post("/v1/chart/natal", json={**payload, "birth_time": "22:00"}).json()
+
+    assert first == second
+    assert first != other
+    assert first["metadata"]["ephemeris_flags"] == ["MOCK_MODE", "SYNTHETIC"]
+    assert len(first["planets"]) == 12
+    assert len(first["houses"]) == 12
+    assert first["aspects"]
+    sun = next(planet for planet in first["planets"] if planet["name"] == "Sun")
+    assert sun["sign"] == "Sagitário"
+
+
+def test_synthetic_chart_honors_house_system_and_ignores_name(monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "synthetic")
+    payload = NatalChartRequest(
+        full_name="Ada Lovelace", birth_date="1815-12-10", birth_time="10:00", birth_place="London"
+    )
+
+    chart = ephemeris.compute_chart(payload)
+    renamed = ephemeris.compute_chart(payload.model_copy(update={"full_name": "Augusta King"}))
+    whole_sign = ephemeris.compute_chart(payload.model_copy(update={"house_system": "W"}))
+
+    assert renamed == chart and renamed is not chart
+    assert whole_sign.bodies == chart.bodies and whole_sign.aspects == chart.aspects
+    assert whole_sign.houses.cusps[0] % 30 == 0 and chart.houses.cusps[0] % 30 != 0
+    assert chart.houses.cusps[0] == chart.houses.asc and chart.houses.vertex is not None
+    orbs = payload.aspects.orbs.model_dump()
+    assert all(aspect.orb <= orbs[aspect.type] for aspect in chart.aspects)
+    assert ephemeris.chart_cache_stats()["stages"].keys() == set(ephemeris.CHART_STAGES)
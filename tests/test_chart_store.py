@@ -0,0 +1,111 @@
+import sqlite3
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.models import NatalChartRequest
+from app.astro.chart_store import ChartNotFound, ChartStore, get_chart_store
+from app.astro.ephemeris import calculate_natal_chart
+from app.astro.interpretations import init_interpretations_store
+from app.core.config import settings
+from app.main import app
+
+PAYLOAD = {
+    "full_name": "Ada Lovelace",
+    "birth_date": "1815-12-10",
+    "birth_time": "10:00",
+    "birth_place": "London",
+}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "true")
+    monkeypatch.setattr(settings, "chart_store_path", str(tmp_path / "charts.db"))
+    monkeypatch.setattr(settings, "interpretations_db_path", str(tmp_path / "interpretations.db"))
+    init_interpretations_store()
+    get_chart_store.cache_clear()
+    yield TestClient(app)
+    get_chart_store.cache_clear()
+
+
+def test_store_round_trip_and_expiry(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "true")
+    payload = NatalChartRequest(**PAYLOAD)
+    chart = calculate_natal_chart(payload)
+    store = ChartStore(tmp_path / "charts.db", ttl_seconds=60, cache_size=4)
+    chart_id = store.put(payload, chart)
+    assert chart_id == store.chart_id(payload)
+
+    # Uma instância nova lê do SQLite, sem o LRU.
+    reopened = ChartStore(tmp_path / "charts.db", ttl_seconds=60, cache_size=4)
+    assert reopened.get(chart_id).chart == chart
+    assert reopened.get(chart_id).request == payload
+
+    expired = ChartStore(tmp_path / "expired.db", ttl_seconds=0, cache_size=4)
+    expired_id = expired.put(payload, chart)
+    time.sleep(0.01)
+    with pytest.raises(ChartNotFound):
+        expired.get(expired_id)
+
+
+def test_chart_id_skips_natal_recomputation(client, monkeypatch) -> None:
+    stored = client.post("/v1/chart/natal?store=true", json=PAYLOAD)
+    assert stored.status_code == 200
+    chart_id = stored.json()["chart_id"]
+    assert chart_id
+    assert client.post("/v1/chart/natal", json=PAYLOAD).json()["chart_id"] is None
+
+    def fail(_):
+        raise AssertionError("mapa natal recalculado")
+
+    monkeypatch.setattr("app.astro.ephemeris.calculate_natal_chart", fail)
+    report = client.post("/v1/report/doc", json={"chart_id": chart_id})
+    assert report.status_code == 200
+    assert "Ada Lovelace" in report.text
+    ai = client.post("/v1/interpretation/ai", json={"chart_id": chart_id, "focus": "career"})
+    assert ai.status_code == 200
+    assert ai.json()["focus"] == "career"
+
+
+def test_chart_id_requests_match_full_payloads(client) -> None:
+    chart_id = client.post("/v1/chart/natal?store=true", json=PAYLOAD).json()["chart_id"]
+    by_id = client.post("/v1/chart/progression", json={"chart_id": chart_id, "target_date": "1840-01-01"})
+    full = client.post("/v1/chart/progression", json={**PAYLOAD, "target_date": "1840-01-01"})
+    assert by_id.status_code == 200
+    assert by_id.json() == full.json()
+    assert by_id.headers["etag"] == full.headers["etag"]
+
+    solar = client.post("/v1/chart/solar-return", json={"chart_id": chart_id, "target_year": 1830})
+    assert solar.status_code == 200
+
+    missing = client.post("/v1/report/doc", json={"chart_id": "desconhecido"})
+    assert missing.status_code == 404
+
+
+def test_conditional_store_refreshes_or_recreates_the_entry(client, tmp_path) -> None:
+    first = client.post("/v1/chart/natal?store=true", json=PAYLOAD)
+    chart_id, etag = first.json()["chart_id"], first.headers["etag"]
+    database = tmp_path / "charts.db"
+
+    def expires_at() -> float:
+        with sqlite3.connect(database) as connection:
+            return connection.execute("SELECT expires_at FROM charts WHERE id = ?", (chart_id,)).fetchone()[0]
+
+    # Guardado e válido: 304, com o TTL renovado.
+    before = expires_at()
+    time.sleep(0.01)
+    cached = client.post("/v1/chart/natal?store=true", json=PAYLOAD, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert expires_at() > before
+
+    # Expirado: o If-None-Match não basta, o mapa é calculado e guardado de novo.
+    with sqlite3.connect(database) as connection:
+        connection.execute("UPDATE charts SET expires_at = 0 WHERE id = ?", (chart_id,))
+    refreshed = client.post("/v1/chart/natal?store=true", json=PAYLOAD, headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["chart_id"] == chart_id
+    assert expires_at() > time.time()
+    report = client.post("/v1/report/doc", json={"chart_id": chart_id})
+    assert report.status_code == 200
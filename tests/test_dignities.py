@@ -0,0 +1,61 @@
+from app.api.models import NatalChartRequest
+from app.astro import dignities
+from app.astro.dignities import DAY, NIGHT, UNKNOWN_SECT, dignity_labels, dignity_masks
+from app.astro.ephemeris import calculate_natal_chart, compute_chart
+
+
+def _labels(name: str, longitude: float, sect: int = DAY) -> list[str] | None:
+    return dignity_labels(dignity_masks([name], [longitude], sect)[0])
+
+
+def test_classical_dignities_by_degree() -> None:
+    # Sol a 19° de Áries: exaltação, triplicidade de fogo (dia) e face de 10°-20°.
+    assert _labels("Sun", 19.0) == ["exaltation", "triplicity", "decan"]
+    assert _labels("Sun", 19.0, NIGHT) == ["exaltation", "decan"]
+    # Saturno a 27° de Câncer: detrimento e termo próprio.
+    # Marte a 24° de Câncer: queda e nenhuma dignidade (de dia).
+    assert _labels("Saturn", 117.0) == ["detriment", "term"]
+    assert _labels("Mars", 114.0) == ["fall", "peregrine"]
+    # Termos egípcios de Áries: Vênus 6°-12°, Mercúrio 12°-20°.
+    assert "term" in _labels("Venus", 11.99) and "term" not in _labels("Venus", 12.0)
+    # Sem seita conhecida, vale o regente noturno da água; face final de Peixes.
+    assert _labels("Mars", 359.99999, UNKNOWN_SECT) == ["triplicity", "decan"]
+    assert _labels("Uranus", 300.0) is None
+
+
+def test_tables_are_one_byte_per_degree() -> None:
+    assert set(dignities.TABLES) == {"Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn"}
+    for tables in dignities.TABLES.values():
+        assert [len(table) for table in tables] == [360, 360, 360]
+    # Cada grau de cada signo tem exatamente um regente de termo e um de face.
+    for degree in range(360):
+        masks = [tables[DAY][degree] for tables in dignities.TABLES.values()]
+        assert sum(bool(mask & dignities.TERM) for mask in masks) == 1
+        assert sum(bool(mask & dignities.DECAN) for mask in masks) == 1
+
+
+def test_natal_chart_fills_dignities(monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "synthetic")
+    payload = NatalChartRequest(
+        full_name="Ada",
+        birth_date="1990-05-17",
+        birth_time="14:30",
+        birth_place="London",
+        bodies=["Sun", "Moon", "Saturn", "Uranus"],
+    )
+    chart = compute_chart(payload)
+    planets = {planet.name: planet for planet in calculate_natal_chart(payload).planets}
+
+    assert len(chart.dignities) == len(chart.bodies.names)
+    assert planets["Saturn"].dignities == ["domicile"]
+    assert planets["Uranus"].dignities is None
+    assert all(planets[name].dignities for name in ("Sun", "Moon"))
+
+
+def test_dignities_at_the_zero_degree_boundary() -> None:
+    # 360° é 0° de Áries (exaltação do Sol, termo de Júpiter); logo antes é o fim de Peixes.
+    assert _labels("Sun", 360.0) == _labels("Sun", 0.0) == ["exaltation", "triplicity"]
+    assert "term" in _labels("Jupiter", 360.0)
+    assert _labels("Jupiter", -0.0001) == _labels("Jupiter", 359.9999)
+    assert "domicile" in _labels("Jupiter", 359.9999)
+    assert dignity_masks([], [], DAY) == b""
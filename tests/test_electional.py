@@ -0,0 +1,138 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.astro import electional, ephemeris
+from app.astro.ephemeris import ChartLocation
+from app.astro.events import build_event_index, load_event_index, write_event_index
+from app.core.config import settings
+from app.main import app
+from app.utils.intervals import complement, intersect
+from app.utils.signs import sign_index
+
+
+@pytest.fixture(scope="module")
+def event_index(tmp_path_factory):
+    path = tmp_path_factory.mktemp("events") / "index"
+    write_event_index(build_event_index(2024, 2025), path)
+    saved = settings.event_index_path
+    settings.event_index_path = str(path)
+    load_event_index.cache_clear()
+    yield load_event_index()
+    settings.event_index_path = saved
+    load_event_index.cache_clear()
+
+
+def test_interval_helpers() -> None:
+    assert intersect([(0, 5), (8, 12)], [(3, 9), (10, 20)]) == [(3, 5), (8, 9), (10, 12)]
+    assert complement([(1, 2), (4, 6)], 0, 5) == [(0, 1), (2, 4)]
+    assert complement([], 0, 5) == [(0, 5)]
+    assert sign_index("leo") == sign_index("Leão") == 4
+    with pytest.raises(ValueError):
+        sign_index("Ofiúco")
+
+
+def test_label_intervals_refine_transitions() -> None:
+    windows = electional._label_intervals(0.0, 10.0, 1.0, lambda jd: 2.3 <= jd < 7.6, True)
+    assert len(windows) == 1
+    start, end = windows[0]
+    assert abs(start - 2.3) < 1 / 1440 and abs(end - 7.6) < 1 / 1440
+
+
+def test_electional_search_intersects_constraints(event_index, monkeypatch) -> None:
+    monkeypatch.setattr(
+        ephemeris,
+        "_compute_location",
+        lambda place: ChartLocation(
+            latitude=-23.55, longitude=-46.63, place="São Paulo", timezone="America/Sao_Paulo"
+        ),
+    )
+    client = TestClient(app)
+    response = client.post(
+        "/v1/electional/search",
+        json={
+            "place": "Eleição São Paulo",
+            "start_date": "2024-03-25",
+            "end_date": "2024-04-30",
+            "constraints": [
+                {"type": "moon_not_void"},
+                {"type": "direct", "body": "Mercury"},
+                {"type": "asc_in_sign", "sign": "Leo"},
+            ],
+            "min_duration_minutes": 30,
+        },
+    )
+    assert response.status_code == 200
+    windows = response.json()["windows"]
+    assert windows
+    # Mercúrio retrógrado de 2024-04-01T22:14Z a 2024-04-25T12:54Z.
+    assert all(
+        window["end"] <= "2024-04-01T22:15" or window["start"] >= "2024-04-25T12:53"
+        for window in windows
+    )
+    assert all(30 <= window["duration_minutes"] <= 110 for window in windows)
+    assert windows[0]["local_start"].endswith("-03:00")
+
+    out_of_range = client.post(
+        "/v1/electional/search",
+        json={
+            "place": "Eleição São Paulo",
+            "start_date": "2030-01-01",
+            "end_date": "2030-01-05",
+            "constraints": [{"type": "moon_not_void"}],
+        },
+    )
+    assert out_of_range.status_code == 400
+
+
+def _assert_same_windows(exact, sampled) -> None:
+    assert len(exact) == len(sampled)
+    for (start, end), (sampled_start, sampled_end) in zip(exact, sampled):
+        assert abs(start - sampled_start) < 1 / 1440 and abs(end - sampled_end) < 1 / 1440
+
+
+@pytest.mark.parametrize("latitude", [-23.55, 0.0, 51.5, 64.0])
+def test_asc_sign_changes_match_sampling(latitude) -> None:
+    start, end = 2460400.5, 2460403.5
+    location = ChartLocation(latitude=latitude, longitude=-46.63, place="x", timezone="UTC")
+    sky = electional._Sky(location, start)
+    changes = electional._asc_changes(sky, start, end)
+    assert changes and all(start < jd < end for jd, _ in changes)
+    for wanted in (0, 4, 11):
+        exact = electional._sign_intervals(start, end, electional._asc_sign(sky, start), changes, wanted)
+        sampled = electional._label_intervals(
+            start, end, 10 / 1440, lambda jd: electional._asc_sign(sky, jd), wanted
+        )
+        _assert_same_windows(exact, sampled)
+
+    # Acima do círculo polar há signos que não nascem: fica a amostragem.
+    polar = ChartLocation(latitude=70.0, longitude=0.0, place="x", timezone="UTC")
+    assert electional._asc_changes(electional._Sky(polar, start), start, end) is None
+
+
+def test_body_in_sign_uses_ingress_index(event_index, monkeypatch) -> None:
+    mercury = ephemeris.BODY_REGISTRY["Mercury"]
+    location = ChartLocation(latitude=51.5, longitude=0.0, place="London", timezone="UTC")
+    sky = electional._Sky(location, 2460310.5)
+    # Janeiro a março de 2024: Mercúrio entra em Áries em 10/03.
+    start, end = 2460310.5, 2460400.5
+    assert electional._ingress_changes(mercury, start, end)
+
+    sampled = electional._label_intervals(
+        start, end, 0.25, lambda jd: int(sky.position(jd, mercury)[0] // 30), sign_index("Aries")
+    )
+    constraint = electional.ElectionalConstraint(type="body_in_sign", body="Mercury", sign="Aries")
+    monkeypatch.setattr(electional, "_label_intervals", None)  # nada de amostragem
+    _assert_same_windows(electional._constraint_intervals(constraint, sky, b"P", start, end), sampled)
+
+    # Fora da cobertura do índice (ou corpo não indexado) volta para a amostragem.
+    assert electional._ingress_changes(mercury, 2470000.5, 2470001.5) is None
+    assert electional._ingress_changes(ephemeris.BODY_REGISTRY["Chiron"], start, end) is None
+
+
+def test_electional_search_requires_constraints() -> None:
+    client = TestClient(app)
+    response = client.post(
+        "/v1/electional/search",
+        json={"place": "London", "start_date": "2024-03-25", "end_date": "2024-03-26", "constraints": []},
+    )
+    assert response.status_code == 422
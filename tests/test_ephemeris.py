@@ -1,8 +1,22 @@
-from datetime import datetime
+import json
+from datetime import date, datetime, time
 from zoneinfo import ZoneInfo
 
+from fastapi.testclient import TestClient
+import pytest
+
+from app.api.models import NatalChartRequest
+from app.astro import ephemeris
 from app.astro.ephemeris import _setup_ephemeris
 from app.astro.timezone import local_to_utc
+from app.main import app
+
+BASE = {
+    "full_name": "Test",
+    "birth_date": date(2024, 1, 15),
+    "birth_time": time(12, 0),
+    "birth_place": "London",
+}
 
 
 def test_tropical_does_not_set_sidereal(monkeypatch) -> None:
@@ -25,3 +39,102 @@ def test_local_to_utc_known_timezone() -> None:
     utc_dt = local_to_utc(local_dt, "Europe/London")
 
     assert utc_dt == datetime(2024, 1, 15, 12, 0, 0, tzinfo=ZoneInfo("UTC"))
+
+
+def test_sky_snapshot_shared_across_locations(fake_sky) -> None:
+    places = ["London", "Lisboa"]
+    charts = [
+        ephemeris.calculate_natal_chart(NatalChartRequest(**{**BASE, "birth_place": place}))
+        for place in places
+    ]
+
+    assert len(fake_sky) == len(ephemeris.PLANETS)
+    assert [p.longitude for p in charts[0].planets] == [p.longitude for p in charts[1].planets]
+    assert charts[0].houses != charts[1].houses
+    assert ephemeris.chart_cache_stats()["stages"]["bodies"]["hits"] == 1
+
+
+def test_chart_stages_recompute_only_changed_inputs(fake_sky) -> None:
+    first = ephemeris.calculate_natal_chart(NatalChartRequest(**BASE))
+    tight = ephemeris.calculate_natal_chart(
+        NatalChartRequest(**BASE, aspects={"orbs": {"conjunction": 1}})
+    )
+    ephemeris.calculate_natal_chart(NatalChartRequest(**BASE, house_system="W"))
+
+    stages = ephemeris.chart_cache_stats()["stages"]
+    assert len(tight.aspects) <= len(first.aspects)
+    assert stages["aspects"]["misses"] == 2 and stages["aspects"]["hits"] == 1
+    assert stages["houses"]["misses"] == 2 and stages["placement"]["misses"] == 2
+    assert stages["bodies"]["misses"] == 1 and stages["bodies"]["hits"] == 2
+    assert stages["location"]["hit_ratio"] == round(2 / 3, 4)
+
+
+def test_compact_chart_shares_stage_arrays(fake_sky) -> None:
+    payload = NatalChartRequest(**BASE)
+    chart = ephemeris.compute_chart(payload)
+    other = ephemeris.compute_chart(payload.model_copy(update={"house_system": "W"}))
+
+    assert not hasattr(chart, "__dict__")
+    assert chart.bodies is other.bodies
+    assert chart.bodies.longitudes.typecode == "d" and len(chart.placement) == len(ephemeris.PLANETS)
+    response = ephemeris.chart_response(chart, payload)
+    assert response == ephemeris.calculate_natal_chart(payload)
+    assert [planet.house for planet in response.planets] == list(chart.placement)
+
+
+def test_relocation_streams_charts_reusing_body_positions(fake_sky) -> None:
+    response = TestClient(app).post(
+        "/v1/chart/relocation",
+        json={
+            "full_name": "Test",
+            "birth_date": "2024-01-15",
+            "birth_time": "12:00",
+            "birth_place": "London",
+            "locations": ["Tokyo", "Atlantis", "New York", " Tokyo "],
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    entries = [json.loads(line) for line in response.text.splitlines()]
+    assert [entry["place"] for entry in entries] == ["Tokyo", "Atlantis", "New York", " Tokyo "]
+    assert entries[1]["chart"] is None and entries[1]["error"]
+    tokyo, new_york = entries[0]["chart"], entries[2]["chart"]
+    assert tokyo["metadata"]["utc_datetime"] == new_york["metadata"]["utc_datetime"]
+    assert tokyo["metadata"]["birth_time"] == "21:00:00"
+    assert tokyo["planets"][0]["longitude"] == new_york["planets"][0]["longitude"]
+    assert tokyo["houses"] != new_york["houses"]
+    assert len(fake_sky) == len(ephemeris.PLANETS)
+    stages = ephemeris.chart_cache_stats()["stages"]
+    assert stages["bodies"]["misses"] == 1 and stages["houses"]["misses"] == 2
+
+
+def test_requested_bodies_include_optional_points_and_asteroids(
+    fake_sky, monkeypatch, tmp_path
+) -> None:
+    monkeypatch.setenv("ASTRO_EPHEMERIS_PATH", str(tmp_path))
+    monkeypatch.setattr("app.astro.ephemeris.swe.set_ephe_path", lambda path: None)
+    (tmp_path / "ast0").mkdir()
+    (tmp_path / "ast0" / "se00433s.se1").write_bytes(b"")
+
+    def chart(bodies):
+        return ephemeris.calculate_natal_chart(NatalChartRequest(**BASE, bodies=bodies))
+
+    result = chart(["Sun", "Lilith", "Mean Node", "Ceres", "433"])
+    assert [planet.name for planet in result.planets] == [
+        "Sun",
+        "Lilith",
+        "Mean Node",
+        "Ceres",
+        "Asteroid 433",
+    ]
+    assert sorted(fake_sky) == sorted([0, 12, 10, 17, 10433])
+
+    with pytest.raises(ValueError, match="asteroide 1862"):
+        chart(["Sun", "Asteroid 1862"])
+    # A ausência não fica em cache: o arquivo instalado depois já é encontrado.
+    (tmp_path / "ast1").mkdir()
+    (tmp_path / "ast1" / "se01862.se1").write_bytes(b"")
+    assert chart(["Sun", "Asteroid 1862"]).planets[-1].name == "Asteroid 1862"
+    with pytest.raises(ValueError, match="Vulcan"):
+        chart(["Vulcan"])
@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+import random
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.api.models import EphemerisTableRequest
+from app.astro import ephemeris_table as table
+from app.main import app
+from app.utils.signs import SIGNS, to_sign_position, to_sign_positions
+
+
+def test_batch_sign_conversion_matches_scalar() -> None:
+    rng = random.Random(7)
+    degrees = [rng.uniform(-720, 720) for _ in range(2000)]
+    degrees += [0.0, 29.999999, 59.9999, 359.99999, 360.0, 12.5 / 60, 30.0, -0.0001, -0.0]
+    signs, whole, minutes = to_sign_positions(np.array(degrees))
+    for value, sign, degree, minute in zip(degrees, signs, whole, minutes):
+        position = to_sign_position(value)
+        assert (SIGNS[sign], degree, minute) == (position.sign, position.degree, position.minute), value
+
+
+def test_csv_table_streams_in_day_chunks(monkeypatch) -> None:
+    monkeypatch.setattr(table, "CHUNK_DAYS", 7)
+    payload = EphemerisTableRequest(
+        start_date="2024-03-25", end_date="2024-04-30", bodies=["Sun", "Mercury"], precision="fast"
+    )
+    chunks = list(table.ephemeris_table(payload))
+
+    assert len(chunks) == 6  # 37 dias em blocos de 7
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert len(rows) == 37 and rows[0]["date"] == "2024-03-25" and rows[-1]["date"] == "2024-04-30"
+    assert rows[0]["Sun_sign"] == "Áries"
+    # Mercúrio retrógrado de 1 a 25 de abril de 2024.
+    retrograde = [row["date"] for row in rows if row["Mercury_retrograde"] == "True"]
+    assert retrograde[0] == "2024-04-02" and retrograde[-1] == "2024-04-25"
+
+
+def test_endpoint_ndjson_and_errors(monkeypatch) -> None:
+    client = TestClient(app)
+    response = client.post(
+        "/v1/ephemeris/table",
+        json={"start_date": "2000-01-01", "end_date": "2000-01-03", "format": "ndjson", "precision": "fast"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["date"] for line in lines] == ["2000-01-01", "2000-01-02", "2000-01-03"]
+    # Sem bodies no nível fast: PLANETS sem o Chiron.
+    assert [body["name"] for body in lines[0]["bodies"]][-1] == "True Node"
+    assert lines[0]["bodies"][0]["sign"] == "Capricórnio"
+
+    rejected = client.post(
+        "/v1/ephemeris/table",
+        json={"start_date": "2000-01-01", "end_date": "2000-01-03", "bodies": ["Chiron"], "precision": "fast"},
+    )
+    assert rejected.status_code == 400
+    too_long = client.post(
+        "/v1/ephemeris/table", json={"start_date": "1800-01-01", "end_date": "2100-01-01"}
+    )
+    assert too_long.status_code == 422
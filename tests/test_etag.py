@@ -0,0 +1,68 @@
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.main import app
+from app.utils.etag import etag_matches, strong_etag
+
+PAYLOAD = {
+    "full_name": "Ada Lovelace",
+    "birth_date": "1815-12-10",
+    "birth_time": "10:00",
+    "birth_place": "London",
+}
+
+
+def test_etag_matching_follows_if_none_match_rules() -> None:
+    etag = strong_etag("natal", "v1", "{}")
+    assert etag.startswith('"') and etag == strong_etag("natal", "v1", "{}")
+    assert etag != strong_etag("natal", "v2", "{}")
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_natal_post_answers_304_without_computing(monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "true")
+    calls = []
+    compute = routes.calculate_natal_chart
+    monkeypatch.setattr(
+        routes, "calculate_natal_chart", lambda payload: calls.append(payload) or compute(payload)
+    )
+    client = TestClient(app)
+
+    first = client.post("/v1/chart/natal", json=PAYLOAD)
+    etag = first.headers["etag"]
+    revalidated = client.post("/v1/chart/natal", json=PAYLOAD, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag and revalidated.content == b""
+    assert len(calls) == 1
+
+    changed = client.post(
+        "/v1/chart/natal", json={**PAYLOAD, "house_system": "K"}, headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+
+
+def test_natal_get_redirects_to_canonical_query(monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "true")
+    client = TestClient(app)
+
+    redirect = client.get(
+        "/v1/chart/natal",
+        params={**PAYLOAD, "language": "pt-BR", "orb_square": 5},
+        follow_redirects=False,
+    )
+    assert redirect.status_code == 301
+    canonical = redirect.headers["location"]
+    assert canonical == (
+        "/v1/chart/natal?birth_date=1815-12-10&birth_place=London&birth_time=10:00:00"
+        "&full_name=Ada%20Lovelace&orb_square=5.0"
+    )
+
+    chart = client.get(canonical, follow_redirects=False)
+    assert chart.status_code == 200
+    assert chart.headers["cache-control"].startswith("public, max-age=")
+    assert chart.json()["metadata"]["full_name"] == "Ada Lovelace"
+    cached = client.get(canonical, headers={"If-None-Match": chart.headers["etag"]})
+    assert cached.status_code == 304
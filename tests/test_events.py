@@ -0,0 +1,66 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.astro.events import build_event_index, load_event_index, write_event_index
+from app.core.config import settings
+from app.main import app
+
+
+@pytest.fixture(scope="module")
+def event_index(tmp_path_factory):
+    path = tmp_path_factory.mktemp("events") / "index"
+    write_event_index(build_event_index(2024, 2025), path)
+    saved = settings.event_index_path
+    settings.event_index_path = str(path)
+    yield load_event_index()
+    settings.event_index_path = saved
+    load_event_index.cache_clear()
+
+
+def test_index_is_sorted_and_voc_periods_disjoint(event_index) -> None:
+    jd = event_index.jd
+    assert (jd[1:] >= jd[:-1]).all()
+    assert (event_index.voc_start < event_index.voc_end).all()
+    assert (event_index.voc_end[:-1] <= event_index.voc_start[1:]).all()
+
+
+def test_event_endpoints_query_ranges(event_index) -> None:
+    client = TestClient(app)
+
+    ingresses = client.post(
+        "/v1/events/ingresses",
+        json={"start_date": "2024-03-19", "end_date": "2024-03-21", "bodies": ["Sun"]},
+    ).json()["events"]
+    assert [(event["body"], event["sign"]) for event in ingresses] == [("Sun", "Áries")]
+    assert ingresses[0]["utc_datetime"].startswith("2024-03-20T03:0")
+
+    stations = client.post(
+        "/v1/events/stations",
+        json={"start_date": "2024-03-25", "end_date": "2024-04-30", "bodies": ["Mercury"]},
+    ).json()["events"]
+    assert [event["type"] for event in stations] == ["station_retrograde", "station_direct"]
+    assert stations[0]["utc_datetime"].startswith("2024-04-01T22:1")
+
+    periods = client.post(
+        "/v1/events/void-of-course", json={"start_date": "2024-03-01", "end_date": "2024-03-31"}
+    ).json()["periods"]
+    assert 12 <= len(periods) <= 15
+    assert all(period["start"] < period["end"] for period in periods)
+
+    response = client.post(
+        "/v1/events/ingresses", json={"start_date": "1990-01-01", "end_date": "1990-02-01"}
+    )
+    assert response.status_code == 400
+
+
+def test_event_queries_without_events_return_empty_lists(event_index) -> None:
+    client = TestClient(app)
+
+    # Plutão não troca de signo nem estaciona nesses três dias.
+    for kind in ("ingresses", "stations"):
+        response = client.post(
+            f"/v1/events/{kind}",
+            json={"start_date": "2024-06-01", "end_date": "2024-06-03", "bodies": ["Pluto"]},
+        )
+        assert response.status_code == 200
+        assert response.json()["events"] == []
@@ -0,0 +1,54 @@
+import numpy as np
+import swisseph as swe
+from fastapi.testclient import TestClient
+
+from app.astro.fixed_stars import (
+    _signed_separation,
+    angle_sidereal_times,
+    load_star_catalogue,
+    star_positions,
+)
+from app.main import app
+
+
+def test_catalogue_precessed_to_chart_epoch() -> None:
+    catalogue = load_star_catalogue()
+    regulus = catalogue.names.index("Regulus")
+
+    at_j2000 = star_positions(catalogue, swe.julday(2000, 1, 1, 12.0))[0][regulus]
+    a_century_earlier = star_positions(catalogue, swe.julday(1900, 1, 1, 12.0))[0][regulus]
+
+    assert abs(at_j2000 - 149.83) < 0.02
+    assert abs((at_j2000 - a_century_earlier) - 1.397) < 0.01
+
+
+def test_angle_sidereal_times_on_equator() -> None:
+    times = angle_sidereal_times(np.array([100.0]), np.array([0.0]), 0.0)
+    assert np.allclose(times, [[10.0, 190.0, 100.0, 280.0]])
+
+    circumpolar = angle_sidereal_times(np.array([100.0]), np.array([80.0]), 60.0)
+    assert np.isnan(circumpolar[0, :2]).all() and not np.isnan(circumpolar[0, 2:]).any()
+
+
+def test_separation_wraps_at_zero_degrees() -> None:
+    # Estrela a 359,5° e corpo a 0,3°: 0,8° de distância, não 359,2°.
+    separations = _signed_separation(np.array([0.3 - 359.5, 359.5 - 0.3, 0.0, 180.0]))
+    assert np.allclose(separations, [0.8, -0.8, 0.0, -180.0])
+    assert _signed_separation(np.array([])).size == 0
+
+
+def test_fixed_stars_endpoint(monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "synthetic")
+    payload = {
+        "full_name": "Ada Lovelace",
+        "birth_date": "1815-12-10",
+        "birth_time": "10:00",
+        "birth_place": "London, UK",
+        "orb": 3,
+        "max_magnitude": 1.5,
+    }
+    data = TestClient(app).post("/v1/chart/fixed-stars", json=payload).json()
+
+    assert data["stars"] and all(star["magnitude"] <= 1.5 for star in data["stars"])
+    assert all(item["orb"] <= 3 for item in data["conjunctions"])
+    assert all(item["orb"] <= 1 for item in data["parans"])
@@ -0,0 +1,173 @@
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.jobs import JOB_KINDS, JobQueue, JobWorkerPool, get_job_queue, worker
+from app.jobs.worker import execute_job
+from app.main import app
+
+PAYLOAD = {
+    "full_name": "Ada Lovelace",
+    "birth_date": "1815-12-10",
+    "birth_time": "10:00",
+    "birth_place": "London",
+}
+
+
+@pytest.fixture
+def job_queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "jobs_db_path", str(tmp_path / "jobs.db"))
+    get_job_queue.cache_clear()
+    yield get_job_queue()
+    get_job_queue.cache_clear()
+
+
+def test_queue_orders_by_priority_and_recovers_stale_jobs(tmp_path) -> None:
+    queue = JobQueue(tmp_path / "jobs.db", result_ttl_seconds=60, max_attempts=2)
+    low = queue.submit("natal", "{}", priority=-1)
+    high = queue.submit("natal", "{}", priority=5)
+    assert queue.claim().id == high.id
+
+    # Processo "caiu" com o job em execução: volta para a fila até esgotar as tentativas.
+    assert queue.recover(stale_after_seconds=0) == 1
+    assert queue.claim().id == high.id
+    queue.recover(stale_after_seconds=0)
+    failed = queue.get(high.id)
+    assert failed.status == "failed" and failed.attempts == 2
+    assert queue.claim().id == low.id
+    queue.complete(low.id, {"ok": True})
+    assert json.loads(queue.result(low.id)) == {"ok": True}
+    assert queue.counts() == {"queued": 0, "running": 0, "succeeded": 1, "failed": 1}
+
+
+def test_expired_results_are_purged(tmp_path) -> None:
+    queue = JobQueue(tmp_path / "jobs.db", result_ttl_seconds=0, max_attempts=3)
+    job = queue.submit("natal", "{}")
+    queue.claim()
+    queue.complete(job.id, [])
+    assert queue.get(job.id) is None and queue.result(job.id) is None
+    assert queue.purge_expired() == 1
+
+
+def test_job_endpoints_run_relocation_with_progress(job_queue, monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "true")
+    assert set(JOB_KINDS) == {"natal", "solar_return", "progression", "relocation", "astrocartography"}
+    client = TestClient(app)
+
+    submitted = client.post(
+        "/v1/jobs",
+        json={"kind": "relocation", "payload": {**PAYLOAD, "locations": ["Paris", "Tokyo"]}},
+    )
+    assert submitted.status_code == 202
+    job_id = submitted.json()["id"]
+    assert submitted.json()["status"] == "queued"
+    assert client.get(f"/v1/jobs/{job_id}/result").status_code == 409
+
+    pool = JobWorkerPool(job_queue, workers=1, poll_interval_seconds=0.05, stale_after_seconds=60)
+    pool.start()
+    try:
+        deadline = time.time() + 10
+        while client.get(f"/v1/jobs/{job_id}").json()["status"] != "succeeded":
+            assert time.time() < deadline
+            time.sleep(0.05)
+    finally:
+        pool.stop()
+
+    status = client.get(f"/v1/jobs/{job_id}").json()
+    assert status["progress"] == 1.0 and status["expires_at"]
+    result = client.get(f"/v1/jobs/{job_id}/result").json()
+    assert [entry["place"] for entry in result] == ["Paris", "Tokyo"]
+
+    invalid = client.post("/v1/jobs", json={"kind": "natal", "payload": {"full_name": "Ada"}})
+    assert invalid.status_code == 422
+    assert client.get("/v1/jobs/desconhecido").status_code == 404
+
+
+def test_only_staged_job_kinds_report_progress(monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "true")
+    payloads = {
+        "natal": PAYLOAD,
+        "solar_return": {**PAYLOAD, "target_year": 1830},
+        "progression": {**PAYLOAD, "target_date": "1840-01-01"},
+        "relocation": {**PAYLOAD, "locations": ["Paris", "Tokyo"]},
+        "astrocartography": {**PAYLOAD, "bodies": ["Sun", "Moon"]},
+    }
+    for name, kind in JOB_KINDS.items():
+        reported: list[float] = []
+        kind.run(
+            kind.request_model.model_validate(payloads[name]),
+            lambda value, entry=None: reported.append(value),
+            [],
+        )
+        if kind.reports_progress:
+            assert reported and reported == sorted(reported) and 0 < reported[-1] <= 1, name
+        else:
+            assert reported == [], name
+    assert {name for name, kind in JOB_KINDS.items() if kind.reports_progress} == {
+        "solar_return",
+        "relocation",
+    }
+
+
+def test_single_step_job_shows_no_progress_until_done(job_queue) -> None:
+    job = job_queue.submit("natal", json.dumps(PAYLOAD))
+    client = TestClient(app)
+
+    assert client.get(f"/v1/jobs/{job.id}").json()["progress"] is None
+    job_queue.claim()
+    job_queue.complete(job.id, {})
+    assert client.get(f"/v1/jobs/{job.id}").json()["progress"] == 1.0
+
+
+def test_recovered_relocation_resumes_after_saved_entries(job_queue, monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "true")
+    computed: list[list[str]] = []
+    original = worker.calculate_relocations
+
+    def spy(payload):
+        computed.append(list(payload.locations))
+        return original(payload)
+
+    monkeypatch.setattr(worker, "calculate_relocations", spy)
+    locations = ["Paris", "Tokyo", "Lima"]
+    job = job_queue.submit("relocation", json.dumps({**PAYLOAD, "locations": locations}))
+    job_queue.claim()
+    # A primeira tentativa gravou Paris e o processo caiu.
+    saved = {"place": "Paris", "chart": None, "error": "gravado antes da queda"}
+    job_queue.report_progress(job.id, 1 / 3, saved)
+    assert job_queue.recover(stale_after_seconds=0) == 1
+    assert job_queue.get(job.id).progress == pytest.approx(1 / 3)
+
+    execute_job(job_queue, job_queue.claim())
+
+    assert computed == [["Tokyo", "Lima"]]
+    result = json.loads(job_queue.result(job.id))
+    assert [entry["place"] for entry in result] == locations and result[0] == saved
+    assert job_queue.partial_results(job.id) == []
+
+
+def test_process_pool_runs_jobs_outside_the_api_process(job_queue, monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "true")
+    natal = job_queue.submit("natal", json.dumps(PAYLOAD))
+    invalid = job_queue.submit("progression", json.dumps({**PAYLOAD, "house_system": "?"}))
+    unknown = job_queue.submit("horoscope", "{}")
+
+    pool = JobWorkerPool(
+        job_queue, workers=2, poll_interval_seconds=0.05, stale_after_seconds=60, processes=True
+    )
+    pool.start()
+    try:
+        deadline = time.time() + 60
+        while job_queue.counts()["queued"] or job_queue.counts()["running"]:
+            assert time.time() < deadline
+            time.sleep(0.05)
+    finally:
+        pool.stop()
+
+    assert job_queue.get(natal.id).status == "succeeded"
+    assert json.loads(job_queue.result(natal.id))["metadata"]["full_name"] == "Ada Lovelace"
+    assert job_queue.get(invalid.id).status == "failed"
+    assert "horoscope" in job_queue.get(unknown.id).error
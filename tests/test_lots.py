@@ -0,0 +1,90 @@
+import json
+import math
+
+import pytest
+
+from app.api.models import NatalChartRequest
+from app.astro import ephemeris
+from app.astro.dignities import DAY, NIGHT, UNKNOWN_SECT
+from app.astro.lots import compile_lots, compiled_lots, evaluate_lots
+from app.core.config import settings
+
+DEFINITIONS = [
+    {"name": "Fortune", "formula": "ASC + Moon - Sun", "reverse_at_night": True},
+    {"name": "Spirit", "formula": "ASC + Sun - Moon", "reverse_at_night": True},
+    {"name": "Eros", "formula": "ASC + Venus - Spirit", "reverse_at_night": True},
+    {"name": "Basis", "formula": "ASC + Fortune - Spirit"},
+]
+
+
+def test_lots_reverse_at_night_and_chain() -> None:
+    lots = compile_lots(DEFINITIONS)
+    names, longitudes = ("Sun", "Moon", "Venus"), (10.0, 100.0, 40.0)
+
+    day = dict(zip(lots.names, evaluate_lots(lots, names, longitudes, 200.0, 110.0, DAY)))
+    assert day["Fortune"] == pytest.approx(290.0)
+    assert day["Spirit"] == pytest.approx(110.0)
+    assert day["Eros"] == pytest.approx(130.0)  # ASC + Vênus - Espírito
+    assert day["Basis"] == pytest.approx(20.0)
+
+    night = dict(zip(lots.names, evaluate_lots(lots, names, longitudes, 200.0, 110.0, NIGHT)))
+    assert night["Fortune"] == pytest.approx(110.0)
+    assert night["Eros"] == pytest.approx(90.0)  # ASC + Espírito noturno - Vênus
+    assert night["Basis"] == pytest.approx(200.0 + 110.0 - 290.0)
+    # Sem seita conhecida nada é avaliado: Basis não inverte, mas cita lotes que invertem.
+    unknown = evaluate_lots(lots, names, longitudes, 200.0, 110.0, UNKNOWN_SECT)
+    assert all(math.isnan(value) for value in unknown)
+
+
+def test_invalid_formulas_and_missing_bodies() -> None:
+    with pytest.raises(RuntimeError, match="Operando desconhecido"):
+        compile_lots([{"name": "Broken", "formula": "ASC + Spirit - Sun"}])
+    with pytest.raises(RuntimeError, match="Fórmula inválida"):
+        compile_lots([{"name": "Broken", "formula": "ASC Moon"}])
+
+    lots = compile_lots(DEFINITIONS)
+    values = evaluate_lots(lots, ("Sun", "Moon"), (10.0, 100.0), 200.0, 110.0, DAY)
+    assert [math.isnan(value) for value in values] == [False, False, True, False]
+
+
+def test_natal_chart_fills_vertex_fortune_and_extra_lots(
+    live_chart, tmp_path, monkeypatch
+) -> None:
+    extra = tmp_path / "lots.json"
+    extra.write_text(json.dumps([{"name": "Marriage", "formula": "ASC + Venus - Saturn"}]))
+    monkeypatch.setattr(settings, "lots_path", str(extra))
+    compiled_lots.cache_clear()
+    try:
+        payload = NatalChartRequest(
+            full_name="Ada",
+            birth_date="1990-05-17",
+            birth_time="14:30",
+            birth_place="London",
+            bodies=["Sun", "Moon", "Venus", "Saturn"],
+        )
+        chart = ephemeris.compute_chart(payload)
+        points = ephemeris.calculate_natal_chart(payload).points
+    finally:
+        compiled_lots.cache_clear()
+
+    sun, moon = chart.bodies.longitudes[0], chart.bodies.longitudes[1]
+    # Sol na casa 9: mapa diurno, Fortuna = ASC + Lua - Sol.
+    assert chart.placement[0] >= 7
+    fortune = chart.lots[compiled_lots().names.index("Fortune")]
+    assert fortune == pytest.approx((chart.houses.asc + moon - sun) % 360)
+    assert points.fortune.degree == int(fortune % 30)
+    # O Vertex fica no hemisfério oeste, perto do Descendente.
+    assert chart.houses.vertex is not None and points.vertex is not None
+    assert abs((chart.houses.vertex - chart.houses.asc) % 360 - 180) < 90
+    lots = {lot.name for lot in points.lots}
+    assert {"Fortune", "Spirit", "Eros", "Marriage"} <= lots
+    assert "Courage" not in lots  # cita Marte, fora de ``bodies``
+
+
+def test_lots_wrap_below_zero_degrees() -> None:
+    lots = compile_lots(DEFINITIONS[:1])
+    # ASC 10° + Lua 5° - Sol 300° = -285°, ou seja, 75°.
+    (fortune,) = evaluate_lots(lots, ("Sun", "Moon"), (300.0, 5.0), 10.0, 100.0, DAY)
+    assert fortune == pytest.approx(75.0)
+    (night,) = evaluate_lots(lots, ("Sun", "Moon"), (0.0, 360.0), 0.0, 90.0, NIGHT)
+    assert night == 0.0  # -360° normalizado, nunca 360°
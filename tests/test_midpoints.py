@@ -0,0 +1,71 @@
+import random
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.astro.midpoints import harmonic_longitudes, midpoint_contacts, midpoint_tree
+from app.main import app
+
+
+def test_midpoint_tree_uses_short_arc() -> None:
+    _, _, midpoints = midpoint_tree(np.array([350.0, 10.0, 100.0]))
+    assert midpoints.tolist() == [0.0, 45.0, 55.0]
+
+
+def test_midpoint_contacts_match_brute_force() -> None:
+    rng = random.Random(7)
+    longitudes = np.array([rng.uniform(0, 360) for _ in range(14)])
+    first, second, midpoints = midpoint_tree(longitudes)
+
+    for dial in (360, 90, 45):
+        found = {
+            (point, index)
+            for point, index, _ in midpoint_contacts(longitudes, first, second, midpoints, 1.5, dial)
+        }
+        expected = set()
+        for point, longitude in enumerate(longitudes):
+            for index, midpoint in enumerate(midpoints):
+                distance = (longitude - midpoint) % dial
+                if point not in (first[index], second[index]) and min(distance, dial - distance) <= 1.5:
+                    expected.add((point, index))
+        assert found == expected
+
+
+def test_harmonic_longitudes_wrap() -> None:
+    assert harmonic_longitudes(np.array([100.0, 350.0]), 4).tolist() == [40.0, 320.0]
+
+
+def test_midpoints_and_harmonic_endpoints(monkeypatch) -> None:
+    monkeypatch.setenv("ASTRO_MOCK_MODE", "synthetic")
+    client = TestClient(app)
+    payload = {
+        "full_name": "Ada Lovelace",
+        "birth_date": "1815-12-10",
+        "birth_time": "10:00",
+        "birth_place": "London, UK",
+    }
+
+    data = client.post("/v1/chart/midpoints", json={**payload, "orb": 2}).json()
+    points = len(client.post("/v1/chart/natal", json=payload).json()["planets"]) + 2
+    assert len(data["midpoints"]) == points * (points - 1) // 2
+    assert all(contact["orb"] <= 2 for contact in data["contacts"])
+
+    harmonic = client.post("/v1/chart/harmonic", json={**payload, "harmonic": 5}).json()
+    assert harmonic["harmonic"] == 5
+    assert [item["name"] for item in harmonic["positions"]][-2:] == ["ASC", "MC"]
+
+
+def test_midpoint_tree_of_fewer_than_two_points_is_empty() -> None:
+    for longitudes in (np.array([]), np.array([42.0])):
+        first, second, midpoints = midpoint_tree(longitudes)
+        assert len(first) == len(second) == len(midpoints) == 0
+
+
+def test_midpoint_contacts_wrap_at_zero() -> None:
+    longitudes = np.array([359.0, 1.0, 359.9])
+    first, second, midpoints = midpoint_tree(longitudes)
+    assert midpoints[0] == 0.0  # 359° e 1°: arco menor, não 180°
+
+    contacts = midpoint_contacts(longitudes, first, second, midpoints, 0.5, 360)
+    assert [(point, index) for point, index, _ in contacts] == [(2, 0)]
+    assert harmonic_longitudes(np.array([360.0, 0.0]), 3).tolist() == [0.0, 0.0]
@@ -1,3 +1,8 @@
+import asyncio
+import re
+
+from fastapi import FastAPI
+
 from app.monitoring import (
     AnomalyDetector,
     FailurePredictor,
@@ -5,6 +10,7 @@ from app.monitoring import (
     PerformanceMonitor,
     UserBehaviorSimulator,
 )
+from app.monitoring.load_test import LoadTestHarness, RequestTemplate
 
 
 def test_performance_monitor_detects_latency_bottleneck() -> None:
@@ -51,6 +57,39 @@ def test_user_behavior_simulator_generates_deterministic_path() -> None:
     assert result == ["home", "produto", "checkout", "checkout"]
 
 
+def test_load_test_harness_replays_journeys_in_process() -> None:
+    app = FastAPI()
+
+    @app.get("/home")
+    async def home() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.post("/checkout")
+    async def checkout(payload: dict) -> dict[str, int]:
+        return {"items": payload["items"]}
+
+    harness = LoadTestHarness(
+        UserBehaviorSimulator(
+            transition_map={"home": {"checkout": 1.0}, "checkout": {"exit": 1.0}},
+        ),
+        {
+            "home": RequestTemplate("GET", "/home"),
+            "checkout": RequestTemplate("POST", "/checkout", lambda rng: {"items": 1}),
+        },
+        app=app,
+        concurrency=10,
+    )
+
+    report = asyncio.run(harness.run(users=50, steps=5, start_state="home")).as_dict()
+
+    assert report["requests"] == 100
+    assert report["errors"] == 0
+    assert report["status_counts"] == {"200": 100}
+    assert report["states"]["checkout"]["requests"] == 50
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"]
+    assert report["throughput_rps"] > 0
+
+
 def test_log_root_cause_analyzer_extracts_insights() -> None:
     report = LogRootCauseAnalyzer.analyze(
         [
@@ -63,3 +102,94 @@ def test_log_root_cause_analyzer_extracts_insights() -> None:
     assert report["total_patterns_detected"] == 3
     assert report["insights"][0]["type"] == "db_timeout"
     assert report["insights"][0]["occurrences"] == 2
+
+
+def test_log_root_cause_analyzer_scans_file_in_chunks(tmp_path) -> None:
+    log_file = tmp_path / "uvicorn.log"
+    log_file.write_text(
+        "2024-05-01 10:01:00 INFO GET /v1/chart/natal 200\n"
+        "2024-05-01 10:02:00 ERROR TIMEOUT in postgres query\n"
+        "2024-05-01 11:15:00 WARN invalid token signature\n"
+        "2024-05-01 11:16:00 ERROR timeout in DB pool, jwt refresh failed\n",
+        encoding="utf-8",
+    )
+
+    report = LogRootCauseAnalyzer.analyze_file(log_file, workers=1, chunk_size=64)
+
+    assert report["chunks"] > 1
+    assert report["lines_scanned"] == 4
+    assert report["total_patterns_detected"] == 4
+    db_timeout = next(item for item in report["insights"] if item["type"] == "db_timeout")
+    assert db_timeout["occurrences"] == 2
+    assert db_timeout["samples"][0].endswith("TIMEOUT in postgres query")
+    assert db_timeout["time_buckets"] == {"2024-05-01T10:00": 1, "2024-05-01T11:00": 1}
+
+
+def test_log_root_cause_analyzer_supports_pattern_packs(tmp_path) -> None:
+    pack_file = tmp_path / "pack.json"
+    pack_file.write_text(
+        '{"ephemeris_missing": {"regex": "SwissEph file \'(\\\\w+)\\\\.se1\' not found",'
+        ' "cause": "Arquivo de efemérides ausente", "suggestion": "Configure ASTRO_EPHEMERIS_PATH."}}',
+        encoding="utf-8",
+    )
+    pack = LogRootCauseAnalyzer.load_pattern_pack(pack_file)
+
+    with open(tmp_path / "stream.log", "wb+") as stream:
+        stream.write(b"ERROR SwissEph file 'seas_18.se1' not found\nINFO ok\n")
+        stream.seek(0)
+        report = LogRootCauseAnalyzer.analyze_stream(stream, patterns=pack, workers=1)
+
+    assert report["total_patterns_detected"] == 1
+    assert report["insights"][0]["type"] == "ephemeris_missing"
+    assert report["insights"][0]["time_buckets"] == {}
+
+
+def test_log_root_cause_analyzer_file_and_stream_match_per_line(tmp_path) -> None:
+    patterns = {
+        key: {"regex": re.compile(regex), "cause": key, "suggestion": "-"}
+        for key, regex in {
+            "anchored": r"^ERROR",
+            "spaced": r"\s*timeout",
+            "trailing": r"failed$",
+            "repeated": r"(\w+) \1",
+            "named": r"(?P<code>5\d\d) (?P=code)",
+        }.items()
+    }
+    lines = [
+        "ERROR boot",
+        "  timeout waiting",
+        "INFO ERROR not anchored",
+        "ERROR timeout after retry failed",
+        "job failed",
+        "failed later ok",
+        "",
+        "   ",
+        "timeout",
+        "again again 503 503",
+        "503 500",
+        "ok",
+    ]
+    expected = LogRootCauseAnalyzer.analyze(lines, patterns=patterns)
+    counts = {item["type"]: item["occurrences"] for item in expected["insights"]}
+    assert counts == {"anchored": 2, "spaced": 3, "trailing": 2, "repeated": 2, "named": 1}
+
+    log_file = tmp_path / "parity.log"
+    log_file.write_bytes("\r\n".join(lines).encode("utf-8") + b"\r\n")
+    for chunk_size in (16, 64, 4096):
+        report = LogRootCauseAnalyzer.analyze_file(
+            log_file, patterns=patterns, workers=1, chunk_size=chunk_size
+        )
+        assert {item["type"]: item["occurrences"] for item in report["insights"]} == counts
+    with open(log_file, "rb") as stream:
+        report = LogRootCauseAnalyzer.analyze_stream(stream, patterns=patterns, workers=1, chunk_size=32)
+    assert {item["type"]: item["occurrences"] for item in report["insights"]} == counts
+
+
+def test_log_root_cause_analyzer_handles_empty_file(tmp_path) -> None:
+    log_file = tmp_path / "empty.log"
+    log_file.write_bytes(b"")
+
+    report = LogRootCauseAnalyzer.analyze_file(log_file, workers=1)
+
+    assert report["lines_scanned"] == 0
+    assert report["total_patterns_detected"] == 0
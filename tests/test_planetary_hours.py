@@ -0,0 +1,66 @@
+from fastapi.testclient import TestClient
+
+from app.api.models import PlanetaryHoursRequest
+from app.astro import ephemeris, planetary_hours
+from app.astro.ephemeris import ChartLocation
+from app.main import app
+
+
+def _fake_location(monkeypatch, latitude: float, longitude: float, timezone: str) -> None:
+    monkeypatch.setattr(
+        ephemeris,
+        "_compute_location",
+        lambda place: ChartLocation(
+            latitude=latitude, longitude=longitude, place=place, timezone=timezone
+        ),
+    )
+
+
+def test_planetary_hours_follow_chaldean_order() -> None:
+    hours = planetary_hours.planetary_hours(0.0, 0.6, 1.0, "Saturn")
+    rulers = [ruler for ruler, _, _ in hours]
+    assert rulers[:8] == ["Saturn", "Jupiter", "Mars", "Sun", "Venus", "Mercury", "Moon", "Saturn"]
+    # A 25ª hora (primeira do dia seguinte) cai no regente de domingo.
+    assert planetary_hours.CHALDEAN_ORDER[
+        (planetary_hours.CHALDEAN_ORDER.index(rulers[-1]) + 1) % 7
+    ] == "Sun"
+    assert hours[11][2] == 0.6 and hours[-1][2] == 1.0
+
+
+def test_planetary_hours_endpoint_uses_yearly_table(monkeypatch) -> None:
+    _fake_location(monkeypatch, -23.55, -46.63, "America/Sao_Paulo")
+    planetary_hours._TABLES.clear()
+    client = TestClient(app)
+    payload = {"place": "Horas São Paulo", "start_date": "2024-12-30", "days": 3}
+
+    days = client.post("/v1/planetary-hours", json=payload).json()["days"]
+    assert [day["day_ruler"] for day in days] == ["Moon", "Mars", "Mercury"]
+    first = days[0]
+    assert first["sunrise"].startswith("2024-12-30T05:2") and first["sunset"].startswith("2024-12-30T18:5")
+    assert len(first["hours"]) == 24
+    assert first["hours"][0]["start"] == first["sunrise"]
+    assert first["hours"][12]["start"] == first["sunset"]
+    assert first["hours"][23]["end"] == days[1]["sunrise"]
+    # Dois anos (2024 e 2025) calculados uma vez cada.
+    assert planetary_hours._TABLES.stats()["misses"] == 2
+
+    client.post("/v1/planetary-hours", json=payload)
+    assert planetary_hours._TABLES.stats()["misses"] == 2
+
+
+def test_polar_day_has_no_planetary_hours(monkeypatch) -> None:
+    _fake_location(monkeypatch, 78.22, 15.65, "Arctic/Longyearbyen")
+    day = planetary_hours.calculate_planetary_hours(
+        PlanetaryHoursRequest(place="Horas Svalbard", start_date="2024-06-21")
+    ).days[0]
+    assert day.sunrise is None and day.sunset is None
+    assert day.hours == []
+
+
+def test_planetary_hours_reject_empty_or_oversized_ranges() -> None:
+    client = TestClient(app)
+    for days in (0, 32):
+        response = client.post(
+            "/v1/planetary-hours", json={"place": "London", "start_date": "2024-12-31", "days": days}
+        )
+        assert response.status_code == 422
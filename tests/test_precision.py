@@ -0,0 +1,86 @@
+from datetime import date
+import os
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+import pytest
+import swisseph as swe
+
+from app.api.models import LunationRequest, NatalChartRequest
+from app.astro import ephemeris, precision
+from app.astro.bodies import _ephemeris_path
+from app.main import app
+
+PAYLOAD = {
+    "full_name": "Ada",
+    "birth_date": "1990-05-17",
+    "birth_time": "14:30",
+    "birth_place": "London",
+}
+
+
+def _planet_files_available() -> bool:
+    # Sem sepl/semo, "precise" também cai para Moshier e a comparação não mede nada.
+    directories = [Path(item) for item in filter(None, _ephemeris_path().split(os.pathsep))]
+    return all(
+        any((directory / name).exists() for directory in directories)
+        for name in ("sepl_18.se1", "semo_18.se1")
+    )
+
+
+@pytest.mark.skipif(not _planet_files_available(), reason="arquivos .se1 ausentes")
+def test_fast_tier_matches_precise_within_documented_bounds(live_chart) -> None:
+    bodies = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Pluto", "True Node"]
+    fast = ephemeris.compute_chart(NatalChartRequest(**PAYLOAD, bodies=bodies, precision="fast"))
+    precise = ephemeris.compute_chart(NatalChartRequest(**PAYLOAD, bodies=bodies))
+
+    assert "MOSHIER" in fast.ephemeris_flags and "MOSHIER" not in precise.ephemeris_flags
+    for name, a, b in zip(bodies, fast.bodies.longitudes, precise.bodies.longitudes):
+        # Moshier vs. arquivos: < 1" para os planetas e poucos segundos para a Lua.
+        assert abs((a - b + 180) % 360 - 180) * 3600 < 5, name
+    assert fast.placement == precise.placement
+
+
+def test_fast_tier_lunation_matches_reference_instant(live_chart) -> None:
+    request = LunationRequest(reference_date=date(2024, 1, 1), precision="fast")
+    assert LunationRequest(reference_date=date(2024, 1, 1)).precision == "precise"
+
+    new_moon = ephemeris.calculate_lunation(request)
+
+    # Lua Nova de 11/01/2024 às 11:57 UT; a diferença de "fast" é de segundos.
+    assert new_moon.utc_datetime[:16] == "2024-01-11T11:57"
+    assert abs((new_moon.longitude_moon - new_moon.longitude_sun + 180) % 360 - 180) < 0.01
+
+
+def test_fast_tier_uses_moshier_without_files(live_chart, monkeypatch) -> None:
+    calls = []
+    original = swe.calc_ut
+    monkeypatch.setattr(
+        swe, "calc_ut", lambda jd, body, flags: calls.append(flags) or original(jd, body, flags)
+    )
+
+    chart = ephemeris.compute_chart(NatalChartRequest(**PAYLOAD, precision="fast"))
+
+    # Sem bodies, o conjunto padrão perde o Chiron, que só existe em arquivo.
+    assert "Chiron" not in chart.bodies.names and "Pluto" in chart.bodies.names
+    assert calls and all(flags & swe.FLG_MOSEPH for flags in calls)
+    with pytest.raises(ValueError, match="Chiron"):
+        ephemeris.compute_chart(NatalChartRequest(**PAYLOAD, bodies=["Sun", "Chiron"], precision="fast"))
+
+
+def test_precise_tier_sets_ephemeris_path_once(live_chart, tmp_path, monkeypatch) -> None:
+    paths = []
+    monkeypatch.setenv("ASTRO_EPHEMERIS_PATH", str(tmp_path))
+    monkeypatch.setattr(precision, "_configured_path", None)
+    monkeypatch.setattr(swe, "set_ephe_path", paths.append)
+    client = TestClient(app)
+
+    for hour in ("08:00", "12:00", "16:00"):
+        response = client.post(
+            "/v1/chart/natal", json={**PAYLOAD, "birth_time": hour, "bodies": ["Sun", "Moon"]}
+        )
+        assert response.status_code == 200
+    assert paths == [str(tmp_path)]
+
+    rejected = client.post("/v1/chart/natal", json={**PAYLOAD, "precision": "fast", "bodies": ["Ceres"]})
+    assert rejected.status_code == 400
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution() -> None:
+    flight: SingleFlight[dict[str, int]] = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute() -> dict[str, int]:
+        calls.append(1)
+        release.wait(timeout=5)
+        return {"value": len(calls)}
+
+    async def scenario() -> list[dict[str, int]]:
+        waiters = [asyncio.create_task(flight.run("chart", compute)) for _ in range(20)]
+        other = asyncio.create_task(flight.run("other", compute))
+        await asyncio.sleep(0.05)
+        assert len(flight) == 2
+        release.set()
+        results = await asyncio.gather(*waiters)
+        await other
+        return results
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 2
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"in_flight": 0, "executions": 2, "shared": 19}
+
+
+def test_errors_reach_every_waiter_and_are_not_cached() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+
+    def fail() -> int:
+        raise ValueError("Local não encontrado")
+
+    async def scenario() -> list[object]:
+        return await asyncio.gather(
+            *(flight.run("chart", fail) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert asyncio.run(flight.run("chart", lambda: 7)) == 7
+    assert flight.stats()["executions"] == 2
+
+
+def test_cancelled_leader_does_not_cancel_followers() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    release = threading.Event()
+
+    def compute() -> int:
+        release.wait(timeout=5)
+        return 42
+
+    async def scenario() -> int:
+        leader = asyncio.create_task(flight.run("chart", compute))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(flight.run("chart", compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(scenario()) == 42